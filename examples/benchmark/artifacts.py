@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from examples.google.artifacts import LocalArtifactStore
+from examples.stats import LatencySummary
+
+APP_NAME = "artifact_benchmark"
+USER_ID = "user"
+
+
+def _tool_event(response: dict) -> Event:
+    part = types.Part(
+        function_response=types.FunctionResponse(name="generate_image", response=response)
+    )
+    return Event(author="ImageGen", content=types.Content(role="user", parts=[part]))
+
+
+async def _measure(service, make_response, consume, repeats: int) -> tuple[LatencySummary, int]:
+    # One tool result: build it, append it to a session, read the session back
+    # (as the next model call does) and let a consumer touch the bytes.
+    timings, size = [], 0
+    for _ in range(repeats):
+        session = await service.create_session(app_name=APP_NAME, user_id=USER_ID)
+        start = time.perf_counter()
+        event = _tool_event(make_response())
+        await service.append_event(session, event)
+        session = await service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session.id
+        )
+        consume(session.events[-1].content.parts[0].function_response.response)
+        size = len(event.model_dump_json())
+        timings.append(time.perf_counter() - start)
+    return LatencySummary.from_samples(timings), size
+
+
+async def run(sizes_mb: list[int], repeats: int = 20) -> None:
+    """
+    Compares returning image bytes inline with returning an artifact handle.
+
+    Args:
+        sizes_mb: Payload sizes in MiB.
+        repeats: Tool results per size and strategy.
+    """
+    directory = tempfile.mkdtemp(prefix="artifacts_bench_")
+    store = LocalArtifactStore(directory)
+    service = InMemorySessionService()
+    try:
+        for size_mb in sizes_mb:
+            data = os.urandom(size_mb << 20)
+            print(f"\n--- Tool result of {size_mb} MiB, {repeats} calls ---")
+            inline, inline_size = await _measure(
+                service,
+                lambda: {"status": "success", "image_bytes": data, "mime_type": "image/png"},
+                lambda response: hashlib.sha256(response["image_bytes"]).digest(),
+                repeats,
+            )
+            handle, handle_size = await _measure(
+                service,
+                lambda: {"status": "success", "image": store.put(data, "image/png").to_dict()},
+                lambda response: hashlib.sha256(store.open(response["image"])).digest(),
+                repeats,
+            )
+            print(f"inline: {inline.format()}, event {inline_size / 2**20:.2f} MiB")
+            print(f"handle: {handle.format()}, event {handle_size} bytes")
+        stats = store.stats
+        print(
+            f"\nStore: {stats.puts} puts, {stats.dedup_hits} deduplicated, "
+            f"{stats.bytes_written / 2**20:.0f} MiB written, {stats.reads} reads"
+        )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import os
+import time
+from typing import Sequence
+
+from examples.benchmark.stubs import StubModel, StubProfile
+from examples.crewai.multi_agent import BlogCrewFactory, kickoff_batch
+from examples.stats import LatencySummary
+
+# Benchmarks run offline; do not let CrewAI try to export its own telemetry.
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+
+async def _for_each(factory: BlogCrewFactory, topics: list[str]) -> float:
+    # CrewAI's own batch mode: one copy of the crew per input, all at once.
+    start = time.perf_counter()
+    await factory.crew().kickoff_for_each_async([{"topic": topic} for topic in topics])
+    return time.perf_counter() - start
+
+
+def run(topics: int = 48, concurrency: Sequence[int] = (1, 8), latency: float = 0.05) -> None:
+    """
+    Measures blog posts per hour for a batch of topics against a stub LLM.
+
+    Args:
+        topics: Topics in the batch.
+        concurrency: Crew concurrency limits to compare.
+        latency: Simulated latency of each model call, in seconds.
+    """
+    batch = [f"Topic {i}" for i in range(topics)]
+    print(f"--- Blog creation crew: {topics} topics, {latency * 1000:.0f}ms per model call ---")
+    for limit in concurrency:
+        factory = BlogCrewFactory(StubModel(StubProfile(latency=latency)).crewai(), verbose=False)
+        start = time.perf_counter()
+        results = asyncio.run(kickoff_batch(batch, factory, limit))
+        elapsed = time.perf_counter() - start
+        errors = sum(result.error is not None for result in results)
+        per_topic = LatencySummary.from_samples([result.seconds for result in results])
+        print(
+            f"concurrency {limit:>3}: {elapsed:6.2f}s, {3600 * (topics - errors) / elapsed:8.0f} posts/hour, "
+            f"{errors} errors, per topic {per_topic.format()}"
+        )
+
+    factory = BlogCrewFactory(StubModel(StubProfile(latency=latency)).crewai(), verbose=False)
+    elapsed = asyncio.run(_for_each(factory, batch))
+    print(f"kickoff_for_each_async (no cap): {elapsed:6.2f}s, {3600 * topics / elapsed:8.0f} posts/hour")
@@ -0,0 +1,140 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from examples.benchmark.stub_openai import (
+    AsyncStubOpenAI,
+    StubCrash,
+    StubOpenAI,
+    StubResearchProfile,
+)
+from examples.openai.deep_research import (
+    DEFAULT_MODEL,
+    CitationWriter,
+    OutputIndex,
+    ResearchTimeoutError,
+    run_background,
+)
+from examples.openai.deep_research_batch import run_batch
+
+REQUEST = {"model": DEFAULT_MODEL, "input": "Research the economic impact of semaglutide."}
+
+
+def _run(client, directory: str, **kwargs) -> tuple[float, str]:
+    # Runs to the end like a supervisor would: a crashed worker is restarted
+    # and, given the same checkpoint, resumes the run in flight.
+    checkpoint = os.path.join(directory, "checkpoint.json")
+    citations = os.path.join(directory, "citations.jsonl")
+    start = time.perf_counter()
+    outcome = "completed"
+    with contextlib.redirect_stdout(io.StringIO()):
+        while True:
+            try:
+                with CitationWriter(citations) as writer:
+                    run_background(
+                        client, REQUEST, OutputIndex(writer), checkpoint_path=checkpoint, **kwargs
+                    )
+                break
+            except StubCrash:
+                outcome = "completed after restart"
+            except ResearchTimeoutError:
+                outcome = "timed out, cancelled"
+                break
+    return time.perf_counter() - start, outcome
+
+
+def run(duration: float = 2.0, poll_interval: float = 0.2) -> None:
+    """
+    Runs a simulated deep-research request through each failure mode.
+
+    Args:
+        duration: Seconds the simulated run takes.
+        poll_interval: First delay between polls, in seconds.
+    """
+    scenarios = [
+        ("poll", StubResearchProfile(duration), {}),
+        ("stream", StubResearchProfile(duration), {"stream": True}),
+        ("stream, dropped every 3 events", StubResearchProfile(duration, disconnect_after=3), {"stream": True}),
+        ("poll, worker crash", StubResearchProfile(duration, crash_after=3), {}),
+        ("stream, worker crash", StubResearchProfile(duration, crash_after=4), {"stream": True}),
+        ("poll, timeout", StubResearchProfile(duration), {"timeout": duration / 2}),
+    ]
+    print(f"--- Deep research against a local stub, {duration:g}s per run ---")
+    print(f"{'scenario':<32} {'time':>8} {'creates':>8} {'retrieves':>10} {'cancels':>8}  outcome")
+    for name, profile, kwargs in scenarios:
+        client = StubOpenAI(profile)
+        directory = tempfile.mkdtemp(prefix="deep_research_bench_")
+        try:
+            elapsed, outcome = _run(client, directory, poll_interval=poll_interval, **kwargs)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        calls = client.responses.calls
+        print(
+            f"{name:<32} {elapsed:>7.2f}s {calls['create']:>8} {calls['retrieve']:>10} "
+            f"{calls['cancel']:>8}  {outcome}"
+        )
+
+
+
+async def _batch(client, questions: list[dict], output_path: str, concurrency: int, poll_interval: float):
+    # Restarts the batch after a crash, as a supervisor would.
+    restarts = 0
+    start = time.perf_counter()
+    while True:
+        try:
+            stats = await run_batch(
+                client, questions, output_path, concurrency, poll_interval=poll_interval
+            )
+            return time.perf_counter() - start, stats, restarts
+        except StubCrash:
+            restarts += 1
+
+
+def run_batches(
+    questions: int = 32, concurrency: int = 8, duration: float = 1.0, poll_interval: float = 0.2
+) -> None:
+    """
+    Researches a batch of questions one at a time, concurrently, and through a crash.
+
+    Args:
+        questions: Questions in the batch.
+        concurrency: Runs in flight in the concurrent batches.
+        duration: Base seconds a simulated run takes; each adds up to as much again.
+        poll_interval: First delay between polls, in seconds.
+    """
+    batch = [{"id": str(i), "query": f"Question {i}"} for i in range(questions)]
+    scenarios = [
+        ("one at a time", 1, None),
+        (f"concurrency {concurrency}", concurrency, None),
+        (f"concurrency {concurrency}, crash", concurrency, questions * 2),
+    ]
+    print(f"\n--- Batch of {questions} questions, {duration:g}-{2 * duration:g}s per run ---")
+    print(f"{'scenario':<28} {'time':>8} {'q/min':>8} {'creates':>8} {'restarts':>9} {'records':>8}")
+    for name, limit, crash_after in scenarios:
+        profile = StubResearchProfile(duration, jitter=duration, crash_after=crash_after)
+        client = AsyncStubOpenAI(profile)
+        directory = tempfile.mkdtemp(prefix="deep_research_batch_bench_")
+        output_path = os.path.join(directory, "results.jsonl.gz")
+        try:
+            elapsed, stats, restarts = asyncio.run(
+                _batch(client, batch, output_path, limit, poll_interval)
+            )
+            with gzip.open(output_path, "rt", encoding="utf-8") as f:
+                records = len({json.loads(line)["id"] for line in f})
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        print(
+            f"{name:<28} {elapsed:>7.2f}s {60 * questions / elapsed:>8.1f} "
+            f"{client.responses.calls['create']:>8} {restarts:>9} {records:>8}"
+        )
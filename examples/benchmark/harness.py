@@ -0,0 +1,412 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import contextlib
+import dataclasses
+import importlib
+import io
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from examples.benchmark.stubs import StubModel, StubProfile
+from examples.stats import LatencySummary
+
+# Benchmarks run offline; do not let CrewAI try to export its own telemetry.
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+# --- Pattern Runners ---
+# Each runner executes one pattern end to end against a StubModel. Framework
+# modules are imported inside the runners so a benchmark only pays for the
+# frameworks it selects.
+
+
+async def _prompt_chaining(stub: StubModel) -> None:
+    from examples.langchain import prompt_chaining
+
+    await asyncio.to_thread(prompt_chaining.execute, stub.langchain())
+
+
+async def _routing(stub: StubModel) -> None:
+    from examples.langchain import routing
+
+    await asyncio.to_thread(routing.execute, stub.langchain())
+
+
+async def _parallelization(stub: StubModel) -> None:
+    from examples.langchain import parallelization
+
+    await parallelization.execute(stub.langchain(), "The history of space exploration")
+
+
+async def _parallelization_streaming(stub: StubModel) -> None:
+    from examples.langchain import parallelization
+
+    await parallelization.execute_streaming(
+        stub.langchain(), "The history of space exploration"
+    )
+
+
+async def _reflection(stub: StubModel) -> None:
+    from examples.langchain import reflection
+
+    await asyncio.to_thread(reflection.run_reflection_loop, stub.langchain())
+
+
+async def _reflection_speculative(stub: StubModel) -> None:
+    from examples.langchain import reflection
+
+    await reflection.arun_speculative_reflection(stub.langchain())
+
+
+async def _tools(stub: StubModel) -> None:
+    from examples.langchain import tools
+
+    agent_executor = tools.setup(stub.langchain())
+    await tools.run_agent_with_tool(agent_executor, "What is the capital of France?")
+
+
+# Set by run_benchmarks(tracing=True); CrewAI has no global hook for it.
+_crew_tracer = None
+
+
+async def _crewai_planning(stub: StubModel) -> None:
+    from examples.crewai import planning
+
+    def execute() -> None:
+        if _crew_tracer:
+            _crew_tracer.mark()
+        planning.execute(stub.crewai(), step_callback=_crew_tracer)
+
+    await asyncio.to_thread(execute)
+
+
+async def _crewai_multi_agent(stub: StubModel) -> None:
+    from examples.crewai import multi_agent
+
+    factory = multi_agent.BlogCrewFactory(
+        stub.crewai(), instrument=_crew_tracer.instrument if _crew_tracer else None
+    )
+    await asyncio.to_thread(multi_agent.execute, factory)
+
+
+async def _adk_routing(stub: StubModel) -> None:
+    from examples.google import routing
+    from examples.benchmark.stub_adk import use_stub_model
+
+    with use_stub_model(routing.coordinator, stub.adk()):
+        await routing.execute()
+
+
+async def _adk_google_search(stub: StubModel) -> None:
+    from examples.google.tools import google_search
+    from examples.benchmark.stub_adk import use_stub_model
+
+    with use_stub_model(google_search.root_agent, stub.adk()):
+        await google_search.call_agent("what's the latest ai news?")
+
+
+async def _adk_code_execution(stub: StubModel) -> None:
+    from examples.google.tools import code_execution
+    from examples.benchmark.stub_adk import use_stub_model
+
+    # Gemini runs the generated code server-side, so only the agent round trip is simulated.
+    with use_stub_model(code_execution.code_agent, stub.adk()):
+        await code_execution.call_agent("What is 10 factorial?")
+
+
+async def _adk_enterprise_search(stub: StubModel) -> None:
+    from examples.google.tools import enterprise_search
+    from examples.benchmark.stub_adk import use_stub_model
+
+    # Vertex AI Search is also a model-side tool; no datastore is contacted.
+    with use_stub_model(enterprise_search.code_agent, stub.adk()):
+        await enterprise_search.call_agent("gcp revenue q1 2022")
+
+
+async def _adk_loop(stub: StubModel) -> None:
+    from examples.benchmark.stub_adk import use_stub_model
+    from examples.google.agents.multi_agent import loop
+    from examples.google.runners import run_agent
+
+    # The stub never completes the job, so shrink the backoff to keep runs short.
+    delays = (loop.poller.initial_delay, loop.poller.max_delay)
+    loop.poller.initial_delay, loop.poller.max_delay = 0.001, 0.008
+    try:
+        with use_stub_model(loop.root_agent, stub.adk()):
+            await run_agent(loop.root_agent, "Start.", app_name="benchmark")
+    finally:
+        loop.poller.initial_delay, loop.poller.max_delay = delays
+
+
+def _adk_agent(module_name: str, message: str):
+    async def run(stub: StubModel) -> None:
+        from examples.benchmark.stub_adk import use_stub_model
+        from examples.google.runners import run_agent
+
+        root_agent = importlib.import_module(module_name).root_agent
+        with use_stub_model(root_agent, stub.adk()):
+            await run_agent(root_agent, message, app_name="benchmark")
+
+    return run
+
+
+@dataclass
+class PatternBenchmark:
+    """
+    A named pattern that can be benchmarked against a stub model.
+
+    Args:
+        name: The name used to select the pattern.
+        run: Coroutine function executing the pattern once.
+        rules: (substring, reply) rules steering the stub through the pattern.
+    """
+
+    name: str
+    run: Callable[[StubModel], Awaitable[None]]
+    rules: list[tuple[str, str]] = field(default_factory=list)
+
+
+PATTERNS = {
+    benchmark.name: benchmark
+    for benchmark in [
+        PatternBenchmark("prompt_chaining", _prompt_chaining),
+        PatternBenchmark(
+            "routing", _routing, rules=[("'booker', 'info', or 'unclear'", "booker")]
+        ),
+        PatternBenchmark("parallelization", _parallelization),
+        PatternBenchmark("parallelization_streaming", _parallelization_streaming),
+        PatternBenchmark(
+            "reflection",
+            _reflection,
+            rules=[("Code to Review", "- Add type hints to the signature.")],
+        ),
+        PatternBenchmark(
+            "reflection_speculative",
+            _reflection_speculative,
+            rules=[("Code to Review", "- Add type hints to the signature.")],
+        ),
+        PatternBenchmark("tools", _tools),
+        PatternBenchmark("planning", _crewai_planning),
+        PatternBenchmark("multi_agent", _crewai_multi_agent),
+        PatternBenchmark("adk_routing", _adk_routing),
+        PatternBenchmark("adk_google_search", _adk_google_search),
+        PatternBenchmark("adk_code_execution", _adk_code_execution),
+        PatternBenchmark("adk_enterprise_search", _adk_enterprise_search),
+        PatternBenchmark(
+            "adk_sequential",
+            _adk_agent("examples.google.agents.multi_agent.sequential", "Fetch data."),
+        ),
+        PatternBenchmark(
+            "adk_parallel",
+            _adk_agent("examples.google.agents.multi_agent.parallel", "London"),
+        ),
+        PatternBenchmark("adk_loop", _adk_loop),
+        PatternBenchmark(
+            "adk_hierarchical",
+            _adk_agent("examples.google.agents.multi_agent.hierarchical", "Hello!"),
+        ),
+        PatternBenchmark(
+            "adk_agent_as_a_tool",
+            _adk_agent(
+                "examples.google.agents.multi_agent.agent_as_a_tool", "Draw a cat."
+            ),
+        ),
+        PatternBenchmark(
+            "adk_parallelization",
+            _adk_agent("examples.google.agents.parallelization", "Start the research"),
+        ),
+        PatternBenchmark(
+            "adk_reflection",
+            _adk_agent("examples.google.agents.reflection", "The Eiffel Tower"),
+        ),
+    ]
+}
+
+
+# --- Measurement ---
+
+
+@dataclass
+class PatternResult:
+    """Aggregated measurements for one pattern over several runs."""
+
+    name: str
+    runs: int = 0
+    errors: int = 0
+    round_trips: float = 0.0
+    failures: float = 0.0
+    wall: Optional[LatencySummary] = None
+    model_time: Optional[LatencySummary] = None
+    overhead: Optional[LatencySummary] = None
+    skipped: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+async def run_pattern(
+    benchmark: PatternBenchmark,
+    profile: StubProfile,
+    repeats: int = 5,
+    warmup: int = 1,
+    tracing: bool = False,
+) -> PatternResult:
+    """
+    Runs a pattern `repeats` times and aggregates its timings.
+
+    The first `warmup` runs pay for module imports and lazy initialization and
+    are not measured. Framework overhead is the wall time during which no model
+    call was in flight. With `tracing`, every run is wrapped in a pattern
+    span (see examples.telemetry).
+    """
+    result = PatternResult(name=benchmark.name)
+    walls, model_times, overheads, round_trips, failures = [], [], [], [], []
+    for repeat in range(-warmup, repeats):
+        stub = StubModel(
+            profile=dataclasses.replace(profile, seed=profile.seed + max(repeat, 0)),
+            rules=benchmark.rules,
+        )
+        start = time.perf_counter()
+        try:
+            # The examples print their progress; keep the report readable.
+            with contextlib.redirect_stdout(io.StringIO()), _pattern_span(
+                benchmark.name if tracing else None, warmup=repeat < 0
+            ):
+                await benchmark.run(stub)
+        except ImportError as e:
+            result.skipped = f"{type(e).__name__}: {e}"
+            return result
+        except Exception:
+            result.errors += 1
+        wall = time.perf_counter() - start
+        if repeat < 0:
+            result.errors = 0
+            continue
+        busy = stub.recorder.busy_time()
+        walls.append(wall)
+        model_times.append(busy)
+        overheads.append(max(wall - busy, 0.0))
+        round_trips.append(stub.recorder.calls)
+        failures.append(stub.recorder.failures)
+
+    result.runs = repeats
+    result.round_trips = sum(round_trips) / repeats
+    result.failures = sum(failures) / repeats
+    result.wall = LatencySummary.from_samples(walls)
+    result.model_time = LatencySummary.from_samples(model_times)
+    result.overhead = LatencySummary.from_samples(overheads)
+    return result
+
+
+def _pattern_span(name: Optional[str], warmup: bool):
+    if name is None:
+        return contextlib.nullcontext()
+    from examples.telemetry.tracing import pattern_span
+
+    return pattern_span(name, warmup)
+
+
+async def run_benchmarks(
+    names: Optional[list[str]] = None,
+    profile: Optional[StubProfile] = None,
+    repeats: int = 5,
+    tracing: bool = False,
+) -> list[PatternResult]:
+    """
+    Benchmarks the selected patterns (all of them by default) one after another.
+
+    Args:
+        names: Pattern names to run, see PATTERNS.
+        profile: The simulated provider profile.
+        repeats: Number of runs per pattern.
+        tracing: Attribute the spans of each run to its pattern. Tracing itself
+            is set up with examples.telemetry.instrument.
+    """
+    global _crew_tracer
+    profile = profile or StubProfile()
+    selected = names or list(PATTERNS)
+    unknown = [name for name in selected if name not in PATTERNS]
+    if unknown:
+        raise ValueError(f"Unknown pattern(s): {', '.join(unknown)}")
+    if tracing:
+        from examples.telemetry.instrument import crew_tracer
+
+        _crew_tracer = crew_tracer
+    from examples.langchain.context import set_estimator
+
+    # Token counts only feed budgets and telemetry here; estimate them rather
+    # than let tiktoken download its encoding.
+    previous = set_estimator()
+    try:
+        return [
+            await run_pattern(PATTERNS[name], profile, repeats, tracing=tracing)
+            for name in selected
+        ]
+    finally:
+        set_estimator(previous)
+
+
+# --- Reporting ---
+
+
+def print_report(results: list[PatternResult]) -> None:
+    print(
+        f"\n{'pattern':<26} {'calls':>6} {'wall p50':>10} {'p95':>10} {'p99':>10} "
+        f"{'overhead p50':>13} {'errors':>7}"
+    )
+    print("-" * 88)
+    for result in results:
+        if result.skipped:
+            print(f"{result.name:<26} skipped ({result.skipped})")
+            continue
+        print(
+            f"{result.name:<26} {result.round_trips:>6.1f} "
+            f"{result.wall.p50 * 1000:>8.1f}ms {result.wall.p95 * 1000:>8.1f}ms "
+            f"{result.wall.p99 * 1000:>8.1f}ms {result.overhead.p50 * 1000:>11.1f}ms "
+            f"{result.errors:>7}"
+        )
+
+
+def save_results(results: list[PatternResult], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump([result.to_dict() for result in results], f, indent=2)
+
+
+def compare_to_baseline(
+    results: list[PatternResult], baseline_path: str, tolerance: float = 0.2
+) -> list[str]:
+    """
+    Compares results against a file written by `save_results`.
+
+    Returns:
+        A message for every pattern whose p50 wall time or overhead grew by more
+        than `tolerance`, or whose number of model round-trips changed.
+    """
+    with open(baseline_path) as f:
+        baseline = {entry["name"]: entry for entry in json.load(f)}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if result.skipped or not previous or previous.get("skipped"):
+            continue
+        if result.round_trips != previous["round_trips"]:
+            regressions.append(
+                f"{result.name}: round-trips changed from "
+                f"{previous['round_trips']} to {result.round_trips}"
+            )
+        for metric in ("wall", "overhead"):
+            before = previous[metric]["p50"]
+            after = getattr(result, metric).p50
+            if before and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{result.name}: {metric} p50 regressed from "
+                    f"{before * 1000:.1f}ms to {after * 1000:.1f}ms"
+                )
+    return regressions
@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import time
+
+from examples.benchmark.stubs import StubModel, StubProfile
+from examples.langchain.hedging import HedgedChatModel
+from examples.stats import LatencySummary
+
+# A fast provider with a heavy tail, and a slower but steady one.
+PRIMARY = StubProfile(latency=0.05, jitter=0.02, tail_probability=0.03, tail_latency=0.5, seed=1)
+BACKUP = StubProfile(latency=0.08, jitter=0.02, seed=2)
+
+
+async def _measure(model, requests: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await model.ainvoke(f"Request {i}")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+async def run(requests: int = 400, concurrency: int = 8, hedge_percentile: float = 95.0) -> None:
+    """
+    Compares the primary stub alone with the primary hedged by the backup stub.
+
+    The primary stub replays the same latency sequence in both runs, so the
+    difference in the tail is what hedging buys.
+
+    Args:
+        requests: Calls per run.
+        concurrency: Calls in flight at once.
+        hedge_percentile: Percentile of primary latency after which to hedge.
+    """
+    print(f"--- Hedging: {requests} requests, concurrency {concurrency} ---")
+    baseline = await _measure(StubModel(PRIMARY, name="primary").langchain(), requests, concurrency)
+
+    primary = StubModel(PRIMARY, name="primary")
+    backup = StubModel(BACKUP, name="backup")
+    hedged = HedgedChatModel(
+        primary=primary.langchain(),
+        backup=backup.langchain(),
+        hedge_percentile=hedge_percentile,
+        # Above the primary's normal p95 (~155ms), so only the tail is hedged
+        # before the percentile takes over.
+        initial_delay=0.25,
+    )
+    latencies = await _measure(hedged, requests, concurrency)
+
+    before = LatencySummary.from_samples(baseline)
+    after = LatencySummary.from_samples(latencies)
+    print(f"\nPrimary only: {before.format()}")
+    print(f"Hedged:       {after.format()}")
+    print(
+        f"p99 {(before.p99 - after.p99) * 1000:+.1f}ms saved, "
+        f"{primary.recorder.calls + backup.recorder.calls - requests} extra model calls, "
+        f"hedge delay now {hedged.hedge_delay() * 1000:.1f}ms"
+    )
+    hedged.stats.report()
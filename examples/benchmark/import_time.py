@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+from examples.stats import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class ImportProfile:
+    """
+    Import cost of one Python statement, measured in a fresh interpreter.
+
+    Attributes:
+        import_us: Total self time of every import, in microseconds, as reported
+            by `python -X importtime`.
+        wall: Median wall time of the whole subprocess, in seconds.
+        modules: Number of modules imported.
+        heaviest: The top-level imports with the largest cumulative time.
+        error: The last line of stderr if the statement failed.
+    """
+
+    import_us: int = 0
+    wall: float = 0.0
+    modules: int = 0
+    heaviest: list[tuple[str, int]] = field(default_factory=list)
+    error: str = ""
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """Parses the `-X importtime` lines written to stderr."""
+    profile = ImportProfile()
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        profile.import_us += int(self_us)
+        profile.modules += 1
+        # Nested imports are indented by two spaces per level.
+        if not name[1:].startswith(" "):
+            top_level.append((name.strip(), int(cumulative_us)))
+    profile.heaviest = sorted(top_level, key=lambda item: item[1], reverse=True)[:5]
+    return profile
+
+
+def measure(statement: str, repeats: int = 3) -> ImportProfile:
+    """Runs `statement` in fresh interpreters and profiles its imports."""
+    walls, profile = [], ImportProfile()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        profile = parse_importtime(completed.stderr)
+        if completed.returncode != 0:
+            errors = [line for line in completed.stderr.splitlines() if line.strip()]
+            profile.error = errors[-1] if errors else "failed"
+    profile.wall = percentile(walls, 50)
+    return profile
+
+
+def run(patterns: list[str], repeats: int = 3) -> None:
+    """
+    Compares the cold start of each pattern against importing every pattern.
+
+    Args:
+        patterns: Pattern names registered in main.PATTERNS.
+        repeats: Number of fresh interpreters per measurement.
+    """
+    load_all = (
+        "import main\n"
+        "for name in main.PATTERNS:\n"
+        "    try:\n"
+        "        main.load_pattern(name)\n"
+        "    except Exception:\n"
+        "        pass"
+    )
+    eager = measure(load_all, repeats)
+    cli = measure("import main", repeats)
+
+    print(f"\n{'pattern':<24} {'imports':>8} {'import time':>12} {'wall':>9} {'saved':>8}")
+    print("-" * 65)
+    print(
+        f"{'(all patterns, eager)':<24} {eager.modules:>8} "
+        f"{eager.import_us / 1000:>10.1f}ms {eager.wall * 1000:>7.0f}ms {'':>8}"
+    )
+    print(
+        f"{'(main.py only)':<24} {cli.modules:>8} "
+        f"{cli.import_us / 1000:>10.1f}ms {cli.wall * 1000:>7.0f}ms "
+        f"{1 - cli.import_us / max(eager.import_us, 1):>8.0%}"
+    )
+    for name in patterns:
+        profile = measure(f"import main\nmain.load_pattern({name!r})", repeats)
+        saved = 1 - profile.import_us / max(eager.import_us, 1)
+        print(
+            f"{name:<24} {profile.modules:>8} {profile.import_us / 1000:>10.1f}ms "
+            f"{profile.wall * 1000:>7.0f}ms {saved:>8.0%}"
+        )
+        if profile.error:
+            print(f"{'':<24} error: {profile.error}")
+        heaviest = ", ".join(
+            f"{module} {cumulative / 1000:.0f}ms" for module, cumulative in profile.heaviest[:3]
+        )
+        print(f"{'':<24} heaviest: {heaviest}")
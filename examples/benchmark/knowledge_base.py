@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import os
+import random
+import shutil
+import string
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from examples.benchmark.stats import rss_mb
+from examples.langchain.knowledge_base import BM25Index, build_index
+from examples.stats import LatencySummary
+
+
+@dataclass
+class KnowledgeBaseResult:
+    """
+    Cost of one corpus size.
+
+    Attributes:
+        documents: Number of documents indexed.
+        build: Seconds to build the on-disk index.
+        index_mb: Size of the index directory.
+        load: Seconds to open the index.
+        rss_mb: Growth of the resident set size from opening and querying.
+        latency: Latency of search_information-style queries.
+        fuzzy_latency: Latency of queries with one misspelled term.
+    """
+
+    documents: int
+    build: float
+    index_mb: float
+    load: float
+    rss_mb: float
+    latency: LatencySummary
+    fuzzy_latency: LatencySummary
+
+
+def _words(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))))
+    return sorted(words)
+
+
+def synthetic_corpus(documents: int, vocabulary: int = 100_000, length: int = 12, seed: int = 0):
+    """
+    Yields (key, text) documents with Zipf-distributed words.
+
+    Args:
+        documents: Number of documents.
+        vocabulary: Number of distinct words.
+        length: Words per document text; keys have three words.
+        seed: Seed for the words and their distribution.
+    """
+    words = np.array(_words(vocabulary, seed))
+    rng = np.random.default_rng(seed)
+    chunk = 100_000
+    for start in range(0, documents, chunk):
+        size = min(chunk, documents - start)
+        ids = (rng.zipf(1.2, size=(size, length + 3)) - 1) % vocabulary
+        for row in words[ids]:
+            yield " ".join(row[:3]), " ".join(row[3:])
+
+
+def _queries(index: BM25Index, count: int, seed: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    exact, fuzzy = [], []
+    for _ in range(count):
+        terms = index.document(rng.randrange(index.documents)).split()[:3]
+        exact.append(" ".join(terms))
+        # Drop one character of the rarest-looking (longest) term.
+        longest = max(range(len(terms)), key=lambda i: len(terms[i]))
+        position = rng.randrange(len(terms[longest]))
+        terms[longest] = terms[longest][:position] + terms[longest][position + 1 :]
+        fuzzy.append(" ".join(terms))
+    return exact, fuzzy
+
+
+def _timed(index: BM25Index, queries: list[str]) -> LatencySummary:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=1)
+        samples.append(time.perf_counter() - start)
+    return LatencySummary.from_samples(samples)
+
+
+def run_size(documents: int, queries: int = 200, in_memory: bool = False) -> KnowledgeBaseResult:
+    """Builds, opens and queries an index of `documents` synthetic documents."""
+    directory = tempfile.mkdtemp(prefix="kb_bench_")
+    try:
+        start = time.perf_counter()
+        build_index(synthetic_corpus(documents), directory)
+        build = time.perf_counter() - start
+        index_mb = sum(
+            os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+        ) / 2**20
+
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        index = BM25Index(directory, in_memory=in_memory)
+        load = time.perf_counter() - start
+        exact, fuzzy = _queries(index, queries, seed=documents)
+        # The first fuzzy query builds the trigram index; keep it out of the samples.
+        index.search(fuzzy[0])
+        result = KnowledgeBaseResult(
+            documents=documents,
+            build=build,
+            index_mb=index_mb,
+            load=load,
+            rss_mb=0.0,
+            latency=_timed(index, exact),
+            fuzzy_latency=_timed(index, fuzzy),
+        )
+        result.rss_mb = rss_mb() - rss_before
+        index.close()
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run(sizes: list[int], queries: int = 200, in_memory: bool = False) -> list[KnowledgeBaseResult]:
+    """
+    Benchmarks the search_information backend as the corpus grows.
+
+    Args:
+        sizes: Corpus sizes in documents, e.g. 1000 up to 10000000.
+        queries: Queries per size.
+        in_memory: Load the index into RAM instead of memory-mapping it.
+    """
+    mode = "in-memory" if in_memory else "memory-mapped"
+    print(f"--- Knowledge base benchmark ({mode}, {queries} queries per size) ---")
+    print(
+        f"{'documents':>10} {'build':>8} {'index':>9} {'load':>8} {'rss':>9} "
+        f"{'p50':>9} {'p95':>9} {'fuzzy p50':>10} {'fuzzy p95':>10}"
+    )
+    results = []
+    for documents in sizes:
+        result = run_size(documents, queries, in_memory)
+        results.append(result)
+        print(
+            f"{documents:>10} {result.build:>7.1f}s {result.index_mb:>7.1f}MB "
+            f"{result.load * 1000:>6.1f}ms {result.rss_mb:>7.1f}MB "
+            f"{result.latency.p50 * 1000:>7.2f}ms {result.latency.p95 * 1000:>7.2f}ms "
+            f"{result.fuzzy_latency.p50 * 1000:>8.2f}ms {result.fuzzy_latency.p95 * 1000:>8.2f}ms"
+        )
+    return results
@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import time
+
+from examples.benchmark.stubs import StubModel, StubProfile
+from examples.langchain.load_balancer import LoadBalancedChatModel, NoHealthyProviderError
+from examples.stats import LatencySummary
+
+
+async def run(duration: float = 9.0, concurrency: int = 8, cooldown: float = 2.0) -> None:
+    """
+    Drives a LoadBalancedChatModel over three stub providers through an incident.
+
+    The fast provider slows down during the second quarter of the run, fails
+    every call during the third and recovers in the last; traffic should move
+    to the steady provider, probe the fast one after each cooldown and move
+    back once a probe succeeds.
+
+    Args:
+        duration: Length of the run in seconds.
+        concurrency: Calls in flight at once.
+        cooldown: Seconds an ejected provider receives no calls.
+    """
+    stubs = {
+        "fast": StubModel(StubProfile(latency=0.03, jitter=0.01, seed=1), name="fast"),
+        "steady": StubModel(StubProfile(latency=0.06, jitter=0.01, seed=2), name="steady"),
+        "slow": StubModel(StubProfile(latency=0.15, jitter=0.05, seed=3), name="slow"),
+    }
+    model = LoadBalancedChatModel(
+        models={name: stub.langchain() for name, stub in stubs.items()},
+        cooldown=cooldown,
+        seed=0,
+    )
+    print(f"--- Load balancer: {duration:.0f}s, concurrency {concurrency} ---")
+    latencies, errors = [], 0
+    start = time.monotonic()
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        i = 0
+        while (elapsed := time.monotonic() - start) < duration:
+            fast = stubs["fast"].profile
+            phase = int(4 * elapsed / duration)
+            fast.latency = 0.2 if phase == 1 else 0.03
+            fast.failure_rate = 1.0 if phase == 2 else 0.0
+            before = time.perf_counter()
+            try:
+                await model.ainvoke(f"Request {worker_id}.{i}")
+                latencies.append(time.perf_counter() - before)
+            except NoHealthyProviderError:
+                errors += 1
+            i += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    print(f"\nLatency: {LatencySummary.from_samples(latencies).format()}, {errors} errors")
+    for name, health in model.health.items():
+        print(
+            f"  {name:<8} {health.calls:>5} calls, {health.failures:>4} failed, "
+            f"latency EWMA {(health.latency or 0) * 1000:.0f}ms, error rate {health.error_rate:.0%}"
+        )
+    model.log.report(list(stubs))
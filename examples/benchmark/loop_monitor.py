@@ -0,0 +1,148 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Optional
+
+from examples.stats import LatencySummary
+
+
+@dataclass
+class Stall:
+    """
+    An interval in which the event loop could not run other coroutines.
+
+    Attributes:
+        start: Seconds since the monitor started.
+        duration: Length of the blocked interval, in seconds.
+        stack: Where the loop thread was while blocked, if captured.
+    """
+
+    start: float
+    duration: float
+    stack: str = ""
+
+
+@dataclass
+class LoopStats:
+    lags: list[float] = field(default_factory=list)
+    stalls: list[Stall] = field(default_factory=list)
+
+    @property
+    def blocked(self) -> float:
+        return sum(stall.duration for stall in self.stalls)
+
+
+class LoopStallMonitor:
+    """
+    Detects blocking calls on the event loop, such as a synchronous network call
+    inside an `async def`.
+
+    A heartbeat coroutine sleeps for `interval` and measures how late it wakes
+    up. Any lateness above `threshold` is a stall. A watchdog thread also
+    records the loop thread's stack while a stall is in progress, pointing at
+    the blocking call.
+
+    Use it as an async context manager around any example runner:
+
+        async with LoopStallMonitor():
+            await call_agent("...")
+
+    Args:
+        interval: Heartbeat period in seconds.
+        threshold: Lateness in seconds reported as a stall.
+        capture_stacks: Record the blocked stack from a watchdog thread.
+        report: Print a summary on exit.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        threshold: float = 0.05,
+        capture_stacks: bool = True,
+        report: bool = True,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.capture_stacks = capture_stacks
+        self.report = report
+        self.stats = LoopStats()
+        self._start = 0.0
+        self._beat = 0.0
+        self._stack = ""
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            before = time.perf_counter()
+            self._beat = before
+            await asyncio.sleep(self.interval)
+            after = time.perf_counter()
+            lag = max(after - before - self.interval, 0.0)
+            self.stats.lags.append(lag)
+            if lag > self.threshold:
+                self.stats.stalls.append(
+                    Stall(start=before + self.interval - self._start, duration=lag, stack=self._stack)
+                )
+            self._stack = ""
+
+    def _watch(self) -> None:
+        # Runs in its own thread, so it keeps running while the loop is blocked.
+        while not self._stopped.wait(self.threshold / 2):
+            if self._stack or time.perf_counter() - self._beat <= self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._stack = "".join(traceback.format_stack(frame, limit=8))
+
+    async def __aenter__(self) -> "LoopStallMonitor":
+        self._start = self._beat = time.perf_counter()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.create_task(self._heartbeat())
+        if self.capture_stacks:
+            self._stopped.clear()
+            self._watchdog = threading.Thread(target=self._watch, daemon=True)
+            self._watchdog.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # A stall still in progress when the body returns has not been seen by the
+        # heartbeat yet, e.g. if the loop was blocked for the whole run.
+        pending = time.perf_counter() - self._beat - self.interval
+        if pending > self.threshold:
+            self.stats.stalls.append(
+                Stall(start=self._beat + self.interval - self._start, duration=pending, stack=self._stack)
+            )
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if self._watchdog:
+            self._stopped.set()
+            self._watchdog.join()
+        if self.report:
+            self.print_report()
+
+    def print_report(self) -> None:
+        stats = self.stats
+        print("\n--- Event Loop Monitor ---")
+        print(f"Lag: {LatencySummary.from_samples(stats.lags).format()}")
+        if not stats.stalls:
+            print(f"No stalls over {self.threshold * 1000:.0f}ms.")
+            return
+        print(f"{len(stats.stalls)} stalls, {stats.blocked * 1000:.0f}ms blocked in total:")
+        for stall in stats.stalls:
+            print(f"  at {stall.start:.3f}s blocked for {stall.duration * 1000:.1f}ms")
+            if stall.stack:
+                print("    " + stall.stack.rstrip().replace("\n", "\n    "))
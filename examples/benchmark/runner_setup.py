@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import time
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from examples.benchmark.stub_adk import use_stub_model
+from examples.benchmark.stubs import StubModel, StubProfile
+from examples.google.events import consume_events
+from examples.google.runners import RunnerRegistry
+from examples.stats import LatencySummary
+
+APP_NAME = "runner_setup"
+USER_ID = "user"
+
+
+async def _per_call(agent, content: types.Content, setup: list, total: list) -> None:
+    # What call_agent used to do: a new service, runner and session per query.
+    start = time.perf_counter()
+    session_service = InMemorySessionService()
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    runner = Runner(agent=agent, app_name=APP_NAME, session_service=session_service)
+    setup.append(time.perf_counter() - start)
+    await consume_events(
+        runner.run_async(user_id=USER_ID, session_id=session.id, new_message=content)
+    )
+    total.append(time.perf_counter() - start)
+
+
+async def _registry(
+    registry: RunnerRegistry, agent, content: types.Content, setup: list, total: list
+) -> None:
+    start = time.perf_counter()
+    async with registry.session(agent, APP_NAME, USER_ID) as session:
+        setup.append(time.perf_counter() - start)
+        await consume_events(session.run_async(content))
+    total.append(time.perf_counter() - start)
+
+
+async def run(queries: int = 200, concurrency: int = 1, latency: float = 0.0) -> None:
+    """
+    Compares per-query runner construction with the shared RunnerRegistry.
+
+    Args:
+        queries: Queries per strategy.
+        concurrency: Queries in flight at once.
+        latency: Simulated model latency in seconds; 0 isolates the overhead.
+    """
+    from examples.google.tools.code_execution import code_agent
+
+    stub = StubModel(StubProfile(latency=latency, tokens_per_second=0))
+    content = types.Content(role="user", parts=[types.Part(text="(5 + 7) * 3")])
+    registry = RunnerRegistry()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            await call
+
+    print(f"--- Runner setup: {queries} queries, concurrency {concurrency} ---")
+    with use_stub_model(code_agent, stub.adk()):
+        for name, make_call in [
+            ("per-call runner", lambda s, t: _per_call(code_agent, content, s, t)),
+            ("runner registry", lambda s, t: _registry(registry, code_agent, content, s, t)),
+        ]:
+            setup, total = [], []
+            # One warm-up query, so that both strategies run with warm imports.
+            await make_call([], [])
+            start = time.perf_counter()
+            await asyncio.gather(*(limited(make_call(setup, total)) for _ in range(queries)))
+            elapsed = time.perf_counter() - start
+            print(f"\n{name}: {queries / elapsed:.1f} queries/s")
+            print(f"  Setup: {LatencySummary.from_samples(setup).format()}")
+            print(f"  Total: {LatencySummary.from_samples(total).format()}")
+    await registry.close()
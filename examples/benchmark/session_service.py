@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from examples.benchmark.stats import rss_mb
+from examples.stats import LatencySummary
+
+APP_NAME = "session_benchmark"
+
+
+@dataclass
+class SessionServiceResult:
+    """
+    Cost of one session service under the benchmark workload.
+
+    Attributes:
+        service: The service name.
+        rss_mb: Growth of the resident set size after the workload.
+        create: Latency of create_session.
+        append: Latency of append_event.
+        get: Latency of get_session on random sessions.
+        elapsed: Wall time of the whole workload, in seconds.
+    """
+
+    service: str
+    rss_mb: float
+    create: LatencySummary
+    append: LatencySummary
+    get: LatencySummary
+    elapsed: float
+
+
+async def _workload(service_name: str, sessions: int, events: int, reads: int) -> SessionServiceResult:
+    from google.adk.events import Event, EventActions
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    from examples.google.sessions import SqliteSessionService
+
+    directory = tempfile.mkdtemp(prefix="sessions_bench_")
+    if service_name == "sqlite":
+        service = SqliteSessionService(os.path.join(directory, "sessions.db"))
+    else:
+        service = InMemorySessionService()
+
+    rss_before = rss_mb()
+    create, append, get = [], [], []
+    text = "A typical user message of a few sentences. " * 5
+    start = time.perf_counter()
+    ids = []
+    for i in range(sessions):
+        user_id = f"user_{i % 1000}"
+        before = time.perf_counter()
+        session = await service.create_session(app_name=APP_NAME, user_id=user_id)
+        create.append(time.perf_counter() - before)
+        ids.append((user_id, session.id))
+        for j in range(events):
+            event = Event(
+                author="user" if j % 2 == 0 else "agent",
+                invocation_id=f"inv_{i}",
+                content=types.Content(role="user", parts=[types.Part(text=text)]),
+                actions=EventActions(state_delta={"turn": j}),
+            )
+            before = time.perf_counter()
+            await service.append_event(session, event)
+            append.append(time.perf_counter() - before)
+
+    rng = random.Random(0)
+    for _ in range(reads):
+        user_id, session_id = rng.choice(ids)
+        before = time.perf_counter()
+        await service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+        get.append(time.perf_counter() - before)
+    if service_name == "sqlite":
+        await service.flush()
+    elapsed = time.perf_counter() - start
+    result = SessionServiceResult(
+        service=service_name,
+        rss_mb=rss_mb() - rss_before,
+        create=LatencySummary.from_samples(create),
+        append=LatencySummary.from_samples(append),
+        get=LatencySummary.from_samples(get),
+        elapsed=elapsed,
+    )
+    if service_name == "sqlite":
+        await service.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def _run_in_process(service_name: str, sessions: int, events: int, reads: int) -> SessionServiceResult:
+    return asyncio.run(_workload(service_name, sessions, events, reads))
+
+
+def run(sessions: int = 100_000, events: int = 2, reads: int = 1000) -> list[SessionServiceResult]:
+    """
+    Compares InMemorySessionService with SqliteSessionService.
+
+    Each service runs in a fresh process, so resident memory is measured
+    without the other's leftovers.
+
+    Args:
+        sessions: Sessions created.
+        events: Events appended to each session.
+        reads: get_session calls on random sessions afterwards.
+    """
+    print(f"--- Session services: {sessions} sessions, {events} events each ---")
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for service_name in ["in-memory", "sqlite"]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(_run_in_process, service_name, sessions, events, reads).result()
+        results.append(result)
+        print(f"\n{service_name}: {result.elapsed:.1f}s, resident memory +{result.rss_mb:.0f}MB")
+        print(f"  create_session: {result.create.format()}")
+        print(f"  append_event:   {result.append.format()}")
+        print(f"  get_session:    {result.get.format()}")
+    return results
@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+from contextlib import contextmanager
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from pydantic import ConfigDict
+
+from examples.benchmark.stubs import StubModel
+
+
+class StubAdkLlm(BaseLlm):
+    """An ADK model that simulates Gemini using a StubModel."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    stub: StubModel
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        prompt = "\n".join(
+            part.text
+            for content in llm_request.contents
+            for part in content.parts or []
+            if part.text
+        )
+        reply = self.stub.reply(prompt)
+        with self.stub.recorder.record():
+            await asyncio.sleep(self.stub.latency_for(reply))
+            self.stub.maybe_fail()
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=reply)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(prompt.split()),
+                candidates_token_count=len(reply.split()),
+                total_token_count=len(prompt.split()) + len(reply.split()),
+            ),
+        )
+
+
+def _llm_agents(agent: BaseAgent):
+    """Yields every LlmAgent reachable from `agent`, including AgentTool agents."""
+    if isinstance(agent, LlmAgent):
+        yield agent
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                yield from _llm_agents(tool.agent)
+    for sub_agent in agent.sub_agents:
+        yield from _llm_agents(sub_agent)
+
+
+@contextmanager
+def use_stub_model(agent: BaseAgent, model: BaseLlm):
+    """
+    Temporarily replaces the model of every LlmAgent in an agent tree.
+
+    Args:
+        agent: The root of the agent tree, typically a module's `root_agent`.
+        model: The model to install, usually `StubModel.adk()`.
+    """
+    originals = [(llm_agent, llm_agent.model) for llm_agent in _llm_agents(agent)]
+    try:
+        for llm_agent, _ in originals:
+            llm_agent.model = model
+        yield agent
+    finally:
+        for llm_agent, original in originals:
+            llm_agent.model = original
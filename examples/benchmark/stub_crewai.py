@@ -0,0 +1,52 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import time
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+from examples.benchmark.stubs import StubModel
+
+
+class StubCrewLLM(BaseLLM):
+    """A CrewAI LLM that simulates a provider using a StubModel."""
+
+    def __init__(self, stub: StubModel):
+        super().__init__(model=stub.name, temperature=0)
+        self.stub = stub
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        **kwargs: Any,
+    ) -> str:
+        if isinstance(messages, str):
+            prompt = messages
+        else:
+            prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        # CrewAI agents parse ReAct-style output, so answer in that format.
+        reply = "Thought: I now know the final answer\nFinal Answer: " + self.stub.reply(
+            prompt
+        )
+        with self.stub.recorder.record():
+            time.sleep(self.stub.latency_for(reply))
+            self.stub.maybe_fail()
+        return reply
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 8192
+
@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict
+
+from examples.benchmark.stubs import StubModel
+
+
+def _prompt_text(messages: list[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+class StubChatModel(BaseChatModel):
+    """A LangChain chat model that simulates a provider using a StubModel."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    stub: StubModel
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    @property
+    def model_name(self) -> str:
+        return self.stub.name
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        # Latency settings do not change the content, so they are not part of the
+        # identity (and therefore not part of response cache keys).
+        return {"model_name": self.stub.name}
+
+    def bind_tools(self, tools, **kwargs):
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return super().bind(tools=formatted_tools, **kwargs)
+
+    def _respond(self, messages: list[BaseMessage], tools: Optional[list]) -> AIMessage:
+        # When tools are bound, call the first one once, then answer with text.
+        if tools and not any(isinstance(m, ToolMessage) for m in messages):
+            function = tools[0]["function"]
+            required = function.get("parameters", {}).get("required") or ["input"]
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": function["name"],
+                        "args": {required[0]: str(messages[-1].content)},
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                    }
+                ],
+            )
+        return AIMessage(content=self.stub.reply(_prompt_text(messages)))
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages, kwargs.get("tools"))
+        with self.stub.recorder.record():
+            time.sleep(self.stub.latency_for(str(message.content)))
+            self.stub.maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages, kwargs.get("tools"))
+        with self.stub.recorder.record():
+            await asyncio.sleep(self.stub.latency_for(str(message.content)))
+            self.stub.maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _tool_call_chunk(message: AIMessage) -> ChatGenerationChunk:
+        return ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {
+                        "name": call["name"],
+                        "args": json.dumps(call["args"]),
+                        "id": call["id"],
+                        "index": i,
+                    }
+                    for i, call in enumerate(message.tool_calls)
+                ],
+            )
+        )
+
+    def _tokens(self, messages: list[BaseMessage]) -> list[str]:
+        reply = self.stub.reply(_prompt_text(messages))
+        words = reply.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        # Agents stream their model calls, so tool calls must be streamed too.
+        message = self._respond(messages, kwargs.get("tools"))
+        if message.tool_calls:
+            with self.stub.recorder.record():
+                time.sleep(self.stub.latency_for(""))
+                self.stub.maybe_fail()
+            yield self._tool_call_chunk(message)
+            return
+        with self.stub.recorder.record():
+            time.sleep(self.stub.first_token_latency())
+            self.stub.maybe_fail()
+            for i, token in enumerate(self._tokens(messages)):
+                if i:
+                    time.sleep(self.stub.token_interval())
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+                if run_manager:
+                    run_manager.on_llm_new_token(token, chunk=chunk)
+                yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages, kwargs.get("tools"))
+        if message.tool_calls:
+            with self.stub.recorder.record():
+                await asyncio.sleep(self.stub.latency_for(""))
+                self.stub.maybe_fail()
+            yield self._tool_call_chunk(message)
+            return
+        with self.stub.recorder.record():
+            await asyncio.sleep(self.stub.first_token_latency())
+            self.stub.maybe_fail()
+            for i, token in enumerate(self._tokens(messages)):
+                if i:
+                    await asyncio.sleep(self.stub.token_interval())
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+                if run_manager:
+                    await run_manager.on_llm_new_token(token, chunk=chunk)
+                yield chunk
@@ -0,0 +1,321 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+import httpx
+from openai import APIConnectionError
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseFailedEvent,
+    ResponseInProgressEvent,
+    ResponseOutputItemDoneEvent,
+)
+
+_BASE_URL = "http://stub.local/v1/responses"
+
+
+class StubCrash(BaseException):
+    """
+    Raised by the stub to simulate the worker process dying mid-run.
+
+    A BaseException, like KeyboardInterrupt, so handlers for API errors do not catch it.
+    """
+
+
+@dataclass
+class StubResearchProfile:
+    """
+    Shape of a simulated deep-research run.
+
+    Args:
+        duration: Seconds from submission until the run completes.
+        jitter: Uniform random time added to the duration of each run, in seconds.
+        searches: Web search calls before the report.
+        citations: Citations in the report.
+        fail: Whether the run ends as failed instead of completed.
+        disconnect_after: Drop each stream connection after this many events.
+        crash_after: Raise StubCrash once after this many API calls or streamed events.
+        seed: Seed for the jitter, so runs are reproducible.
+    """
+
+    duration: float = 2.0
+    jitter: float = 0.0
+    searches: int = 3
+    citations: int = 5
+    fail: bool = False
+    disconnect_after: Optional[int] = None
+    crash_after: Optional[int] = None
+    seed: int = 0
+
+
+@dataclass
+class _Run:
+    id: str
+    model: str
+    started: float
+    duration: float
+    background: bool
+    items: list[dict]
+    cancelled: bool = False
+
+
+def build_items(searches: int, citations: int, prefix: str = "") -> list[dict]:
+    """Output items of a research run, in the order the model produces them."""
+    items = [
+        {
+            "id": f"rs_{prefix}0",
+            "type": "reasoning",
+            "summary": [{"type": "summary_text", "text": "Plan the searches, then write the report."}],
+        }
+    ]
+    for i in range(searches):
+        items.append(
+            {
+                "id": f"ws_{prefix}{i}",
+                "type": "web_search_call",
+                "status": "completed",
+                "action": {"type": "search", "query": f"semaglutide healthcare cost study {i}"},
+            }
+        )
+    items.append(
+        {
+            "id": f"ci_{prefix}0",
+            "type": "code_interpreter_call",
+            "code": "print(sum([1.2, 3.4]))",
+            "container_id": "cntr_stub",
+            "status": "completed",
+            "outputs": [{"type": "logs", "logs": "4.6"}],
+        }
+    )
+    sentences = [f"Finding {i} is supported by source {i}." for i in range(citations)]
+    report = " ".join(sentences)
+    annotations, offset = [], 0
+    for i, sentence in enumerate(sentences):
+        annotations.append(
+            {
+                "type": "url_citation",
+                "title": f"Source {i}",
+                "url": f"https://example.org/source/{i}",
+                "start_index": offset,
+                "end_index": offset + len(sentence),
+            }
+        )
+        offset += len(sentence) + 1
+    items.append(
+        {
+            "id": f"msg_{prefix}0",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": report, "annotations": annotations}],
+        }
+    )
+    return items
+
+
+class StubResponses:
+    """
+    A local stand-in for `client.responses` of the OpenAI SDK.
+
+    Supports `create` (blocking, background and streaming), `retrieve`
+    (including resuming a stream with `starting_after`) and `cancel`, and
+    returns the SDK's own response and event types. Progress follows the wall
+    clock: a background run completes `profile.duration` seconds after it was
+    created, whether or not anyone polls it.
+
+    Attributes:
+        calls: Number of calls per method.
+        connections: Stream connections opened, including resumed ones.
+    """
+
+    def __init__(self, profile: Optional[StubResearchProfile] = None):
+        self.profile = profile or StubResearchProfile()
+        self.calls: Counter[str] = Counter()
+        self.connections = 0
+        self._runs: dict[str, _Run] = {}
+        self._ids = itertools.count()
+        self._ticks = 0
+        self._crashed = False
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+
+    # --- Simulation ---
+
+    def _tick(self) -> None:
+        # Counts API calls and streamed events toward the simulated crash.
+        with self._lock:
+            self._ticks += 1
+            crash = self.profile.crash_after is not None and not self._crashed
+            crash = crash and self._ticks > self.profile.crash_after
+            self._crashed = self._crashed or crash
+        if crash:
+            raise StubCrash("Simulated worker crash")
+
+    def _response(self, run: _Run, now: Optional[float] = None) -> Response:
+        elapsed = (now or time.monotonic()) - run.started
+        duration = run.duration
+        if run.cancelled:
+            status = "cancelled"
+        elif elapsed >= duration:
+            status = "failed" if self.profile.fail else "completed"
+        else:
+            status = "in_progress"
+        # Items appear spread over the run, the report last.
+        done = len(run.items) if elapsed >= duration else int(len(run.items) * elapsed / duration)
+        output = run.items[:done] if status != "failed" else []
+        error = {"code": "server_error", "message": "Simulated failure"} if status == "failed" else None
+        return Response.model_validate(
+            {
+                "id": run.id,
+                "object": "response",
+                "created_at": 0,
+                "model": run.model,
+                "status": status,
+                "background": run.background,
+                "error": error,
+                "output": output,
+                "parallel_tool_calls": False,
+                "tool_choice": "auto",
+                "tools": [],
+            }
+        )
+
+    # Stream events: created, in_progress, one output_item.done per item, then the final event.
+
+    def _offset(self, run: _Run, seq: int) -> float:
+        item = seq - 2
+        if item < 0:
+            return 0.0
+        return run.duration * min(1.0, (item + 1) / (len(run.items) + 1))
+
+    def _event(self, run: _Run, seq: int) -> Any:
+        item = seq - 2
+        if seq == 0:
+            return ResponseCreatedEvent(
+                type="response.created", sequence_number=seq, response=self._response(run, run.started)
+            )
+        if seq == 1:
+            return ResponseInProgressEvent(
+                type="response.in_progress", sequence_number=seq, response=self._response(run, run.started)
+            )
+        if item < len(run.items):
+            return ResponseOutputItemDoneEvent.model_validate(
+                {
+                    "type": "response.output_item.done",
+                    "sequence_number": seq,
+                    "output_index": item,
+                    "item": run.items[item],
+                }
+            )
+        final = self._response(run, run.started + run.duration)
+        if self.profile.fail:
+            return ResponseFailedEvent(type="response.failed", sequence_number=seq, response=final)
+        return ResponseCompletedEvent(type="response.completed", sequence_number=seq, response=final)
+
+    def _events(self, run: _Run, starting_after: Optional[int]) -> Iterator[Any]:
+        self.connections += 1
+        sent = 0
+        first = 0 if starting_after is None else starting_after + 1
+        for seq in range(first, len(run.items) + 3):
+            delay = run.started + self._offset(run, seq) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if run.cancelled:
+                return
+            if self.profile.disconnect_after is not None and sent >= self.profile.disconnect_after:
+                raise APIConnectionError(request=httpx.Request("GET", f"{_BASE_URL}/{run.id}"))
+            self._tick()
+            sent += 1
+            yield self._event(run, seq)
+
+    # --- API ---
+
+    def create(self, *, model: str, background: bool = False, stream: bool = False, **kwargs):
+        self._tick()
+        self.calls["create"] += 1
+        run = _Run(
+            id=f"resp_stub{next(self._ids)}",
+            model=model,
+            started=time.monotonic(),
+            duration=self.profile.duration + self._random.uniform(0, self.profile.jitter),
+            background=background,
+            items=build_items(self.profile.searches, self.profile.citations),
+        )
+        self._runs[run.id] = run
+        if stream:
+            return self._events(run, None)
+        if not background:
+            # The blocking call holds the connection for the whole run.
+            time.sleep(run.duration)
+        return self._response(run)
+
+    def retrieve(
+        self, response_id: str, *, stream: bool = False, starting_after: Optional[int] = None, **kwargs
+    ):
+        self._tick()
+        self.calls["retrieve"] += 1
+        run = self._runs[response_id]
+        if stream:
+            return self._events(run, starting_after)
+        return self._response(run)
+
+    def cancel(self, response_id: str, **kwargs) -> Response:
+        self.calls["cancel"] += 1
+        run = self._runs[response_id]
+        run.cancelled = True
+        return self._response(run)
+
+
+class StubOpenAI:
+    """A client with only the Responses API, backed by StubResponses."""
+
+    def __init__(self, profile: Optional[StubResearchProfile] = None):
+        self.responses = StubResponses(profile)
+
+
+class AsyncStubResponses:
+    """
+    The `client.responses` of AsyncOpenAI, backed by StubResponses.
+
+    Background runs progress with the wall clock, so only a blocking `create`
+    waits. Streaming is not simulated.
+    """
+
+    def __init__(self, profile: Optional[StubResearchProfile] = None):
+        self.sync = StubResponses(profile)
+
+    @property
+    def calls(self) -> Counter:
+        return self.sync.calls
+
+    async def create(self, *, model: str, background: bool = False, **kwargs) -> Response:
+        response = self.sync.create(model=model, background=True, **kwargs)
+        if not background:
+            await asyncio.sleep(self.sync._runs[response.id].duration)
+            response = self.sync.retrieve(response.id)
+        return response
+
+    async def retrieve(self, response_id: str, **kwargs) -> Response:
+        return self.sync.retrieve(response_id, **kwargs)
+
+    async def cancel(self, response_id: str, **kwargs) -> Response:
+        return self.sync.cancel(response_id, **kwargs)
+
+
+class AsyncStubOpenAI:
+    """An async client with only the Responses API, backed by AsyncStubResponses."""
+
+    def __init__(self, profile: Optional[StubResearchProfile] = None):
+        self.responses = AsyncStubResponses(profile)
@@ -0,0 +1,195 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# A fixed vocabulary keeps stub responses deterministic for a given prompt.
+_VOCABULARY = (
+    "agent model tool plan step result context memory chain route reflect "
+    "summary search answer request task output input state event"
+).split()
+
+
+class StubModelError(RuntimeError):
+    """Raised by a stub model to simulate a provider failure."""
+
+
+@dataclass
+class StubProfile:
+    """
+    Latency and reliability profile for a simulated model provider.
+
+    Args:
+        latency: Base time to first token, in seconds.
+        jitter: Uniform random jitter added to the base latency, in seconds.
+        tokens_per_second: Output token rate once the first token has arrived.
+        tokens_per_response: Number of tokens in a default response.
+        failure_rate: Probability that a call raises a StubModelError.
+        tail_probability: Probability that a call hits the tail latency.
+        tail_latency: Extra latency added to tail calls, in seconds.
+        seed: Seed for the random generator, so runs are reproducible.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    tokens_per_second: float = 500.0
+    tokens_per_response: int = 40
+    failure_rate: float = 0.0
+    tail_probability: float = 0.0
+    tail_latency: float = 0.0
+    seed: int = 0
+
+
+class CallRecorder:
+    """Thread-safe record of every model call made against a stub."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+            self.intervals: list[tuple[float, float]] = []
+
+    @contextmanager
+    def record(self):
+        """Records the wall-clock interval of a single model call."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except StubModelError:
+            failed = True
+            raise
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.calls += 1
+                self.failures += failed
+                self.intervals.append((start, end))
+
+    def busy_time(self) -> float:
+        """Returns the time during which at least one model call was in flight."""
+        with self._lock:
+            intervals = sorted(self.intervals)
+        total = 0.0
+        current_start, current_end = None, None
+        for start, end in intervals:
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+
+class StubModel:
+    """
+    Framework-independent core of a deterministic fake chat model.
+
+    The LangChain, ADK and CrewAI adapters all delegate to one StubModel, so
+    round-trips made through any framework land in the same CallRecorder.
+
+    Args:
+        profile: The latency and failure profile to simulate.
+        responder: Optional callable mapping the flattened prompt text to a reply.
+        rules: Optional (substring, reply) pairs checked against the prompt text
+            before the responder.
+        name: The model name reported to the frameworks.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[StubProfile] = None,
+        responder: Optional[Callable[[str], str]] = None,
+        rules: Optional[list[tuple[str, str]]] = None,
+        name: str = "stub-model",
+    ):
+        self.profile = profile or StubProfile()
+        self.responder = responder
+        self.rules = rules or []
+        self.name = name
+        self.recorder = CallRecorder()
+        self._rng = random.Random(self.profile.seed)
+        self._rng_lock = threading.Lock()
+
+    def reply(self, prompt: str) -> str:
+        """Returns the deterministic reply for a prompt."""
+        for substring, reply in self.rules:
+            if substring in prompt:
+                return reply
+        if self.responder:
+            return self.responder(prompt)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        offset = int(digest[:8], 16)
+        words = [
+            _VOCABULARY[(offset + i) % len(_VOCABULARY)]
+            for i in range(self.profile.tokens_per_response)
+        ]
+        return f"Stub response {digest[:8]}: " + " ".join(words)
+
+    def first_token_latency(self) -> float:
+        """Samples the time until the first output token."""
+        profile = self.profile
+        with self._rng_lock:
+            delay = profile.latency + self._rng.uniform(0, profile.jitter)
+            if self._rng.random() < profile.tail_probability:
+                delay += profile.tail_latency
+        return delay
+
+    def token_interval(self) -> float:
+        """Returns the delay between two consecutive output tokens."""
+        if self.profile.tokens_per_second <= 0:
+            return 0.0
+        return 1 / self.profile.tokens_per_second
+
+    def latency_for(self, reply: str) -> float:
+        """Samples the total latency of a non-streaming call returning `reply`."""
+        tokens = max(len(reply.split()), 1)
+        return self.first_token_latency() + (tokens - 1) * self.token_interval()
+
+    def maybe_fail(self) -> None:
+        """Raises a StubModelError with the profile's failure probability."""
+        with self._rng_lock:
+            failed = self._rng.random() < self.profile.failure_rate
+        if failed:
+            raise StubModelError(f"Simulated failure from stub model '{self.name}'.")
+
+    # --- Framework adapters ---
+    # Imported lazily so using one framework does not pay for the others.
+
+    def langchain(self, **kwargs):
+        """Returns a LangChain chat model backed by this stub."""
+        from examples.benchmark.stub_langchain import StubChatModel
+
+        return StubChatModel(stub=self, **kwargs)
+
+    def adk(self, model: str = "gemini-2.0-flash-stub"):
+        """
+        Returns an ADK model backed by this stub.
+
+        The default name starts with 'gemini-2' so that built-in ADK tools such as
+        google_search and BuiltInCodeExecutor accept the stub.
+        """
+        from examples.benchmark.stub_adk import StubAdkLlm
+
+        return StubAdkLlm(model=model, stub=self)
+
+    def crewai(self):
+        """Returns a CrewAI LLM backed by this stub."""
+        from examples.benchmark.stub_crewai import StubCrewLLM
+
+        return StubCrewLLM(stub=self)
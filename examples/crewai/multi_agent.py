@@ -5,59 +5,229 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from crewai import Crew, Task, Agent, Process
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
-
-# Define Agents with specific roles and goals
-researcher = Agent(
-    role="Senior Research Analyst",
-    goal="Find and summarize the latest trends in AI.",
-    backstory="You are an experienced research analyst with a knack for identifying key trends and synthesizing information.",
-    verbose=True,
-    allow_delegation=False,
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, Optional
+
+from crewai import LLM, Crew, Task, Agent, Process
+from crewai.llms.base_llm import BaseLLM
+
+GEMINI_MODEL = "gemini/gemini-2.0-flash"
+DEFAULT_TOPIC = "Artificial Intelligence"
+
+# Define Agents with specific roles and goals.
+# These are only specifications: crews are built from them on demand, with
+# "{topic}" filled in by CrewAI from the kickoff inputs.
+RESEARCHER = MappingProxyType(
+    {
+        "role": "Senior Research Analyst",
+        "goal": "Find and summarize the latest trends in {topic}.",
+        "backstory": "You are an experienced research analyst with a knack for identifying key trends and synthesizing information.",
+        "allow_delegation": False,
+    }
 )
 
-writer = Agent(
-    role="Technical Content Writer",
-    goal="Write a clear and engaging blog post based in research findings.",
-    backstory="You are a skilled writer who can translate complex technical topics into accessible content.",
-    verbose=True,
-    allow_delegation=False,
+WRITER = MappingProxyType(
+    {
+        "role": "Technical Content Writer",
+        "goal": "Write a clear and engaging blog post based in research findings.",
+        "backstory": "You are a skilled writer who can translate complex technical topics into accessible content.",
+        "allow_delegation": False,
+    }
 )
 
 # Define Tasks for the agents
-research_task = Task(
-    description="Research the top 3 emerging trends in Artificial Intelligence in 2025. Focus on practical applications and potential impact.",
-    expected_output="A detailed summary of the top 3 AI trends, including key points and sources.",
-    agent=researcher,
+RESEARCH_TASK = MappingProxyType(
+    {
+        "description": "Research the top 3 emerging trends in {topic} in 2025. Focus on practical applications and potential impact.",
+        "expected_output": "A detailed summary of the top 3 {topic} trends, including key points and sources.",
+    }
 )
 
-writing_task = Task(
-    description="Write a 500-word blog post based on the research findings. The post should be engaging and easy for a general audience to understand.",
-    expected_output="A complete 500-word blog post about the latest AI trends.",
-    agent=writer,
-    context=[research_task],
+WRITING_TASK = MappingProxyType(
+    {
+        "description": "Write a 500-word blog post based on the research findings. The post should be engaging and easy for a general audience to understand.",
+        "expected_output": "A complete 500-word blog post about the latest {topic} trends.",
+    }
 )
 
-# Create the Crew
-blog_creation_crew = Crew(
-    agents=[researcher, writer],
-    tasks=[research_task, writing_task],
-    process=Process.sequential,
-    llm=llm,
-    verbose=True,  # Set verbosity for detailed crew execution logs
-)
+
+class BlogCrewFactory:
+    """
+    Builds blog creation crews on demand.
+
+    Nothing is built at import time. The LLM, which holds the provider client,
+    is created on first use and shared by every crew; the agent and task
+    specifications above are immutable. Each `crew()` gets its own agents and
+    tasks, because CrewAI keeps execution state on them, so crews from one
+    factory can run concurrently.
+
+    Args:
+        llm: The agents' LLM; Gemini 2.0 Flash by default.
+        verbose: Log every agent step; best turned off for batches.
+        instrument: Applied to each new crew, e.g. `crew_tracer.instrument`.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[BaseLLM] = None,
+        verbose: bool = True,
+        instrument: Optional[Callable[[Crew], Crew]] = None,
+    ):
+        self._llm = llm
+        self.verbose = verbose
+        self.instrument = instrument
+
+    @property
+    def llm(self) -> BaseLLM:
+        if self._llm is None:
+            self._llm = LLM(model=GEMINI_MODEL)
+        return self._llm
+
+    def crew(self) -> Crew:
+        researcher = Agent(**RESEARCHER, llm=self.llm, verbose=self.verbose)
+        writer = Agent(**WRITER, llm=self.llm, verbose=self.verbose)
+        research_task = Task(**RESEARCH_TASK, agent=researcher)
+        writing_task = Task(**WRITING_TASK, agent=writer, context=[research_task])
+        crew = Crew(
+            agents=[researcher, writer],
+            tasks=[research_task, writing_task],
+            process=Process.sequential,
+            verbose=self.verbose,  # Set verbosity for detailed crew execution logs
+        )
+        return self.instrument(crew) if self.instrument else crew
 
 
 # Execute the Crew
-def execute():
+def execute(factory: Optional[BlogCrewFactory] = None, topic: str = DEFAULT_TOPIC):
     print("## Running the blog creation crew with Gemini 2.0 Flash... ##")
     try:
-        result = blog_creation_crew.kickoff()
+        crew = (factory or BlogCrewFactory()).crew()
+        result = crew.kickoff(inputs={"topic": topic})
         print("\n-----------------\n")
         print("## Crew Final Output ##")
         print(result)
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
+
+
+# --- Batch Mode ---
+
+
+def read_topics(path: str, field: str = "topic") -> Iterator[str]:
+    """Reads topics from a JSONL file of {"topic": ...} objects or bare JSON strings."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record[field] if isinstance(record, dict) else record
+
+
+@dataclass
+class TopicResult:
+    topic: str
+    seconds: float
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "topic": self.topic,
+            "seconds": round(self.seconds, 3),
+            "output": self.output,
+            "error": self.error,
+        }
+
+
+async def kickoff_batch(
+    topics: Iterable[str],
+    factory: Optional[BlogCrewFactory] = None,
+    concurrency: int = 8,
+    on_result: Optional[Callable[[TopicResult], None]] = None,
+) -> list[TopicResult]:
+    """
+    Writes a blog post per topic, running up to `concurrency` crews at once.
+
+    Like `Crew.kickoff_for_each_async`, every topic gets its own crew, but
+    the number of crews in flight is capped and each topic is timed. Crews
+    run on a thread pool of `concurrency` threads (CrewAI kickoffs block), so
+    the cap also holds beyond the size of asyncio's default executor.
+
+    Args:
+        topics: The topics, e.g. `read_topics(path)`.
+        factory: Builds the crews; a quiet default factory if not given.
+        concurrency: Maximum number of crews running at the same time.
+        on_result: Called with each result as it completes, e.g. to write it out.
+
+    Returns:
+        The results, in topic order. A failed topic has its error set.
+    """
+    factory = factory or BlogCrewFactory(verbose=False)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(topic: str) -> TopicResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Build the crew on the worker thread too, off the event loop.
+                output = await loop.run_in_executor(
+                    executor, lambda: factory.crew().kickoff(inputs={"topic": topic})
+                )
+                result = TopicResult(topic, time.perf_counter() - start, output=output.raw)
+            except Exception as e:
+                # One failed topic should not abort the whole batch.
+                result = TopicResult(topic, time.perf_counter() - start, error=str(e))
+            if on_result:
+                on_result(result)
+            return result
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crew") as executor:
+        return await asyncio.gather(*(run(topic) for topic in topics))
+
+
+async def execute_batch(
+    topics: Iterable[str],
+    factory: Optional[BlogCrewFactory] = None,
+    output_path: Optional[str] = None,
+    concurrency: int = 8,
+) -> list[TopicResult]:
+    """
+    Runs `kickoff_batch` and reports per-topic timing and throughput.
+
+    Each post is written to `output_path` as one JSON line as soon as it is
+    done; posts are printed when no output path is given.
+    """
+    output = open(output_path, "w", encoding="utf-8") if output_path else None
+
+    def write(result: TopicResult) -> None:
+        line = json.dumps(result.to_dict())
+        if output:
+            output.write(line + "\n")
+            output.flush()
+        else:
+            print(line)
+
+    start = time.perf_counter()
+    try:
+        results = await kickoff_batch(topics, factory, concurrency, write)
+    finally:
+        if output:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    print("\n--- Per-topic timing ---")
+    for result in results:
+        status = f"error: {result.error}" if result.error else "ok"
+        print(f"{result.seconds:>8.2f}s  {result.topic}  ({status})")
+    errors = sum(result.error is not None for result in results)
+    posts_per_hour = 3600 * (len(results) - errors) / elapsed if elapsed else 0.0
+    print(
+        f"\n--- Wrote {len(results) - errors} posts ({errors} errors) in {elapsed:.2f}s "
+        f"with concurrency {concurrency}: {posts_per_hour:.0f} posts/hour ---"
+    )
+    return results
@@ -1,7 +1,7 @@
 from crewai import Crew, Task, Agent, Process
 
 
-def execute(llm):
+def execute(llm, step_callback=None):
     # Define a clear and focused agent
     planner_writer_agent = Agent(
         role="Article Planner and Writer",
@@ -38,6 +38,7 @@ def execute(llm):
         agents=[planner_writer_agent],
         tasks=[high_level_task],
         process=Process.sequential,
+        step_callback=step_callback,  # e.g. a CrewStepTracer, called after every agent step
     )
 
     # Execute the task
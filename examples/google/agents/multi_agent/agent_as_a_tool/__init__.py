@@ -9,6 +9,8 @@ from google.adk.agents import LlmAgent
 from google.adk.tools import agent_tool
 from google.genai import types
 
+from examples.google.artifacts import get_artifact_store
+
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
 
@@ -22,22 +24,21 @@ def generate_image(prompt: str) -> dict:
         prompt: A detailed description of the image to generate.
 
     Returns:
-        A dictionary with the status and the generated image bytes.
+        A dictionary with the status and a handle to the generated image.
     """
     print(f"TOOL: Generating image for prompt: '{prompt}'")
     # In a real implementation, this would call an image generation API.
     # For this example, we return mock image data.
     mock_image_bytes = b"mock_image_data_for_a_cat_wearing_a_hat"
-    return {
-        "status": "success",
-        # The tool returns the raw bytes, the agent will handle the Part creation.
-        "image_bytes": mock_image_bytes,
-        "mime_type": "image/png",
-    }
+    # Raw bytes would be base64-encoded into every event and into the Artist's
+    # context. Store them once and pass a small handle; consumers read the bytes
+    # with get_artifact_store().open(handle) only when they need them.
+    handle = get_artifact_store().put(mock_image_bytes, mime_type="image/png")
+    return {"status": "success", "image": handle.to_dict()}
 
 
 # 2. Refactor the ImageGeneratorAgent into an LlmAgent
-# It noew correctly uses the input passed to it.
+# It now correctly uses the input passed to it.
 image_generator_agent = LlmAgent(
     name="ImageGen",
     model=GEMINI_MODEL,
@@ -46,7 +47,7 @@ image_generator_agent = LlmAgent(
         "You are an image generation specialist. Your task is to take the user's request "
         "and use the `generate_image` tool to create the image. "
         "The user's entire request should be used aas the 'prompt' argument for the tool. "
-        "After the tool returns the image bytes, you MUST output the image."
+        "After the tool returns the image handle, you MUST output its 'uri'."
     ),
     tools=[generate_image],
 )
@@ -63,7 +64,8 @@ artist_agent = LlmAgent(
     model=GEMINI_MODEL,
     instruction=(
         "You are a creative artist. First, invent a creative and descriptive prompt for an image. "
-        "Then, use the `ImageGen` tool to generate the image using your prompt."
+        "Then, use the `ImageGen` tool to generate the image using your prompt, "
+        "and reply with the image uri it returns."
     ),
     tools=[image_tool],
 )
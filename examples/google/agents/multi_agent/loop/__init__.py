@@ -5,13 +5,14 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-import asyncio
 from typing import AsyncGenerator
-from google.adk.agents import LoopAgent, LlmAgent, BaseAgent
+from google.adk.agents import LlmAgent, BaseAgent
 from google.adk.events import Event, EventActions
 from google.adk.agents.invocation_context import InvocationContext
 from google.genai.types import Content, Part
 
+from examples.google.scheduling import ScheduledLoopAgent
+
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
 
@@ -37,7 +38,7 @@ class ConditionChecker(BaseAgent):
             content = Content(
                 parts=[Part(text="Condition not met, continuing loop.")], role="model"
             )
-        yield Event(author=self.name, content=content)
+            yield Event(author=self.name, content=content)
 
 
 # Correction: The LlmAgent must have a model and clear instructions.
@@ -47,10 +48,17 @@ process_step = LlmAgent(
     instruction="You are a step in a longer process. Perform your task. If you are the final step, update session state by setting 'status' to 'completed'.",
 )
 
-# The LoopAgent orchestrates the workflow.
-poller = LoopAgent(
+# The ScheduledLoopAgent orchestrates the workflow. Unlike a plain LoopAgent it
+# backs off between iterations instead of re-running the LLM back to back, and
+# skips the LLM entirely once the status is already 'completed'.
+poller = ScheduledLoopAgent(
     name="StatusPoller",
     max_iterations=10,
+    initial_delay=0.5,
+    max_delay=8.0,
+    jitter=0.2,
+    deadline=60.0,
+    done=lambda state: state.get("status") == "completed",
     sub_agents=[
         process_step,
         ConditionChecker(),  # Instantiating the well-defined custom agent.
@@ -59,7 +67,8 @@ poller = LoopAgent(
 
 # This poller will now execute 'process_step'
 # and then 'ConditionChecker'
-# repeatedly until the status is 'completed' or 10 iterations
-# have passed.
+# repeatedly, waiting 0.5s, 1s, 2s, ... (at most 8s) between iterations,
+# until the status is 'completed', 10 iterations have passed or 60 seconds
+# have elapsed. Call poller.wake(session_id) to poll again immediately.
 
 root_agent = poller
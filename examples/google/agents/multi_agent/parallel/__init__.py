@@ -4,7 +4,9 @@
 #
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
-from google.adk.agents import Agent, ParallelAgent
+from google.adk.agents import Agent
+
+from examples.google.parallel import BoundedParallelAgent
 
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
@@ -27,9 +29,14 @@ news_fetcher = Agent(
     output_key="news_data",  # The result will be stored in session.state["news_data"]
 )
 
-# Create the ParallelAgent to orchestrate the sub-agents
-data_gatherer = ParallelAgent(
-    name="data_gatherer", sub_agents=[weather_fetcher, news_fetcher]
+# Create the BoundedParallelAgent to orchestrate the sub-agents.
+# A fetcher that takes longer than 30 seconds is cancelled and its output_key is
+# filled with a placeholder, so one slow source does not stall the other.
+data_gatherer = BoundedParallelAgent(
+    name="data_gatherer",
+    sub_agents=[weather_fetcher, news_fetcher],
+    timeout=30.0,
+    deadline=45.0,
 )
 
 root_agent = data_gatherer
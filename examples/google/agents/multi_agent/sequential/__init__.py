@@ -5,7 +5,9 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-from google.adk.agents import SequentialAgent, Agent
+from google.adk.agents import Agent
+
+from examples.google.state import CompactSequentialAgent, state_instruction
 
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
@@ -13,20 +15,26 @@ GEMINI_MODEL = "gemini-2.0-flash-exp"
 step1 = Agent(name="Step1_Fetch", model=GEMINI_MODEL, output_key="data")
 
 # This agent will use the data from the previous step.
-# We instruct it on how to find and use this data.
+# The instruction provider inserts state["data"], loading it from the blob
+# store if it was spilled there.
 step2 = Agent(
     name="Step2_Process",
     model=GEMINI_MODEL,
-    instruction="Analyze the information found in state['data'] and provide a summary.",
+    instruction=state_instruction(
+        "Analyze the following information and provide a summary.\n\nInformation:\n{data}"
+    ),
 )
 
-pipeline = SequentialAgent(
+# Values over 1 KB are kept out of session state: only a reference to the
+# blob store is saved, so state stays small however much Step1 returns.
+pipeline = CompactSequentialAgent(
     name="MyPipeline",
     sub_agents=[step1, step2],
+    max_value_size=1024,
 )
 
 # When the pipeline is run with an initial input, Step1 will execute,
-# its response will be stored in session.state["data"], and then
-# Step2 will execute, using the information from the state as instructed.
+# its response will be stored (by reference) in session.state["data"], and
+# then Step2 will execute, with the data inserted into its instruction.
 
 root_agent = pipeline
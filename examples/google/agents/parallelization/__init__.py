@@ -5,9 +5,11 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.tools import google_search
 
+from examples.google.parallel import BoundedParallelAgent
+
 GEMINI_MODEL = "gemini-2.0-flash"
 
 # 1. Define Researcher Sub-Agents (to run in parallel)
@@ -60,13 +62,18 @@ researcher_agent_3 = LlmAgent(
     output_key="carbon_capture_result",
 )
 
-# 2. Create the ParallelAgent to run researchers concurrently
+# 2. Create the BoundedParallelAgent to run researchers concurrently
 # This agent orchestrates the concurrent execution of the researchers
-# It finishes once all researchers have completed and stored their results in state.
-parallel_research_agent = ParallelAgent(
+# It finishes once all researchers have stored their results in state, or at the
+# deadline. A researcher that runs out of time is cancelled and a placeholder is
+# stored under its output_key, so the SynthesisAgent still runs on time.
+parallel_research_agent = BoundedParallelAgent(
     name="ParallelWebResearchAgent",
     sub_agents=[researcher_agent_1, researcher_agent_2, researcher_agent_3],
     description="Runs multiple research agents in parallel to gather information.",
+    max_concurrency=3,
+    timeout=60.0,
+    deadline=90.0,
 )
 
 # 3. Define the Merger Agent (runs *after* the parallel agents)
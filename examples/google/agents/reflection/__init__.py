@@ -5,9 +5,11 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-from google.adk.agents import SequentialAgent, LlmAgent
+from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 
+from examples.google.state import CompactSequentialAgent, state_instruction
+
 GEMINI_MODEL = "gemini-2.0-flash"
 
 # The first agent generates the intial draft.
@@ -24,24 +26,31 @@ reviewer = LlmAgent(
     name="FactChecker",
     model=GEMINI_MODEL,
     description="Reviews a given text for factual accuracy and provides a structured critique.",
-    instruction="""
+    # The draft is inserted from state['draft_text'], loaded from the blob store if spilled.
+    instruction=state_instruction("""
     You are a meticulous fact-checker.
-    1. Read the text provided in the state key 'draft_text'.
+    1. Read the text below, taken from the state key 'draft_text'.
     2. Carefully verify the factual accuracy of all claims.
     3. Your final output must be a dictionary containing two keys:
     - "status": A string, either "ACCURATE" or "INACCURATE".
     - "reasoning": A string providing a clear explanation for your status, citing specific issues if any are found.
-    """,
+
+    Text:
+    {draft_text}
+    """),
     output_key="review_output",  # The structured dictionary is saved here.
 )
 
-# The SequentialAgent ensures the generator runs before the reviewer.
-review_pipeline = SequentialAgent(
-    name="WriteAndReview_Pipeline", sub_agents=[generator, reviewer]
+# The CompactSequentialAgent ensures the generator runs before the reviewer, and
+# keeps drafts and reviews over 2 KB out of session state (a reference stays).
+review_pipeline = CompactSequentialAgent(
+    name="WriteAndReview_Pipeline",
+    sub_agents=[generator, reviewer],
+    max_value_size=2048,
 )
 
 # Execution Flow:
-# 1. generator runs -> saves its paragraph to state['draft_text'].
+# 1. generator runs -> saves its paragraph (or a reference to it) to state['draft_text'].
 # 2. reviewer runs -> reads state['draft_text'] and saves its dictionary ouptut to state['review_output']
 
 root_agent = review_pipeline
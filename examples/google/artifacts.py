@@ -0,0 +1,221 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, BinaryIO, Optional, Union
+
+URI_PREFIX = "cas://sha256/"
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class ArtifactHandle:
+    """
+    A reference to bytes in a LocalArtifactStore.
+
+    Tools return `to_dict()` instead of the bytes, so events and session state
+    carry a few dozen bytes however large the artifact is.
+
+    Attributes:
+        sha256: Hex digest of the content, which is also its address.
+        size: Content length in bytes.
+        mime_type: The content type.
+    """
+
+    sha256: str
+    size: int
+    mime_type: str = "application/octet-stream"
+
+    @property
+    def uri(self) -> str:
+        return URI_PREFIX + self.sha256
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"uri": self.uri, **asdict(self)}
+
+    def __post_init__(self):
+        # Handles arrive from model output and tool arguments, and the digest
+        # becomes a file name: accept nothing but a SHA-256 hex digest.
+        if not isinstance(self.sha256, str) or not _DIGEST.fullmatch(self.sha256):
+            raise ValueError(f"Not a SHA-256 digest: {self.sha256!r}")
+
+    @classmethod
+    def from_value(cls, value: Union["ArtifactHandle", dict, str]) -> "ArtifactHandle":
+        """
+        Accepts a handle, its dict form, or a `cas://sha256/...` URI.
+
+        Raises:
+            ValueError: If the value does not name a SHA-256 digest.
+        """
+        if isinstance(value, ArtifactHandle):
+            return value
+        if isinstance(value, str):
+            if not value.startswith(URI_PREFIX):
+                raise ValueError(f"Not an artifact URI: {value}")
+            return cls(sha256=value[len(URI_PREFIX) :], size=-1)
+        return cls(
+            sha256=value["sha256"],
+            size=value.get("size", -1),
+            mime_type=value.get("mime_type", "application/octet-stream"),
+        )
+
+
+@dataclass
+class ArtifactStoreStats:
+    puts: int = 0
+    dedup_hits: int = 0
+    bytes_written: int = 0
+    bytes_deduplicated: int = 0
+    reads: int = 0
+
+
+class LocalArtifactStore:
+    """
+    A content-addressed blob store on the local file system.
+
+    Every blob is stored once under its SHA-256, so writing the same bytes
+    twice costs a hash but no I/O. Reads map the file and return a read-only
+    memoryview: nothing is copied until a consumer actually touches the bytes,
+    and several readers share the page cache.
+
+    Args:
+        root: Directory of the store; created if missing.
+        chunk_size: Read size when hashing streams.
+    """
+
+    def __init__(self, root: str, chunk_size: int = 1 << 20):
+        self.root = os.path.realpath(root)
+        self.chunk_size = chunk_size
+        self.stats = ArtifactStoreStats()
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, handle: Union[ArtifactHandle, dict, str]) -> str:
+        digest = ArtifactHandle.from_value(handle).sha256
+        # Two levels of fan-out keep directories small with many blobs.
+        path = os.path.realpath(os.path.join(self.root, digest[:2], digest[2:]))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Artifact path escapes the store: {digest}")
+        return path
+
+    def exists(self, handle: Union[ArtifactHandle, dict, str]) -> bool:
+        return os.path.exists(self.path(handle))
+
+    def _commit(self, temp_path: str, digest: str, size: int, mime_type: str) -> ArtifactHandle:
+        handle = ArtifactHandle(sha256=digest, size=size, mime_type=mime_type)
+        target = self.path(handle)
+        with self._lock:
+            self.stats.puts += 1
+            if os.path.exists(target):
+                self.stats.dedup_hits += 1
+                self.stats.bytes_deduplicated += size
+                os.unlink(temp_path)
+                return handle
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Blobs are immutable: a reader never sees a partial file.
+            os.replace(temp_path, target)
+            self.stats.bytes_written += size
+        return handle
+
+    def put(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        mime_type: str = "application/octet-stream",
+    ) -> ArtifactHandle:
+        """Stores `data` unless an identical blob exists and returns its handle."""
+        view = memoryview(data)
+        digest = hashlib.sha256(view).hexdigest()
+        handle = ArtifactHandle(sha256=digest, size=view.nbytes, mime_type=mime_type)
+        if self.exists(handle):
+            # Skip the temporary copy entirely.
+            with self._lock:
+                self.stats.puts += 1
+                self.stats.dedup_hits += 1
+                self.stats.bytes_deduplicated += view.nbytes
+            return handle
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".put-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(view)
+        return self._commit(temp_path, digest, view.nbytes, mime_type)
+
+    def put_stream(
+        self, stream: BinaryIO, mime_type: str = "application/octet-stream"
+    ) -> ArtifactHandle:
+        """Stores a file-like object chunk by chunk, hashing while writing."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".put-")
+        with os.fdopen(fd, "wb") as f:
+            while chunk := stream.read(self.chunk_size):
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        return self._commit(temp_path, digest.hexdigest(), size, mime_type)
+
+    def open(self, handle: Union[ArtifactHandle, dict, str]) -> memoryview:
+        """
+        Returns a read-only view of the blob, backed by a memory map.
+
+        The map stays open while the view (or a slice of it) is referenced.
+
+        Raises:
+            KeyError: If the store has no such blob.
+            ValueError: If the handle does not name a SHA-256 digest.
+        """
+        path = self.path(handle)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                self.stats.reads += 1
+                if size == 0:
+                    return memoryview(b"")
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            raise KeyError(ArtifactHandle.from_value(handle).uri) from None
+
+    def read(self, handle: Union[ArtifactHandle, dict, str]) -> bytes:
+        """Returns a copy of the blob, for APIs that need `bytes`."""
+        return self.open(handle).tobytes()
+
+    def delete(self, handle: Union[ArtifactHandle, dict, str]) -> None:
+        try:
+            os.unlink(self.path(handle))
+        except FileNotFoundError:
+            pass
+
+
+def is_artifact(value: Any) -> bool:
+    """Whether a tool result or state value is an artifact handle in dict form."""
+    return isinstance(value, dict) and str(value.get("uri", "")).startswith(URI_PREFIX)
+
+
+_store: Optional[LocalArtifactStore] = None
+
+
+def get_artifact_store() -> LocalArtifactStore:
+    """
+    Returns the process-wide store, created on first use.
+
+    It lives in $ARTIFACT_STORE_DIR, or a directory under the system temp dir.
+    """
+    global _store
+    if _store is None:
+        _store = LocalArtifactStore(
+            os.environ.get("ARTIFACT_STORE_DIR")
+            or os.path.join(tempfile.gettempdir(), "agentic-patterns-artifacts")
+        )
+    return _store
+
+
+def set_artifact_store(store: LocalArtifactStore) -> None:
+    global _store
+    _store = store
@@ -0,0 +1,135 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Callable, Optional
+
+from google.adk.events import Event
+from google.genai import types
+
+
+@dataclass
+class ToolSpan:
+    """A tool call, from the event requesting it to the event carrying its result."""
+
+    name: str
+    start: float
+    end: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+
+@dataclass
+class EventSummary:
+    """
+    What an agent run produced, extracted from its events in a single pass.
+
+    Times are seconds since `consume_events` was called.
+
+    Attributes:
+        final_text: The text of the last final response.
+        code: Code generated for the built-in code executor.
+        execution_results: Results of executing that code.
+        grounding_metadata: Grounding metadata of the last event that had any.
+        tool_spans: Function calls and code executions, in call order.
+        event_times: (time, author) of every event.
+        time_to_first_event: Time until the first event arrived.
+        time_to_final_response: Time until the last final response arrived.
+    """
+
+    final_text: str = ""
+    code: list[str] = field(default_factory=list)
+    execution_results: list[types.CodeExecutionResult] = field(default_factory=list)
+    grounding_metadata: Optional[types.GroundingMetadata] = None
+    tool_spans: list[ToolSpan] = field(default_factory=list)
+    event_times: list[tuple[float, str]] = field(default_factory=list)
+    time_to_first_event: Optional[float] = None
+    time_to_final_response: Optional[float] = None
+
+    def timing(self) -> str:
+        def ms(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value * 1000:.1f}ms"
+
+        spans = ", ".join(f"{span.name} {ms(span.duration)}" for span in self.tool_spans)
+        return (
+            f"{len(self.event_times)} events, first after {ms(self.time_to_first_event)}, "
+            f"final response after {ms(self.time_to_final_response)}"
+            + (f", tools: {spans}" if spans else "")
+        )
+
+
+async def consume_events(
+    events: AsyncIterable[Event],
+    on_event: Optional[Callable[[Event, float], None]] = None,
+    stop_at_final_response: bool = False,
+) -> EventSummary:
+    """
+    Consumes the events of an agent run and summarizes them.
+
+    Each event's parts are visited once, in place.
+
+    Args:
+        events: Typically `runner.run_async(...)`.
+        on_event: Called with every event and its time, e.g. for logging.
+        stop_at_final_response: Stop reading after the first final response;
+            the event generator is closed either way.
+    """
+    summary = EventSummary()
+    start = time.perf_counter()
+    open_calls: dict[str, ToolSpan] = {}
+    code_span: Optional[ToolSpan] = None
+
+    try:
+        async for event in events:
+            now = time.perf_counter() - start
+            if summary.time_to_first_event is None:
+                summary.time_to_first_event = now
+            summary.event_times.append((now, event.author))
+            if on_event:
+                on_event(event, now)
+            if event.grounding_metadata:
+                summary.grounding_metadata = event.grounding_metadata
+
+            final = event.is_final_response()
+            text = []
+            parts = event.content.parts if event.content and event.content.parts else ()
+            for part in parts:
+                if part.function_call:
+                    span = ToolSpan(name=part.function_call.name or "", start=now)
+                    open_calls[part.function_call.id or span.name] = span
+                    summary.tool_spans.append(span)
+                elif part.function_response:
+                    response = part.function_response
+                    span = open_calls.pop(response.id or response.name or "", None)
+                    if span:
+                        span.end = now
+                elif part.executable_code:
+                    summary.code.append(part.executable_code.code or "")
+                    code_span = ToolSpan(name="code_execution", start=now)
+                    summary.tool_spans.append(code_span)
+                elif part.code_execution_result:
+                    summary.execution_results.append(part.code_execution_result)
+                    if code_span:
+                        code_span.end = now
+                        code_span = None
+                elif part.text and final and not part.thought:
+                    text.append(part.text)
+
+            if final:
+                summary.time_to_final_response = now
+                if text:
+                    summary.final_text = "".join(text)
+                if stop_at_final_response:
+                    break
+    finally:
+        # Stopping early leaves the run's generator suspended; close it here, so
+        # its cleanup (tracing spans, session writes) runs now and in this task.
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return summary
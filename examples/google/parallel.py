@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import time
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai.types import Content, Part
+
+
+def _branch_context(agent: BaseAgent, sub_agent: BaseAgent, ctx: InvocationContext) -> InvocationContext:
+    # Same isolation as ADK's ParallelAgent: every sub-agent gets its own branch.
+    ctx = ctx.model_copy()
+    suffix = f"{agent.name}.{sub_agent.name}"
+    ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+    return ctx
+
+
+class BoundedParallelAgent(BaseAgent):
+    """
+    Runs its sub-agents in parallel, but never waits on them indefinitely.
+
+    - At most `max_concurrency` sub-agents run at once; the rest wait for a slot.
+    - Each sub-agent is cancelled after `timeout` seconds.
+    - All sub-agents are cancelled at `deadline` seconds after the start,
+      including those still waiting for a slot.
+
+    A cancelled sub-agent's `output_key` is set to `placeholder`, so agents
+    reading it from state downstream still run. The duration and outcome of
+    every branch are written to the `<name>_metrics` state key.
+    """
+
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    placeholder: str = "No result: {agent} did not finish within its time limit."
+
+    def _placeholder_event(self, sub_agent: BaseAgent, ctx: InvocationContext) -> Event:
+        text = self.placeholder.format(agent=sub_agent.name)
+        output_key = getattr(sub_agent, "output_key", None)
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=sub_agent.name,
+            branch=ctx.branch,
+            content=Content(role="model", parts=[Part(text=text)]),
+            actions=EventActions(state_delta={output_key: text} if output_key else {}),
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        start = time.monotonic()
+        deadline_at = None if self.deadline is None else start + self.deadline
+        semaphore = asyncio.Semaphore(self.max_concurrency or len(self.sub_agents) or 1)
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        metrics: dict[str, dict] = {}
+
+        async def put(event: Event) -> None:
+            # Like ParallelAgent, a branch waits until its event has been consumed.
+            consumed = asyncio.Event()
+            await queue.put((event, consumed))
+            await consumed.wait()
+
+        async def run_branch(sub_agent: BaseAgent) -> None:
+            branch_ctx = _branch_context(self, sub_agent, ctx)
+            try:
+                async with semaphore:
+                    started = time.monotonic()
+                    limits = [self.timeout] if self.timeout is not None else []
+                    if deadline_at is not None:
+                        limits.append(deadline_at - started)
+                    limit = min(limits) if limits else None
+                    outcome = "completed"
+                    if limit is not None and limit <= 0:
+                        outcome = "skipped"
+                    else:
+                        events = sub_agent.run_async(branch_ctx)
+                        try:
+                            async with asyncio.timeout(limit):
+                                async for event in events:
+                                    await put(event)
+                        except TimeoutError:
+                            outcome = "timed_out"
+                        finally:
+                            await events.aclose()
+                    metrics[sub_agent.name] = {
+                        "outcome": outcome,
+                        "waited": started - start,
+                        "duration": time.monotonic() - started,
+                    }
+                    if outcome != "completed":
+                        await put(self._placeholder_event(sub_agent, branch_ctx))
+            finally:
+                await queue.put((finished, None))
+
+        async with asyncio.TaskGroup() as group:
+            for sub_agent in self.sub_agents:
+                group.create_task(run_branch(sub_agent))
+            remaining = len(self.sub_agents)
+            while remaining:
+                event, consumed = await queue.get()
+                if event is finished:
+                    remaining -= 1
+                    continue
+                yield event
+                consumed.set()
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={f"{self.name}_metrics": metrics}),
+        )
@@ -8,13 +8,20 @@
 # See the LICENSE file in the repository for the full license text.
 
 import asyncio
+import time
 import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Iterable, Optional, Union
 
 from google.adk.agents import Agent
 from google.adk.runners import InMemoryRunner
 from google.adk.tools import FunctionTool
 from google.genai import types
 
+from examples.google.events import consume_events
+from examples.google.runners import registry
+from examples.stats import LatencySummary
+
 # Define Tool Functions
 # These functions simulate the actions of the specialist agents.
 
@@ -87,62 +94,202 @@ coordinator = Agent(
 )
 
 
-async def run_coordinator(runner: InMemoryRunner, request: str):
-    """Runs the coordinator agent with a given request and delegates."""
+async def run_coordinator(
+    runner: InMemoryRunner,
+    request: str,
+    user_id: str = "user_123",
+    session_id: Optional[str] = None,
+):
+    """
+    Runs the coordinator agent with a given request and delegates.
+
+    Args:
+        runner: The runner of the coordinator agent.
+        request: The user's request.
+        user_id: The user the session belongs to.
+        session_id: An existing session to continue; a new one is created if omitted.
+    """
     print(f"\n--- Running Coordinator with request: '{request}' ---")
     final_result = ""
     try:
-        user_id = "user_123"
-        session_id = str(uuid.uuid4())
-        await runner.session_service.create_session(
-            app_name=runner.app_name, user_id=user_id, session_id=session_id
-        )
+        if session_id is None:
+            session_id = str(uuid.uuid4())
+            await runner.session_service.create_session(
+                app_name=runner.app_name, user_id=user_id, session_id=session_id
+            )
 
         # Use run_async instead of run to avoid thread creation
-        async for event in runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=types.Content(role="user", parts=[types.Part(text=request)]),
-        ):
-            if event.is_final_response() and event.content:
-                # Try to get text directly from event.content to avoid iterating parts
-                if hasattr(event.content, "text") and event.content.text:
-                    final_result = event.content.text
-                elif event.content.parts:
-                    # Fallback: Iterate through parts and extract text (might trigger warning)
-                    text_parts = [
-                        part.text for part in event.content.parts if part.text
-                    ]
-                    final_result = "".join(text_parts)
-
-                # Assuming the loop should break after the final response
-                break
+        summary = await consume_events(
+            runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=types.Content(role="user", parts=[types.Part(text=request)]),
+            ),
+            stop_at_final_response=True,
+        )
+        final_result = summary.final_text
 
         print(f"Coordinator Final Response: {final_result}")
+        print(f"Timing: {summary.timing()}")
         return final_result
     except Exception as e:
         print(f"An error occurred while processing your request: {e}")
         return f"An error occurred while processing your request: {e}"
 
 
-async def execute():
-    runner = InMemoryRunner(coordinator)
+# --- Coordinator Service ---
 
-    try:
-        # Example usages
-        result_a = await run_coordinator(runner, "Book me a hotel in Paris.")
-        print(f"Final Output A: {result_a}")
 
-        result_b = await run_coordinator(
-            runner, "What is the highest mountain in the world?"
+@dataclass
+class _UserSession:
+    session_id: str
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    turns: int = 0
+
+
+@dataclass
+class ServiceStats:
+    latencies: list[float] = field(default_factory=list)
+    sessions_created: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> None:
+        print("\n--- Coordinator Service Stats ---")
+        print(
+            f"{len(self.latencies)} requests in {self.elapsed:.2f}s "
+            f"({self.requests_per_second:.2f} req/s), {self.sessions_created} sessions created"
+        )
+        print(f"Latency: {LatencySummary.from_samples(self.latencies).format()}")
+
+
+class CoordinatorService:
+    """
+    Serves a stream of (user_id, request) pairs concurrently on one runner.
+
+    Requests of different users run in parallel, up to `concurrency`. Every
+    request gets a fresh session by default: ADK resumes a session with the
+    agent that answered last, so on a reused session a follow-up would go to
+    the previous sub-agent instead of being routed by the coordinator.
+
+    With `reuse_sessions`, each user keeps one session, so follow-up requests
+    see the earlier turns and skip the session setup; only use it with agents
+    that transfer back to the coordinator. A session is not safe for concurrent
+    appends, so requests of the same user are then serialized by a per-session
+    lock.
+
+    Args:
+        runner: The runner of the coordinator agent.
+        concurrency: Maximum number of requests in flight.
+        reuse_sessions: Keep one session per user instead of one per request.
+        max_turns: Start a fresh session after this many requests, which bounds
+            the history sent to the model on every turn.
+    """
+
+    def __init__(
+        self,
+        runner: InMemoryRunner,
+        concurrency: int = 8,
+        reuse_sessions: bool = False,
+        max_turns: int = 20,
+    ):
+        self.runner = runner
+        self.concurrency = concurrency
+        self.reuse_sessions = reuse_sessions
+        self.max_turns = max_turns
+        self.stats = ServiceStats()
+        self._sessions: dict[str, _UserSession] = {}
+
+    async def _session(self, user_id: str) -> _UserSession:
+        session = await self.runner.session_service.create_session(
+            app_name=self.runner.app_name, user_id=user_id
         )
-        print(f"Final Output B: {result_b}")
+        self.stats.sessions_created += 1
+        return _UserSession(session_id=session.id)
+
+    async def handle(self, user_id: str, request: str) -> str:
+        """Runs one request, on the user's session if sessions are reused."""
+        start = time.perf_counter()
+        if not self.reuse_sessions:
+            session = await self._session(user_id)
+            result = await run_coordinator(self.runner, request, user_id, session.session_id)
+        else:
+            if user_id not in self._sessions:
+                # Registered before the first await, so concurrent requests share it.
+                self._sessions[user_id] = _UserSession(session_id="")
+            user_session = self._sessions[user_id]
+            async with user_session.lock:
+                if not user_session.session_id or user_session.turns >= self.max_turns:
+                    user_session.session_id = (await self._session(user_id)).session_id
+                    user_session.turns = 0
+                user_session.turns += 1
+                result = await run_coordinator(
+                    self.runner, request, user_id, user_session.session_id
+                )
+        self.stats.latencies.append(time.perf_counter() - start)
+        return result
 
-        result_c = await run_coordinator(runner, "Tell me a random fact.")
-        print(f"Final Output C: {result_c}")
+    async def serve(
+        self,
+        requests: Union[Iterable[tuple[str, str]], AsyncIterable[tuple[str, str]]],
+    ) -> list[str]:
+        """
+        Runs every request and returns the responses in input order.
 
-        result_d = await run_coordinator(runner, "Find flights in Tokyo next month.")
-        print(f"Final Output D: {result_d}")
+        A new request is only taken from the stream when a slot is free.
+
+        Args:
+            requests: (user_id, request) pairs.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = []
+
+        async def run(user_id: str, request: str) -> str:
+            try:
+                return await self.handle(user_id, request)
+            finally:
+                semaphore.release()
+
+        async def submit(user_id: str, request: str) -> None:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(run(user_id, request)))
+
+        start = time.perf_counter()
+        try:
+            if isinstance(requests, AsyncIterable):
+                async for user_id, request in requests:
+                    await submit(user_id, request)
+            else:
+                for user_id, request in requests:
+                    await submit(user_id, request)
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.stats.elapsed += time.perf_counter() - start
+
+
+async def execute(concurrency: int = 4):
+    # Share the registry's plugins (e.g. telemetry) with this dedicated runner.
+    runner = InMemoryRunner(coordinator, plugins=list(registry.plugins))
+    service = CoordinatorService(runner, concurrency=concurrency)
+
+    try:
+        # Example usages: two users with two requests each. Requests run
+        # concurrently, each in its own session so the coordinator routes it.
+        requests = [
+            ("user_1", "Book me a hotel in Paris."),
+            ("user_2", "What is the highest mountain in the world?"),
+            ("user_2", "Tell me a random fact."),
+            ("user_1", "Find flights in Tokyo next month."),
+        ]
+        results = await service.serve(requests)
+        for label, result in zip("ABCD", results):
+            print(f"Final Output {label}: {result}")
+        service.stats.report()
 
     except Exception as e:
         print(f"Error during execution: {e}")
@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from examples.google.events import consume_events
+
+
+@dataclass
+class RunnerSession:
+    """A session on a shared runner, valid inside `RunnerRegistry.session`."""
+
+    runner: Runner
+    user_id: str
+    session_id: str
+
+    def run_async(self, content: types.Content) -> AsyncIterator[Event]:
+        return self.runner.run_async(
+            user_id=self.user_id, session_id=self.session_id, new_message=content
+        )
+
+
+class RunnerRegistry:
+    """
+    Process-wide cache of runners, one per (agent, app_name).
+
+    Building a Runner and its services on every query is pure overhead, and a
+    fixed session ID shared by every call mixes up concurrent conversations.
+    The registry builds each runner once and gives every request its own
+    session, so one runner serves any number of concurrent requests.
+
+    Args:
+        session_service: Shared by every runner, e.g. a SqliteSessionService for
+            persistent sessions. By default each runner gets an in-memory one.
+        plugins: ADK plugins installed on every runner, e.g. a TelemetryPlugin.
+    """
+
+    def __init__(
+        self,
+        session_service: Optional[BaseSessionService] = None,
+        plugins: Optional[list[BasePlugin]] = None,
+    ):
+        self.session_service = session_service
+        self.plugins = list(plugins or [])
+        # Keyed by id(agent), since agents are not hashable. The entry keeps its
+        # agent alive, so the ID cannot be reused by another agent while cached.
+        self._entries: dict[tuple[int, str], tuple[BaseAgent, Runner]] = {}
+
+    def get(self, agent: BaseAgent, app_name: str) -> Runner:
+        """Returns the runner of `agent`, building it on first use."""
+        # No await between lookup and insert, so concurrent callers cannot race.
+        key = (id(agent), app_name)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is agent:
+            return entry[1]
+        # Only a session service: the examples use no artifacts or memory, and
+        # InMemoryRunner's extra services add per-query work.
+        runner = Runner(
+            agent=agent,
+            app_name=app_name,
+            session_service=self.session_service or InMemorySessionService(),
+            plugins=list(self.plugins),
+        )
+        self._entries[key] = (agent, runner)
+        return runner
+
+    def add_plugin(self, plugin: BasePlugin) -> None:
+        """Installs a plugin on every runner, including those already built."""
+        self.plugins.append(plugin)
+        for _, runner in self._entries.values():
+            runner.plugin_manager.register_plugin(plugin)
+
+    @asynccontextmanager
+    async def session(
+        self, agent: BaseAgent, app_name: str, user_id: str, keep: bool = False
+    ) -> AsyncIterator[RunnerSession]:
+        """
+        Creates a session with a unique ID on the agent's shared runner.
+
+        Args:
+            agent: The agent to run.
+            app_name: The application name of the runner.
+            user_id: The user the session belongs to.
+            keep: Keep the session after the block; by default it is deleted so
+                that a long-lived runner does not accumulate sessions.
+        """
+        runner = self.get(agent, app_name)
+        session_id = uuid.uuid4().hex
+        await runner.session_service.create_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        try:
+            yield RunnerSession(runner=runner, user_id=user_id, session_id=session_id)
+        finally:
+            if not keep:
+                await runner.session_service.delete_session(
+                    app_name=app_name, user_id=user_id, session_id=session_id
+                )
+
+    async def close(self) -> None:
+        for _, runner in self._entries.values():
+            await runner.close()
+        self._entries.clear()
+
+
+registry = RunnerRegistry()
+
+
+async def run_agent(
+    agent: BaseAgent, query: str, app_name: str = "examples", user_id: str = "user"
+) -> str:
+    """
+    Runs an agent once on a fresh session of its shared runner and returns its final text.
+
+    Args:
+        agent: The agent to run, typically an agent package's `root_agent`.
+        query: The user message.
+        app_name: The application name used for the session.
+        user_id: The user the session belongs to.
+    """
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+    async with registry.session(agent, app_name, user_id) as session:
+        summary = await consume_events(session.run_async(content))
+    return summary.final_text
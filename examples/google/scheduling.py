@@ -0,0 +1,204 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncGenerator, Callable, Optional
+
+from google.adk.agents import LlmAgent, LoopAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.utils.context_utils import Aclosing
+from pydantic import PrivateAttr
+
+
+class PollScheduler:
+    """
+    Delays between polls: exponential backoff with jitter, an overall deadline,
+    and early wake-up by an external event.
+
+    Args:
+        initial_delay: Delay before the second poll, in seconds.
+        max_delay: Upper bound of the backoff.
+        multiplier: Growth factor of the delay per poll.
+        jitter: Random spread of each delay, as a fraction of it, so that many
+            pollers do not fire in lockstep.
+        deadline: Seconds after creation when polling gives up, or None.
+        seed: Seed of the jitter.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.1,
+        deadline: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = None if deadline is None else time.monotonic() + deadline
+        self._delay = initial_delay
+        self._rng = random.Random(seed)
+        self._wake = asyncio.Event()
+
+    def remaining(self) -> float:
+        return float("inf") if self.deadline is None else self.deadline - time.monotonic()
+
+    def wake(self) -> None:
+        """Ends the current wait early, e.g. when a job reports completion."""
+        self._wake.set()
+
+    def reset(self) -> None:
+        """Restarts the backoff from `initial_delay`."""
+        self._delay = self.initial_delay
+
+    def next_delay(self) -> float:
+        delay = self._delay * (1 + self._rng.uniform(-self.jitter, self.jitter))
+        self._delay = min(self._delay * self.multiplier, self.max_delay)
+        return min(delay, self.max_delay)
+
+    async def wait(self) -> str:
+        """
+        Waits for the next poll.
+
+        Returns:
+            "timer" after the backoff delay, "wake" if woken early, or
+            "deadline" if the deadline has passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            return "deadline"
+        if self._wake.is_set():
+            self._wake.clear()
+            self.reset()
+            return "wake"
+        delay = self.next_delay()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=min(delay, remaining))
+        except asyncio.TimeoutError:
+            return "deadline" if delay >= remaining else "timer"
+        self._wake.clear()
+        self.reset()
+        return "wake"
+
+
+@dataclass
+class IterationMetrics:
+    """
+    One iteration of a ScheduledLoopAgent.
+
+    Attributes:
+        iteration: Zero-based iteration number.
+        waited: Seconds waited before the iteration.
+        trigger: What started it: "start", "timer" or "wake".
+        duration: Seconds spent running the sub-agents.
+        events: Events yielded by the sub-agents.
+        model_calls: Events authored by LLM sub-agents.
+    """
+
+    iteration: int
+    waited: float
+    trigger: str
+    duration: float = 0.0
+    events: int = 0
+    model_calls: int = 0
+
+
+class ScheduledLoopAgent(LoopAgent):
+    """
+    A LoopAgent that waits between iterations according to a PollScheduler.
+
+    Before each iteration `done` is checked against the session state, so a
+    completed job ends the loop without another model call. The loop also ends
+    when a sub-agent escalates, after `max_iterations`, or at the deadline.
+    Call `wake(session_id)` to start the next iteration immediately. Each
+    invocation has its own scheduler, so concurrent runs on one session do
+    not share their backoff.
+
+    The per-iteration metrics are written to the `poll_metrics` state key.
+    """
+
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.1
+    deadline: Optional[float] = None
+    done: Optional[Callable[[dict[str, Any]], bool]] = None
+
+    # Session ID -> invocation ID -> the scheduler of that run.
+    _schedulers: dict[str, dict[str, PollScheduler]] = PrivateAttr(default_factory=dict)
+
+    def wake(self, session_id: str, invocation_id: Optional[str] = None) -> bool:
+        """
+        Wakes the loops running on a session, or only the given invocation.
+
+        Returns False if none is running.
+        """
+        running = self._schedulers.get(session_id, {})
+        if invocation_id is None:
+            schedulers = list(running.values())
+        else:
+            schedulers = [running[invocation_id]] if invocation_id in running else []
+        for scheduler in schedulers:
+            scheduler.wake()
+        return bool(schedulers)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        scheduler = PollScheduler(
+            initial_delay=self.initial_delay,
+            max_delay=self.max_delay,
+            multiplier=self.multiplier,
+            jitter=self.jitter,
+            deadline=self.deadline,
+        )
+        self._schedulers.setdefault(ctx.session.id, {})[ctx.invocation_id] = scheduler
+        llm_agents = {agent.name for agent in self.sub_agents if isinstance(agent, LlmAgent)}
+        metrics: list[IterationMetrics] = []
+        trigger, waited = "start", 0.0
+        try:
+            while not self.max_iterations or len(metrics) < self.max_iterations:
+                if self.done and self.done(ctx.session.state):
+                    break
+                iteration = IterationMetrics(iteration=len(metrics), waited=waited, trigger=trigger)
+                metrics.append(iteration)
+                start = time.perf_counter()
+                should_exit = False
+                for sub_agent in self.sub_agents:
+                    async with Aclosing(sub_agent.run_async(ctx)) as agen:
+                        async for event in agen:
+                            iteration.events += 1
+                            iteration.model_calls += event.author in llm_agents
+                            yield event
+                            if event.actions.escalate:
+                                should_exit = True
+                    if should_exit:
+                        break
+                iteration.duration = time.perf_counter() - start
+                if should_exit or (self.max_iterations and len(metrics) >= self.max_iterations):
+                    break
+
+                start = time.perf_counter()
+                trigger = await scheduler.wait()
+                waited = time.perf_counter() - start
+                if trigger == "deadline":
+                    break
+        finally:
+            running = self._schedulers.get(ctx.session.id, {})
+            running.pop(ctx.invocation_id, None)
+            if not running:
+                self._schedulers.pop(ctx.session.id, None)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={"poll_metrics": [asdict(m) for m in metrics]}),
+        )
@@ -0,0 +1,416 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+try:
+    from google.adk.errors.already_exists_error import AlreadyExistsError
+except ImportError:  # ADK before 1.15
+
+    class AlreadyExistsError(ValueError):
+        """Raised when a session is created with an ID that is already in use."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+_Key = tuple[str, str, str]
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    A persistent ADK session service on a local SQLite database.
+
+    Sessions survive restarts and memory stays bounded:
+    - The database runs in WAL mode, so reads do not wait for writes.
+    - Appended events and state changes are buffered and written in one
+      transaction per batch, on a worker thread. A batch is written when it
+      reaches `batch_size` or `flush_interval` seconds after its first entry,
+      so a crash loses at most that window.
+    - Up to `max_cached_sessions` sessions are kept in memory in LRU order.
+      Sessions idle for `idle_timeout` seconds are paged out and read back from
+      disk on their next use.
+
+    Like InMemorySessionService, sessions are returned as copies and state
+    keys with the app: and user: prefixes are shared across sessions.
+
+    Args:
+        path: The database file.
+        batch_size: Buffered writes that trigger a flush.
+        flush_interval: Maximum time a write stays buffered, in seconds.
+        max_cached_sessions: Sessions kept in memory.
+        idle_timeout: Seconds after which an unused session is paged out.
+    """
+
+    def __init__(
+        self,
+        path: str = "sessions.db",
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        max_cached_sessions: int = 1000,
+        idle_timeout: float = 300.0,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_cached_sessions = max_cached_sessions
+        self.idle_timeout = idle_timeout
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss, not corruption.
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+
+        # Hot sessions with their full event list: key -> (session, last access).
+        self._cache: OrderedDict[_Key, tuple[Session, float]] = OrderedDict()
+        self._app_state: dict[str, dict[str, Any]] = {}
+        self._user_state: dict[tuple[str, str], dict[str, Any]] = {}
+        for app_name, state in self._db.execute("SELECT app_name, state FROM app_states"):
+            self._app_state[app_name] = json.loads(state)
+        for app_name, user_id, state in self._db.execute(
+            "SELECT app_name, user_id, state FROM user_states"
+        ):
+            self._user_state[(app_name, user_id)] = json.loads(state)
+
+        # Buffered writes. Session and shared state rows are coalesced per key.
+        self._pending_events: list[tuple] = []
+        self._pending_sessions: dict[_Key, tuple] = {}
+        self._pending_shared: set[tuple[str, ...]] = set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    # --- Write batching ---
+
+    def _pending_count(self) -> int:
+        return len(self._pending_events) + len(self._pending_sessions)
+
+    @contextmanager
+    def _transaction(self):
+        # The connection is in autocommit mode, so `with self._db` would not
+        # open a transaction; group the statements explicitly.
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                yield self._db
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _write(self, events: list[tuple], sessions: list[tuple], shared: list[tuple]) -> None:
+        with self._transaction() as db:
+            db.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)", sessions)
+            db.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                events,
+            )
+            for row in shared:
+                if len(row) == 2:
+                    db.execute("INSERT OR REPLACE INTO app_states VALUES (?, ?)", row)
+                else:
+                    db.execute("INSERT OR REPLACE INTO user_states VALUES (?, ?, ?)", row)
+
+    def _take_pending(self) -> tuple[list, list, list]:
+        events, self._pending_events = self._pending_events, []
+        sessions = list(self._pending_sessions.values())
+        self._pending_sessions = {}
+        shared = []
+        for key in self._pending_shared:
+            if len(key) == 1:
+                shared.append((key[0], json.dumps(self._app_state.get(key[0], {}))))
+            else:
+                shared.append((key[0], key[1], json.dumps(self._user_state.get(key, {}))))
+        self._pending_shared = set()
+        return events, sessions, shared
+
+    async def _flush_pending(self) -> None:
+        # Batches are taken and written under one lock, so they commit in order.
+        async with self._flush_lock:
+            while self._pending_count() or self._pending_shared:
+                await asyncio.to_thread(self._write, *self._take_pending())
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task and not self._flush_task.done():
+            return  # The running flush picks up everything buffered meanwhile.
+        if self._pending_count() >= self.batch_size:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._flush_task = asyncio.create_task(self._flush_pending())
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending())
+
+    async def flush(self) -> None:
+        """Writes every buffered change to disk."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task:
+            await self._flush_task
+        await self._flush_pending()
+
+    async def close(self) -> None:
+        await self.flush()
+        with self._db_lock:
+            self._db.close()
+
+    # --- Hot cache ---
+
+    def _touch(self, key: _Key, session: Session) -> None:
+        now = time.monotonic()
+        self._cache[key] = (session, now)
+        self._cache.move_to_end(key)
+        # Sessions are written through to the buffer, so paging out is just dropping them.
+        while len(self._cache) > self.max_cached_sessions:
+            self._cache.popitem(last=False)
+        while self._cache:
+            _, (_, last_access) = next(iter(self._cache.items()))
+            if now - last_access < self.idle_timeout:
+                break
+            self._cache.popitem(last=False)
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._db_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    async def _load(
+        self, key: _Key, config: Optional[GetSessionConfig] = None
+    ) -> Optional[Session]:
+        # Buffered writes of this session must be on disk before it is read back.
+        await self.flush()
+        rows = self._query(
+            "SELECT state, last_update_time FROM sessions "
+            "WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        )
+        if not rows:
+            return None
+        where = "app_name = ? AND user_id = ? AND session_id = ?"
+        params: tuple = key
+        if config and config.after_timestamp:
+            where += " AND timestamp >= ?"
+            params += (config.after_timestamp,)
+        if config and config.num_recent_events:
+            sql = (
+                f"SELECT data FROM (SELECT seq, data FROM events WHERE {where} "
+                "ORDER BY seq DESC LIMIT ?) ORDER BY seq"
+            )
+            params += (config.num_recent_events,)
+        else:
+            sql = f"SELECT data FROM events WHERE {where} ORDER BY seq"
+        events = [Event.model_validate_json(data) for (data,) in self._query(sql, params)]
+        state, last_update_time = rows[0]
+        return Session(
+            app_name=key[0],
+            user_id=key[1],
+            id=key[2],
+            state=json.loads(state),
+            events=events,
+            last_update_time=last_update_time,
+        )
+
+    async def _storage_session(self, key: _Key) -> Optional[Session]:
+        cached = self._cache.get(key)
+        if cached:
+            self._touch(key, cached[0])
+            return cached[0]
+        session = await self._load(key)
+        if session:
+            self._touch(key, session)
+        return session
+
+    def _merge_state(self, session: Session) -> Session:
+        for key, value in self._app_state.get(session.app_name, {}).items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in self._user_state.get((session.app_name, session.user_id), {}).items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    def _buffer_session(self, session: Session) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        self._pending_sessions[key] = (*key, json.dumps(session.state), session.last_update_time)
+
+    async def _exists(self, key: _Key) -> bool:
+        # Only wait for a write already in flight, whose sessions have left the
+        # buffer; forcing a flush per create would defeat the batching.
+        if self._flush_task and not self._flush_task.done():
+            await self._flush_task
+        if key in self._cache or key in self._pending_sessions:
+            return True
+        rows = self._query(
+            "SELECT 1 FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+        )
+        return bool(rows)
+
+    # --- BaseSessionService ---
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id and session_id.strip():
+            session_id = session_id.strip()
+            # Replacing the row would keep the old session's events, so a taken
+            # ID is refused, as ADK's own services do. Generated IDs need no check.
+            if await self._exists((app_name, user_id, session_id)):
+                raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+        else:
+            session_id = str(uuid.uuid4())
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        self._touch((app_name, user_id, session_id), session)
+        self._buffer_session(session)
+        self._schedule_flush()
+        return self._merge_state(copy.deepcopy(session))
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        cached = self._cache.get(key)
+        if cached is None and config and (config.num_recent_events or config.after_timestamp):
+            # A partial read is served from disk without filling the cache.
+            session = await self._load(key, config)
+            return self._merge_state(session) if session else None
+
+        session = await self._storage_session(key)
+        if session is None:
+            return None
+        events = session.events
+        if config and config.num_recent_events:
+            events = events[-config.num_recent_events :]
+        if config and config.after_timestamp:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+        # Copy only the events that are returned.
+        copied = session.model_copy(update={"events": copy.deepcopy(events)})
+        copied.state = copy.deepcopy(session.state)
+        return self._merge_state(copied)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        await self.flush()
+        rows = self._query(
+            "SELECT id, state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+        return ListSessionsResponse(
+            sessions=[
+                self._merge_state(
+                    Session(
+                        app_name=app_name,
+                        user_id=user_id,
+                        id=session_id,
+                        state=json.loads(state),
+                        last_update_time=last_update_time,
+                    )
+                )
+                for session_id, state, last_update_time in rows
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._cache.pop(key, None)
+        await self.flush()
+        with self._transaction() as db:
+            db.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key)
+            db.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Update the caller's copy, then the stored session.
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        storage = await self._storage_session(key)
+        if storage is None:
+            return event
+        if event.actions and event.actions.state_delta:
+            for name, value in event.actions.state_delta.items():
+                if name.startswith(State.APP_PREFIX):
+                    self._app_state.setdefault(session.app_name, {})[
+                        name.removeprefix(State.APP_PREFIX)
+                    ] = value
+                    self._pending_shared.add((session.app_name,))
+                elif name.startswith(State.USER_PREFIX):
+                    self._user_state.setdefault((session.app_name, session.user_id), {})[
+                        name.removeprefix(State.USER_PREFIX)
+                    ] = value
+                    self._pending_shared.add((session.app_name, session.user_id))
+        await super().append_event(session=storage, event=event)
+        storage.last_update_time = event.timestamp
+
+        self._pending_events.append((*key, event.timestamp, event.model_dump_json(exclude_none=True)))
+        self._buffer_session(storage)
+        self._schedule_flush()
+        # Keep the buffer bounded if the disk cannot keep up.
+        if self._pending_count() >= 4 * self.batch_size and self._flush_task:
+            await self._flush_task
+        return event
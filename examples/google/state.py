@@ -0,0 +1,193 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Mapping, Optional
+
+from google.adk.agents import SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event
+from pydantic import PrivateAttr
+
+from examples.google.artifacts import LocalArtifactStore, get_artifact_store, is_artifact
+
+_TEXT = "text/plain; charset=utf-8"
+_JSON = "application/json"
+
+
+@dataclass
+class CompactionStats:
+    """
+    What a CompactSequentialAgent kept out of session state.
+
+    Attributes:
+        spilled: Values replaced by a reference.
+        bytes_spilled: Encoded size of the spilled values.
+        unchanged: Delta entries dropped because the state already held the value.
+    """
+
+    spilled: int = 0
+    bytes_spilled: int = 0
+    unchanged: int = 0
+
+
+def _encode(value: Any) -> tuple[bytes, str]:
+    if isinstance(value, str):
+        return value.encode("utf-8"), _TEXT
+    return json.dumps(value).encode("utf-8"), _JSON
+
+
+async def compact_delta(
+    delta: dict[str, Any],
+    state: Mapping[str, Any],
+    limit_for: Callable[[str], Optional[int]],
+    store: LocalArtifactStore,
+    stats: Optional[CompactionStats] = None,
+) -> None:
+    """
+    Rewrites a state delta in place so that session state stays small.
+
+    Values larger than their key's limit are written to `store` and replaced
+    by a reference (an artifact handle plus a short preview). Entries that
+    would not change the state are dropped, so an agent re-emitting the same
+    value does not grow the event log.
+
+    Args:
+        delta: The `state_delta` of an event, before the runner appends it.
+        state: The current session state.
+        limit_for: Returns the size limit in bytes of a key, or None for no limit.
+        store: Where spilled values go.
+        stats: Counters to update.
+    """
+    stats = stats or CompactionStats()
+    for key, value in list(delta.items()):
+        limit = limit_for(key)
+        if limit is not None and value is not None and not is_artifact(value):
+            data, mime_type = _encode(value)
+            if len(data) > limit:
+                handle = await asyncio.to_thread(store.put, data, mime_type)
+                preview = data[:80].decode("utf-8", errors="ignore")
+                value = delta[key] = {**handle.to_dict(), "preview": preview}
+                stats.spilled += 1
+                stats.bytes_spilled += len(data)
+        if key in state and state[key] == value:
+            del delta[key]
+            stats.unchanged += 1
+
+
+class CompactSequentialAgent(SequentialAgent):
+    """
+    A SequentialAgent whose sub-agents' outputs are kept out of session state.
+
+    Every state delta of the sub-agents passes through `compact_delta` before
+    the runner applies it: large values (e.g. whole model outputs saved with
+    `output_key`) are spilled to the artifact store and only a reference stays
+    in state, so per-session memory and the cost of copying and serializing
+    state stay bounded however long the pipeline runs. Read values back with
+    `load_state_value`, or with a `state_instruction` that loads them lazily.
+
+    Attributes:
+        max_value_size: Default size limit of a state value in bytes.
+        limits: Per-key limits overriding the default; None disables spilling.
+        store: The blob store; the process-wide artifact store by default.
+    """
+
+    max_value_size: Optional[int] = 1024
+    limits: dict[str, Optional[int]] = {}
+    store: Optional[LocalArtifactStore] = None
+
+    _stats: CompactionStats = PrivateAttr(default_factory=CompactionStats)
+
+    @property
+    def stats(self) -> CompactionStats:
+        return self._stats
+
+    def limit_for(self, key: str) -> Optional[int]:
+        # temp: keys never reach the session, so there is nothing to compact.
+        if key.startswith("temp:"):
+            return None
+        return self.limits.get(key, self.max_value_size)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        store = self.store or get_artifact_store()
+        async for event in super()._run_async_impl(ctx):
+            if event.actions.state_delta:
+                await compact_delta(
+                    event.actions.state_delta, ctx.session.state, self.limit_for, store, self._stats
+                )
+            yield event
+
+
+# --- Reading ---
+
+# Recently loaded values by URI. Content addressing means an entry never goes stale.
+_loaded: OrderedDict[str, Any] = OrderedDict()
+_LOADED_MAX = 64
+
+
+def load_state_value(
+    state: Mapping[str, Any],
+    key: str,
+    default: Any = None,
+    store: Optional[LocalArtifactStore] = None,
+) -> Any:
+    """
+    Returns a state value, loading it from the blob store if it was spilled.
+
+    Args:
+        state: Session state, e.g. `session.state` or `ReadonlyContext.state`.
+        key: The state key.
+        default: Returned if the key is missing.
+        store: The blob store; the process-wide artifact store by default.
+    """
+    value = state.get(key, default)
+    if not is_artifact(value):
+        return value
+    uri = value["uri"]
+    if uri in _loaded:
+        _loaded.move_to_end(uri)
+        return _loaded[uri]
+    data = (store or get_artifact_store()).open(value)
+    loaded = str(data, "utf-8") if value.get("mime_type") == _TEXT else json.loads(data)
+    _loaded[uri] = loaded
+    if len(_loaded) > _LOADED_MAX:
+        _loaded.popitem(last=False)
+    return loaded
+
+
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][\w:]*)\}")
+
+
+def state_instruction(template: str, store: Optional[LocalArtifactStore] = None):
+    """
+    Returns an instruction provider that fills `{key}` placeholders from state.
+
+    Unlike ADK's built-in templating it resolves spilled values, and only
+    loads the keys the template mentions. Placeholders whose key is not in
+    state are left as they are.
+
+    Args:
+        template: The instruction, with `{key}` placeholders.
+        store: The blob store; the process-wide artifact store by default.
+    """
+
+    def provider(context: ReadonlyContext) -> str:
+        state = context.state
+
+        def fill(match: re.Match) -> str:
+            key = match.group(1)
+            if key not in state:
+                return match.group(0)
+            value = load_state_value(state, key, store=store)
+            return value if isinstance(value, str) else json.dumps(value)
+
+        return _PLACEHOLDER.sub(fill, template)
+
+    return provider
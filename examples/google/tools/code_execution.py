@@ -6,17 +6,17 @@
 # See the LICENSE file in the repository for the full license text.
 
 from google.adk.agents import LlmAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.code_executors import BuiltInCodeExecutor
 from google.genai import types
 
+from examples.google.events import consume_events
+from examples.google.runners import registry
+
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
 # Define variables required for Session setup and Agent execution
 APP_NAME = "calculator"
 USER_ID = "user1234"
-SESSION_ID = "session_code_exec_async"
 
 # Agent Definition
 code_agent = LlmAgent(
@@ -33,54 +33,22 @@ code_agent = LlmAgent(
 
 # Agent Interaction (Async)
 async def call_agent(query):
-
-    # Session and Runner
-    session_service = InMemorySessionService()
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
-    runner = Runner(
-        agent=code_agent, app_name=APP_NAME, session_service=session_service
-    )
-
     content = types.Content(role="user", parts=[types.Part(text=query)])
     print(f"\n--- Running Query: {query} ---")
-    final_response_text = "No final text response captured."
     try:
-        # Use run_async
-        async for event in runner.run_async(
-            user_id=USER_ID, session_id=SESSION_ID, new_message=content
-        ):
-            print(f"Event ID: {event.id}, Author: {event.author}")
-
-            # --- Check for specific parts FIRST ---
-            has_specific_part = False
-            if event.content and event.content.parts and event.is_final_response():
-                for part in event.content.parts:  # Iterate through all parts
-                    if part.executable_code:
-                        # Access the actual code string via .code
-                        print(
-                            f" Debug: Agent generated code:\n```python`n{part.executable_code.code}\n```"
-                        )
-                        has_specific_part = True
-                    elif part.code_execution_result:
-                        # Access outcome and output correctly
-                        print(
-                            f" Debug: Code Execution Result: {part.code_execution_result.outcome} - Output:\n{part.code_execution_result.output}"
-                        )
-                        has_specific_part = True
-                    # Also print any text parts found in any event for debugging
-                    elif part.text and not part.text.isspace():
-                        print(f" Text: '{part.text.strip()}'")
-                        # Do not set has_specific_part=True here, as we want the final response logic below
-
-                # --- Check for final response AFTER specific parts ---
-                if not has_specific_part:
-                    text_parts = [
-                        part.text for part in event.content.parts if part.text
-                    ]
-                    final_response_text = "".join(text_parts)
-                    print(f"==> Final Agent response: {final_response_text}")
+        # The runner is built once per process; each query gets its own session.
+        async with registry.session(code_agent, APP_NAME, USER_ID) as session:
+            summary = await consume_events(
+                session.run_async(content),
+                on_event=lambda event, _: print(f"Event ID: {event.id}, Author: {event.author}"),
+            )
+        for code in summary.code:
+            print(f" Debug: Agent generated code:\n```python\n{code}\n```")
+        for result in summary.execution_results:
+            print(f" Debug: Code Execution Result: {result.outcome} - Output:\n{result.output}")
+        final_response_text = summary.final_text or "No final text response captured."
+        print(f"==> Final Agent response: {final_response_text}")
+        print(f" Timing: {summary.timing()}")
 
     except Exception as e:
         print(f"ERROR during agent run: {e}")
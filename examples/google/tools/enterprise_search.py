@@ -8,10 +8,11 @@
 import os
 from google.adk.agents import Agent
 from google.adk.tools import VertexAiSearchTool
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from examples.google.events import consume_events
+from examples.google.runners import registry
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,7 +20,6 @@ load_dotenv()
 # Define variables required for Session setup and Agent execution
 APP_NAME = "vsearch_agent"
 USER_ID = "user1234"
-SESSION_ID = "session_code_exec_async"
 
 # Configuration
 GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
@@ -38,30 +38,20 @@ code_agent = Agent(
 
 # --- Agent Invocation Logic ---
 async def call_agent(query: str):
-    # Session and Runner
-    session_service = InMemorySessionService()
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
-    runner = Runner(
-        agent=code_agent, app_name=APP_NAME, session_service=session_service
-    )
-
     try:
         # Create message content
         content = types.Content(role="user", parts=[types.Part(text=query)])
         # Process events as they arrive
-        async for event in runner.run_async(
-            user_id=USER_ID, session_id=SESSION_ID, new_message=content
-        ):
-            if event.is_final_response():
-                print(event.content.parts[0].text)
+        # The runner is built once per process; each query gets its own session.
+        async with registry.session(code_agent, APP_NAME, USER_ID) as session:
+            summary = await consume_events(session.run_async(content))
+        print(summary.final_text)
 
-                # Optional: Show source count
-                if event.grounding_metadata:
-                    print(
-                        f"\nBased on {len(event.grounding_metadata.grounding_chunks)} documents"
-                    )
+        # Optional: Show source count
+        if summary.grounding_metadata and summary.grounding_metadata.grounding_chunks:
+            print(
+                f"\nBased on {len(summary.grounding_metadata.grounding_chunks)} documents"
+            )
     except Exception as e:
         print(f"\nAn error occurred: {e}")
         print(
@@ -6,16 +6,16 @@
 # See the LICENSE file in the repository for the full license text.
 
 from google.adk.agents import Agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.tools import google_search
 from google.genai import types
 
+from examples.google.events import consume_events
+from examples.google.runners import registry
+
 GEMINI_MODEL = "gemini-2.0-flash-exp"
 
 APP_NAME = "Google Search_agent"
 USER_ID = "user1234"
-SESSION_ID = "1234"
 
 # Define Agent with access to search tool
 root_agent = Agent(
@@ -35,22 +35,12 @@ async def call_agent(query):
     Helper function to call the agent with a query.
     """
 
-    # Session and Runner
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
-    runner = Runner(
-        agent=root_agent, app_name=APP_NAME, session_service=session_service
-    )
-
     content = types.Content(role="user", parts=[types.Part(text=query)])
-    events = runner.run(user_id=USER_ID, session_id=SESSION_ID, new_message=content)
-
-    for event in events:
-        if event.is_final_response():
-            final_response = event.content.parts[0].text
-            print("Agent Response: ", final_response)
+    # run_async keeps the event loop free during the model and search round-trip;
+    # the synchronous runner.run would block every other coroutine until it returns.
+    async with registry.session(root_agent, APP_NAME, USER_ID) as session:
+        summary = await consume_events(session.run_async(content))
+    print("Agent Response: ", summary.final_text)
 
 
 # Example usage in main.py
@@ -0,0 +1,157 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+# Message fields that change between otherwise identical runs and must not
+# affect the cache key.
+_VOLATILE_FIELDS = {"id", "response_metadata", "usage_metadata"}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_FIELDS
+        }
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Returns a content address for a model call.
+
+    LangChain passes the serialized message list as `prompt` and the model name
+    plus its parameters as `llm_string`. Run-specific fields such as message IDs
+    are dropped so that identical conversations hash to the same key.
+    """
+    try:
+        prompt = json.dumps(_normalize(json.loads(prompt)), sort_keys=True)
+    except ValueError:
+        prompt = prompt.strip()
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class TieredLLMCache(BaseCache):
+    """
+    A two-tier LangChain cache: an in-memory LRU in front of a persistent disk cache.
+
+    Pass an instance as `cache=` to a chat model (see `retrieve_langchain_llm` in
+    main.py). Only deterministic (temperature=0) models should be cached.
+
+    Args:
+        directory: Directory of the on-disk tier. If None, only memory is used.
+        max_memory_entries: Number of responses kept in the in-memory LRU.
+        disk_size_limit: Maximum size of the on-disk tier in bytes. The least
+            recently used entries are evicted past this size.
+        ttl: Time to live of an entry in seconds, or None to never expire.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = ".llm_cache",
+        max_memory_entries: int = 1024,
+        disk_size_limit: int = 2**30,
+        ttl: Optional[float] = None,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[Optional[float], RETURN_VAL_TYPE]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._disk = None
+        if directory:
+            import diskcache
+
+            self._disk = diskcache.Cache(
+                directory,
+                size_limit=disk_size_limit,
+                eviction_policy="least-recently-used",
+            )
+
+    def _remember(self, key: str, value: RETURN_VAL_TYPE, expires_at: Optional[float]):
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+
+        # --- Tier 1: in-memory LRU ---
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+        # --- Tier 2: disk ---
+        if self._disk is not None:
+            payload, expires_at = self._disk.get(key, expire_time=True)
+            if payload is not None:
+                value = [loads(generation) for generation in payload]
+                self._remember(key, value, expires_at)
+                with self._lock:
+                    self.stats.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._remember(key, return_val, expires_at)
+        if self._disk is not None:
+            self._disk.set(
+                key, [dumps(generation) for generation in return_val], expire=self.ttl
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.stats = CacheStats()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
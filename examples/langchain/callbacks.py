@@ -0,0 +1,33 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManager, CallbackManager
+from langchain_core.callbacks.manager import AsyncRunManager
+
+
+def child_config(run_manager: Optional[Any], tag: str) -> dict[str, Any]:
+    """
+    Returns the config for a model call made on behalf of a wrapping model's run.
+
+    Chain run managers offer `get_child()`, but the run manager a chat model
+    receives does not; this builds the same child callback manager, so the
+    inner call is nested under the outer run and keeps the caller's handlers
+    (e.g. tracing), tags and metadata.
+
+    Args:
+        run_manager: The run manager passed to `_generate`/`_agenerate`, if any.
+        tag: Tag of the inner call only, e.g. "hedge:backup".
+    """
+    if run_manager is None:
+        return {"tags": [tag]}
+    manager_type = AsyncCallbackManager if isinstance(run_manager, AsyncRunManager) else CallbackManager
+    manager = manager_type(handlers=[], parent_run_id=run_manager.run_id)
+    manager.set_handlers(run_manager.inheritable_handlers)
+    manager.add_tags(run_manager.inheritable_tags)
+    manager.add_metadata(run_manager.inheritable_metadata)
+    manager.add_tags([tag], inherit=False)
+    return {"callbacks": manager}
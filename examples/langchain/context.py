@@ -0,0 +1,175 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+logger = logging.getLogger(__name__)
+
+# When set, counts tokens instead of tiktoken; see set_estimator.
+_estimator: Optional[Callable[[str], int]] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates tokens at four characters per token, without a tokenizer."""
+    return (len(text) + 3) // 4
+
+
+def set_estimator(
+    estimator: Optional[Callable[[str], int]] = estimate_tokens,
+) -> Optional[Callable[[str], int]]:
+    """
+    Counts tokens with `estimator` instead of tiktoken; None restores tiktoken.
+
+    tiktoken downloads an encoding on first use. Code that must stay offline,
+    such as the benchmarks, sets an estimator so it never touches the network.
+
+    Returns:
+        The previous estimator, to restore it afterwards.
+    """
+    global _estimator
+    previous, _estimator = _estimator, estimator
+    return previous
+
+
+@lru_cache(maxsize=None)
+def _encoding(name: str):
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        # tiktoken downloads its encodings on first use, which fails offline.
+        logger.warning(f"tiktoken unavailable ({e}); estimating tokens from length.")
+        return None
+
+
+def count_tokens(text: str, encoding: str = "cl100k_base") -> int:
+    """
+    Counts tokens with the estimator if one is set, else with tiktoken.
+
+    Falls back to `estimate_tokens` if tiktoken cannot load the encoding.
+    """
+    if _estimator is not None:
+        return _estimator(text)
+    tokenizer = _encoding(encoding)
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, encoding: str = "cl100k_base") -> str:
+    """Keeps the first `max_tokens` tokens of `text`."""
+    if max_tokens <= 0:
+        return ""
+    if _estimator is not None:
+        tokens = _estimator(text)
+        # Without token boundaries, cut in proportion to the estimate.
+        return text if tokens <= max_tokens else text[: len(text) * max_tokens // tokens]
+    tokenizer = _encoding(encoding)
+    if tokenizer is None:
+        return text[: max_tokens * 4]
+    tokens = tokenizer.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else tokenizer.decode(tokens[:max_tokens])
+
+
+class ReflectionContext:
+    """
+    Bounded conversation context for a generate/critique loop.
+
+    Instead of resending the full history, each prompt holds only the task, the
+    latest code and the latest critique, plus an optional rolling summary of
+    older critiques. The prompt is kept under `max_tokens` by dropping the
+    summary first and then truncating the critique.
+
+    Args:
+        task: The original task prompt, always sent in full.
+        max_tokens: Token budget for each generate/refine prompt.
+        summarize: Keep a one-line summary of every older critique.
+        summary_tokens: Token budget of the rolling summary.
+        encoding: The tiktoken encoding used to count tokens.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        max_tokens: int = 4000,
+        summarize: bool = False,
+        summary_tokens: int = 200,
+        encoding: str = "cl100k_base",
+    ):
+        self.task = task
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.summary_tokens = summary_tokens
+        self.encoding = encoding
+        self.code: Optional[str] = None
+        self.critique: Optional[str] = None
+        self.summaries: list[str] = []
+        # Prompt tokens sent on each call to messages(), in order.
+        self.prompt_tokens: list[int] = []
+
+    def update(self, code: str, critique: Optional[str] = None) -> None:
+        """Replaces the latest code and critique, summarizing the old critique."""
+        if self.summarize and self.critique:
+            first_line = next(
+                (line.strip(" -*") for line in self.critique.splitlines() if line.strip()),
+                "",
+            )
+            self.summaries.append(
+                f"Round {len(self.summaries) + 1}: {truncate_tokens(first_line, 40, self.encoding)}"
+            )
+        self.code = code
+        self.critique = critique
+
+    def _summary(self) -> str:
+        # Keep the most recent rounds that fit in the summary budget.
+        kept, used = [], 0
+        for line in reversed(self.summaries):
+            tokens = count_tokens(line, self.encoding)
+            if used + tokens > self.summary_tokens:
+                break
+            kept.insert(0, line)
+            used += tokens
+        return "Summary of earlier critiques:\n" + "\n".join(kept) if kept else ""
+
+    def messages(self, instruction: Optional[str] = None) -> list[BaseMessage]:
+        """
+        Builds the next prompt within the token budget and records its size.
+
+        Args:
+            instruction: Optional final instruction, e.g. a request to refine.
+        """
+        fixed = [HumanMessage(content=self.task)]
+        if self.code is not None:
+            fixed.append(AIMessage(content=self.code))
+        tail = [HumanMessage(content=instruction)] if instruction else []
+        used = sum(count_tokens(str(m.content), self.encoding) for m in fixed + tail)
+
+        # The latest critique takes priority over the summary of older ones.
+        critique_messages = []
+        if self.critique:
+            critique = f"Critique of the previous code:\n{self.critique}"
+            critique = truncate_tokens(critique, self.max_tokens - used, self.encoding)
+            if critique:
+                critique_messages.append(HumanMessage(content=critique))
+                used += count_tokens(critique, self.encoding)
+        summary_messages = []
+        summary = self._summary() if self.summarize else ""
+        if summary:
+            summary_tokens = count_tokens(summary, self.encoding)
+            if used + summary_tokens <= self.max_tokens:
+                summary_messages.append(HumanMessage(content=summary))
+                used += summary_tokens
+        if used > self.max_tokens:
+            logger.warning(
+                f"Task and code alone use {used} tokens, over the budget of {self.max_tokens}."
+            )
+
+        self.prompt_tokens.append(used)
+        return fixed + summary_messages + critique_messages + tail
@@ -0,0 +1,247 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Iterable, Optional, Union
+from uuid import UUID
+
+from langchain_classic.agents import AgentExecutor
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from examples.langchain.context import count_tokens
+from examples.stats import LatencySummary
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket refilled continuously at `per_minute` tokens per minute.
+
+    Waiters are served in arrival order, so a large request is not starved by
+    a stream of small ones.
+
+    Args:
+        per_minute: Refill rate, e.g. a provider's requests or tokens per minute.
+        capacity: Maximum burst; defaults to one minute's worth.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Waits until `amount` tokens are available and takes them. Returns the wait."""
+        amount = min(amount, self.capacity)
+        start = time.perf_counter()
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+        return time.perf_counter() - start
+
+    def adjust(self, amount: float) -> None:
+        """Returns (or, if negative, charges) tokens after the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimitCallback(AsyncCallbackHandler):
+    """
+    Holds every chat model call of one agent run until the buckets allow it.
+
+    An agent run makes several model calls (one per tool step), so the limits
+    are applied per call rather than per run. Token cost is estimated from the
+    prompt plus `completion_tokens` and corrected from the reported usage.
+    """
+
+    def __init__(
+        self,
+        requests: Optional[TokenBucket],
+        tokens: Optional[TokenBucket],
+        completion_tokens: int,
+    ):
+        self.requests = requests
+        self.tokens = tokens
+        self.completion_tokens = completion_tokens
+        self.wait = 0.0
+        self.calls = 0
+        self._estimates: dict[UUID, int] = {}
+        self._prompts: dict[UUID, int] = {}
+
+    async def on_chat_model_start(
+        self, serialized: dict[str, Any], messages, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self.calls += 1
+        if self.requests:
+            self.wait += await self.requests.acquire(1)
+        if self.tokens:
+            prompt = sum(count_tokens(str(m.content)) for batch in messages for m in batch)
+            self._prompts[run_id] = prompt
+            self._estimates[run_id] = prompt + self.completion_tokens
+            self.wait += await self.tokens.acquire(self._estimates[run_id])
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        if not self.tokens or run_id not in self._estimates:
+            return
+        estimate = self._estimates.pop(run_id)
+        prompt = self._prompts.pop(run_id)
+        actual = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    actual += usage["total_tokens"]
+                else:
+                    actual += prompt + count_tokens(generation.text)
+        self.tokens.adjust(estimate - actual)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # A failed call still counts against the request quota, but not the token quota.
+        if self.tokens and run_id in self._estimates:
+            self.tokens.adjust(self._estimates.pop(run_id))
+            self._prompts.pop(run_id, None)
+
+
+@dataclass
+class DriverResult:
+    query: str
+    output: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class DriverStats:
+    """
+    Per-query timings of a driver run, in seconds.
+
+    Queue wait is the time from submission until a worker picks the query up.
+    Rate-limit wait is the time model calls were held by the buckets. Execution
+    is the agent run itself and includes the rate-limit wait.
+    """
+
+    queue_wait: list[float] = field(default_factory=list)
+    rate_limit_wait: list[float] = field(default_factory=list)
+    execution: list[float] = field(default_factory=list)
+    model_calls: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def report(self) -> None:
+        completed = len(self.execution)
+        print("\n--- Driver Stats ---")
+        print(
+            f"{completed} queries ({self.errors} errors), {self.model_calls} model calls "
+            f"in {self.elapsed:.2f}s ({completed / self.elapsed if self.elapsed else 0.0:.2f} queries/s)"
+        )
+        print(f"Queue wait:      {LatencySummary.from_samples(self.queue_wait).format()}")
+        print(f"Rate-limit wait: {LatencySummary.from_samples(self.rate_limit_wait).format()}")
+        print(f"Execution:       {LatencySummary.from_samples(self.execution).format()}")
+
+
+class AgentDriver:
+    """
+    Runs many queries through an AgentExecutor within a provider's quota.
+
+    Queries go through a bounded queue to `concurrency` workers, so a producer
+    is slowed down rather than piling up unbounded tasks. Each model call made
+    by an agent run waits for the requests-per-minute and tokens-per-minute
+    buckets.
+
+    Args:
+        agent_executor: The agent to run.
+        concurrency: Maximum number of agent runs in flight.
+        requests_per_minute: Model call quota, or None for no limit.
+        tokens_per_minute: Token quota, or None for no limit.
+        queue_size: Capacity of the input queue; defaults to twice `concurrency`.
+        completion_tokens: Expected completion size used to estimate token cost.
+    """
+
+    def __init__(
+        self,
+        agent_executor: AgentExecutor,
+        concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        completion_tokens: int = 512,
+    ):
+        self.agent_executor = agent_executor
+        self.concurrency = concurrency
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.queue_size = queue_size or 2 * concurrency
+        self.completion_tokens = completion_tokens
+
+    async def _worker(self, queue: asyncio.Queue, results: dict, stats: DriverStats):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, query, submitted = item
+            started = time.perf_counter()
+            stats.queue_wait.append(started - submitted)
+            callback = RateLimitCallback(self.requests, self.tokens, self.completion_tokens)
+            result = DriverResult(query=query)
+            try:
+                response = await self.agent_executor.ainvoke(
+                    {"input": query}, config={"callbacks": [callback]}
+                )
+                result.output = response["output"]
+            except Exception as e:
+                result.error = e
+                stats.errors += 1
+            stats.execution.append(time.perf_counter() - started)
+            stats.rate_limit_wait.append(callback.wait)
+            stats.model_calls += callback.calls
+            results[index] = result
+
+    async def run(
+        self, queries: Union[Iterable[str], AsyncIterable[str]]
+    ) -> tuple[list[DriverResult], DriverStats]:
+        """
+        Runs every query and returns the results in input order with timing stats.
+
+        Args:
+            queries: The queries; an async iterable is consumed only as fast as
+                the workers keep up.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        results: dict[int, DriverResult] = {}
+        stats = DriverStats()
+        start = time.perf_counter()
+        workers = [
+            asyncio.create_task(self._worker(queue, results, stats))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            index = 0
+            if isinstance(queries, AsyncIterable):
+                async for query in queries:
+                    await queue.put((index, query, time.perf_counter()))
+                    index += 1
+            else:
+                for query in queries:
+                    await queue.put((index, query, time.perf_counter()))
+                    index += 1
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        stats.elapsed = time.perf_counter() - start
+        return [results[i] for i in range(len(results))], stats
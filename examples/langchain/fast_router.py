@@ -0,0 +1,302 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import logging
+import math
+import random
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from examples.langchain.knowledge_base import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# --- Keyword Rules ---
+# A request matching the rules of exactly one label is routed without scoring,
+# with the router's `rule_confidence`.
+KEYWORD_RULES = {
+    "booker": [
+        r"\bbook(ing|ed)?\b",
+        r"\breserv(e|ation|ations)\b",
+        r"\bflights?\b",
+        r"\bhotels?\b",
+        r"\btickets?\b",
+    ],
+    "info": [
+        r"^(what|who|when|where|why|how|which)\b",
+        r"\btell me (about|a|something)\b",
+        r"\bexplain\b",
+    ],
+}
+
+# --- Seed Examples ---
+# Training data for the TF-IDF classifier. Extend it with logged requests.
+SEED_EXAMPLES = {
+    "booker": [
+        "Book me a flight to London.",
+        "Reserve a hotel room in Paris for two nights.",
+        "I need a plane ticket to Tokyo next month.",
+        "Find flights from Berlin to New York.",
+        "Can you book a hotel near the airport?",
+        "Get me a seat on the morning flight to Rome.",
+        "Make a reservation at a hotel in Madrid.",
+        "Find a cheap flight and hotel package to Lisbon.",
+    ],
+    "info": [
+        "What is the capital of France?",
+        "What is the highest mountain in the world?",
+        "Tell me a random fact.",
+        "Who wrote Pride and Prejudice?",
+        "How does photosynthesis work?",
+        "Explain how vaccines work.",
+        "When did the Second World War end?",
+        "What is the population of Earth?",
+    ],
+}
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def _features(text: str) -> list[str]:
+    # Without stopwords, a request that shares only "a", "to" or "me" with the
+    # examples has no features at all.
+    tokens = [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class TfidfClassifier:
+    """
+    A nearest-centroid classifier over TF-IDF vectors (unigrams and bigrams).
+
+    Scoring a request is a single matrix-vector product, so it runs in
+    microseconds rather than an LLM round-trip. There is no "unclear" class:
+    a request too far from every centroid, or about as close to two of them,
+    gets no label, so the caller can ask the LLM.
+
+    Args:
+        examples: Training texts per label.
+        min_similarity: Cosine similarity to the best centroid needed for a label.
+        min_margin: Lead of the best similarity over the second best needed for a label.
+    """
+
+    def __init__(
+        self,
+        examples: dict[str, list[str]],
+        min_similarity: float = 0.15,
+        min_margin: float = 0.1,
+    ):
+        self.labels = list(examples)
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        documents = [(label, _features(text)) for label in self.labels for text in examples[label]]
+
+        self.vocabulary: dict[str, int] = {}
+        for _, features in documents:
+            for feature in features:
+                self.vocabulary.setdefault(feature, len(self.vocabulary))
+
+        counts = np.zeros((len(documents), len(self.vocabulary)))
+        for row, (_, features) in enumerate(documents):
+            for feature in features:
+                counts[row, self.vocabulary[feature]] += 1
+        document_frequency = (counts > 0).sum(axis=0)
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+
+        vectors = self._normalize(counts * self.idf)
+        doc_labels = np.array([label for label, _ in documents])
+        self.centroids = self._normalize(
+            np.stack([vectors[doc_labels == label].mean(axis=0) for label in self.labels])
+        )
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def vectorize(self, text: str) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary))
+        for feature in _features(text):
+            index = self.vocabulary.get(feature)
+            if index is not None:
+                vector[index] += 1
+        return self._normalize(vector * self.idf)
+
+    def predict(self, text: str) -> tuple[Optional[str], float]:
+        """
+        Returns the most similar label and its cosine similarity, between 0 and 1.
+
+        Returns (None, 0.0) if the text is not similar enough to any label, or
+        not clearly more similar to one label than to the others.
+        """
+        vector = self.vectorize(text)
+        if not vector.any():
+            return None, 0.0
+        similarities = self.centroids @ vector
+        order = np.argsort(-similarities)
+        best = float(similarities[order[0]])
+        runner_up = float(similarities[order[1]]) if len(order) > 1 else 0.0
+        if best < self.min_similarity or best - runner_up < self.min_margin:
+            return None, 0.0
+        return self.labels[int(order[0])], best
+
+
+@dataclass
+class RouterStats:
+    requests: int = 0
+    fast_path: int = 0
+    llm_fallback: int = 0
+    shadow_checks: int = 0
+    shadow_agreements: int = 0
+
+    @property
+    def fast_path_rate(self) -> float:
+        return self.fast_path / self.requests if self.requests else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        """Agreement of fast-path decisions with the LLM on shadow-checked requests."""
+        return self.shadow_agreements / self.shadow_checks if self.shadow_checks else math.nan
+
+
+class FastRouter:
+    """
+    Local pre-router that decides 'booker' or 'info' without calling the LLM.
+
+    Requests are first matched against KEYWORD_RULES and then scored by the
+    TF-IDF classifier, whose confidence is the cosine similarity to the chosen
+    label's examples. Requests without a label, or with a confidence below
+    `threshold`, fall back to the LLM router. Rule hits get `rule_confidence`
+    rather than certainty, so they are subject to the threshold, shadow checks
+    and `sweep` like any other decision.
+
+    Args:
+        threshold: Minimum confidence for taking the fast path.
+        rule_confidence: Confidence of a keyword rule hit; set it below
+            `threshold` to send rule hits to the LLM.
+        shadow_rate: Fraction of fast-path decisions that are also sent to the LLM
+            to measure accuracy. Shadow checks cost a round-trip each.
+        examples: Training examples per label for the TF-IDF classifier.
+        history: Number of (confidence, local label, LLM label) observations kept
+            for threshold tuning.
+        seed: Seed for shadow sampling.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.25,
+        rule_confidence: float = 0.9,
+        shadow_rate: float = 0.1,
+        examples: Optional[dict[str, list[str]]] = None,
+        history: int = 1000,
+        seed: int = 0,
+    ):
+        self.threshold = threshold
+        self.rule_confidence = rule_confidence
+        self.shadow_rate = shadow_rate
+        self.classifier = TfidfClassifier(examples or SEED_EXAMPLES)
+        self.rules = {
+            label: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for label, patterns in KEYWORD_RULES.items()
+        }
+        self.stats = RouterStats()
+        self.observations: deque[tuple[float, Optional[str], str]] = deque(maxlen=history)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def classify(self, request: str) -> tuple[Optional[str], float]:
+        """Returns the local routing decision and its confidence."""
+        matched = [
+            label
+            for label, patterns in self.rules.items()
+            if any(pattern.search(request) for pattern in patterns)
+        ]
+        if len(matched) == 1:
+            return matched[0], self.rule_confidence
+        return self.classifier.predict(request)
+
+    def route(self, request: str, llm_route) -> str:
+        """
+        Routes a request, calling `llm_route(request)` only when needed.
+
+        Args:
+            request: The user's request.
+            llm_route: Callable returning the LLM router's decision.
+        """
+        label, confidence = self.classify(request)
+        fast = label is not None and confidence >= self.threshold
+        with self._lock:
+            self.stats.requests += 1
+            if fast:
+                self.stats.fast_path += 1
+                shadow = self._rng.random() < self.shadow_rate
+            else:
+                self.stats.llm_fallback += 1
+                shadow = False
+
+        if fast and not shadow:
+            logger.info(
+                f"Fast path: '{request}' -> {label} (confidence {confidence:.2f})"
+            )
+            return label
+
+        decision = llm_route(request).strip()
+        with self._lock:
+            self.observations.append((confidence, label, decision))
+            if shadow:
+                self.stats.shadow_checks += 1
+                self.stats.shadow_agreements += decision == label
+        if fast:
+            logger.info(
+                f"Fast path (shadow-checked): '{request}' -> {label}, LLM said {decision}"
+            )
+            return label
+        logger.info(
+            f"LLM fallback: '{request}' -> {decision} "
+            f"(local {label}, confidence {confidence:.2f})"
+        )
+        return decision
+
+    def sweep(self, thresholds: list[float]) -> list[tuple[float, float, float]]:
+        """
+        Estimates coverage and accuracy for candidate thresholds.
+
+        Uses every request for which both the local and the LLM decision are
+        known (fallbacks and shadow checks).
+
+        Returns:
+            (threshold, coverage, accuracy) tuples.
+        """
+        with self._lock:
+            observations = list(self.observations)
+        results = []
+        for threshold in thresholds:
+            covered = [
+                (label, decision)
+                for confidence, label, decision in observations
+                if label is not None and confidence >= threshold
+            ]
+            coverage = len(covered) / len(observations) if observations else 0.0
+            correct = sum(label == decision for label, decision in covered)
+            accuracy = correct / len(covered) if covered else math.nan
+            results.append((threshold, coverage, accuracy))
+        return results
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        accuracy = (
+            f"accuracy {stats.accuracy:.0%} over {stats.shadow_checks} shadow checks"
+            if stats.shadow_checks
+            else "no shadow checks yet"
+        )
+        logger.info(
+            f"Router stats: {stats.requests} requests, "
+            f"{stats.fast_path_rate:.0%} fast path, {stats.llm_fallback} LLM fallbacks, "
+            f"{accuracy}"
+        )
@@ -0,0 +1,268 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, Field
+
+from examples.langchain.callbacks import child_config
+from examples.stats import percentile
+
+
+@dataclass
+class HedgeStats:
+    """
+    Counters of a HedgedChatModel.
+
+    Attributes:
+        requests: Calls made to the hedged model.
+        hedges: Calls for which the backup was started.
+        backup_wins: Calls answered by the backup.
+        failovers: Hedges started early because the primary failed.
+        errors: Calls for which both models failed.
+        latency_saved: Estimated seconds saved by backup wins, from the
+            primary latencies observed so far.
+    """
+
+    requests: int = 0
+    hedges: int = 0
+    backup_wins: int = 0
+    failovers: int = 0
+    errors: int = 0
+    latency_saved: float = 0.0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.requests if self.requests else 0.0
+
+    def report(self) -> None:
+        print("\n--- Hedge Stats ---")
+        print(
+            f"{self.requests} requests, {self.hedges} hedged ({self.hedge_rate:.1%}), "
+            f"{self.backup_wins} won by the backup, {self.failovers} failovers, {self.errors} errors"
+        )
+        print(f"Estimated latency saved: {self.latency_saved:.2f}s")
+
+
+class _LatencyWindow:
+    """
+    The most recent primary latencies, shared by all copies of a hedged model.
+
+    A primary call cancelled because the backup won is only known to be slower
+    than the hedge delay. It is kept as a censored sample: it counts toward the
+    number of samples, but its elapsed time is only a lower bound and is not
+    used for the percentile.
+    """
+
+    def __init__(self, size: int):
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append((latency, False))
+
+    def add_censored(self, elapsed: float) -> None:
+        with self._lock:
+            self._samples.append((elapsed, True))
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            observed = [latency for latency, censored in self._samples if not censored]
+            total = len(self._samples)
+        if not observed:
+            return 0.0
+        # Censored samples are all slower than the observed ones around the hedge
+        # delay, so the pct-th percentile of all calls is a higher percentile of
+        # the observed ones.
+        return percentile(observed, min(100.0, pct * total / len(observed)))
+
+    def expected_remaining(self, elapsed: float) -> float:
+        """
+        Mean remaining latency of the calls that took longer than `elapsed`.
+
+        Censored samples count with their lower bound, so this underestimates.
+        """
+        with self._lock:
+            slower = [latency - elapsed for latency, _ in self._samples if latency > elapsed]
+        return sum(slower) / len(slower) if slower else 0.0
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Sends each call to `primary` and, if it has not answered within the hedge
+    delay, also to `backup`. The first response wins and the other call is
+    cancelled.
+
+    The hedge delay is the `hedge_percentile` of recent primary latencies, so
+    only the slowest calls are duplicated: at the 95th percentile roughly one
+    call in twenty is hedged. Until `min_samples` latencies have been seen,
+    `initial_delay` is used. A primary that fails before the delay starts the
+    backup immediately.
+
+    Args:
+        primary: The preferred chat model.
+        backup: The chat model used for hedges, typically another provider.
+        hedge_percentile: Percentile of primary latency after which to hedge.
+        initial_delay: Hedge delay in seconds until enough samples exist.
+        min_delay: Lower bound of the hedge delay, in seconds.
+        min_samples: Samples needed before the percentile is used.
+        window: Number of recent primary latencies kept.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    primary: BaseChatModel
+    backup: BaseChatModel
+    hedge_percentile: float = 95.0
+    initial_delay: float = 2.0
+    min_delay: float = 0.0
+    min_samples: int = 20
+    window: int = 500
+    stats: HedgeStats = Field(default_factory=HedgeStats)
+    latencies: Optional[_LatencyWindow] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.latencies is None:
+            self.latencies = _LatencyWindow(self.window)
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {
+            "primary": self.primary._identifying_params,
+            "backup": self.backup._identifying_params,
+        }
+
+    def bind_tools(self, tools, **kwargs):
+        # Each provider formats tools its own way, so both models bind them.
+        # The copy shares the stats and latency window with this model.
+        return self.model_copy(
+            update={
+                "primary": self.primary.bind_tools(tools, **kwargs),
+                "backup": self.backup.bind_tools(tools, **kwargs),
+            }
+        )
+
+    def hedge_delay(self) -> float:
+        """Returns the current delay after which the backup is started."""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.latencies.percentile(self.hedge_percentile))
+
+    def _record_backup_win(self, elapsed: float, primary_pending: bool) -> None:
+        self.stats.backup_wins += 1
+        if primary_pending:
+            # The cancelled primary's latency is unknown, only that it exceeds
+            # `elapsed`. As a latency it would drag the hedge delay up, dropped
+            # it would drag it down: keep it as a censored sample.
+            self.stats.latency_saved += self.latencies.expected_remaining(elapsed)
+            self.latencies.add_censored(elapsed)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.stats.requests += 1
+
+        def call(model: BaseChatModel, tag: str) -> asyncio.Task:
+            return asyncio.create_task(
+                model.ainvoke(messages, config=child_config(run_manager, tag), stop=stop, **kwargs)
+            )
+
+        start = time.perf_counter()
+        primary = call(self.primary, "hedge:primary")
+        backup = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+            if primary in done and primary.exception() is None:
+                self.latencies.add(time.perf_counter() - start)
+                return ChatResult(generations=[ChatGeneration(message=primary.result())])
+
+            self.stats.hedges += 1
+            self.stats.failovers += primary in done
+            backup = call(self.backup, "hedge:backup")
+            pending = {primary, backup} - done
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    elapsed = time.perf_counter() - start
+                    if task is primary:
+                        self.latencies.add(elapsed)
+                    else:
+                        self._record_backup_win(elapsed, primary_pending=not primary.done())
+                    return ChatResult(generations=[ChatGeneration(message=task.result())])
+            self.stats.errors += 1
+            raise primary.exception()
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Synchronous calls hedge on threads. A thread cannot be cancelled, so the
+        # losing call runs to completion in the background and is discarded.
+        self.stats.requests += 1
+
+        def call(model: BaseChatModel, tag: str):
+            return pool.submit(
+                model.invoke, messages, config=child_config(run_manager, tag), stop=stop, **kwargs
+            )
+
+        pool = ThreadPoolExecutor(max_workers=2)
+        start = time.perf_counter()
+        try:
+            primary = call(self.primary, "hedge:primary")
+            done, _ = wait_futures({primary}, timeout=self.hedge_delay())
+            if primary in done and primary.exception() is None:
+                self.latencies.add(time.perf_counter() - start)
+                return ChatResult(generations=[ChatGeneration(message=primary.result())])
+
+            self.stats.hedges += 1
+            self.stats.failovers += primary in done
+            backup = call(self.backup, "hedge:backup")
+            pending = {primary, backup} - done
+            while pending:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        continue
+                    elapsed = time.perf_counter() - start
+                    if future is primary:
+                        self.latencies.add(elapsed)
+                    else:
+                        self._record_backup_win(elapsed, primary_pending=not primary.done())
+                    return ChatResult(generations=[ChatGeneration(message=future.result())])
+            self.stats.errors += 1
+            raise primary.exception()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
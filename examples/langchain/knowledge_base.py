@@ -0,0 +1,317 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import difflib
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Optional, Protocol, Union
+
+import numpy as np
+
+# --- Text Normalization ---
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its like me of on "
+    "or the this to was what when where which who why will with you your".split()
+)
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercases, tokenizes, drops stopwords and strips simple plural suffixes."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+@dataclass
+class SearchHit:
+    doc_id: int
+    score: float
+    text: str
+
+
+class KnowledgeBase(Protocol):
+    """Interface of a search_information backend."""
+
+    def search(self, query: str, k: int = 1) -> list[SearchHit]: ...
+
+
+# --- Index Format ---
+# An index directory holds:
+#   meta.json          document count and average document length
+#   vocab.txt          one term per line; the line number is the term id
+#   term_offsets.npy   start of each term's postings (int64, length terms + 1)
+#   postings_docs.npy  document ids grouped by term (uint32)
+#   postings_tf.npy    term frequencies aligned with postings_docs (uint16)
+#   doc_lengths.npy    number of terms per document (uint32)
+#   doc_offsets.npy    start of each document in docs.bin (int64, length docs + 1)
+#   docs.bin           UTF-8 document texts, concatenated
+# Every array is opened with mmap, so only the pages touched by a query are read.
+
+
+def build_index(
+    documents: Iterable[Union[str, tuple[str, str]]],
+    directory: str,
+    run_size: int = 1_000_000,
+) -> None:
+    """
+    Builds a BM25 index on disk from a stream of documents.
+
+    Postings are buffered in runs of `run_size` entries and scattered into
+    their final position afterwards, so memory use is bounded by the vocabulary
+    and one run, not by the corpus.
+
+    Args:
+        documents: Texts, or (key, text) pairs where both key and text are
+            indexed and the text is returned by searches.
+        directory: The output directory; created if needed.
+        run_size: Number of postings buffered in memory before spilling.
+    """
+    os.makedirs(directory, exist_ok=True)
+    runs_dir = tempfile.mkdtemp(dir=directory)
+    vocabulary: dict[str, int] = {}
+    document_frequency = array("q")
+    doc_offsets, doc_lengths = array("q", [0]), array("I")
+    run_terms, run_docs, run_tfs = array("I"), array("I"), array("H")
+    runs = []
+
+    def flush_run():
+        path = os.path.join(runs_dir, f"run_{len(runs)}.npz")
+        np.savez(
+            path,
+            terms=np.frombuffer(run_terms, dtype=np.uint32),
+            docs=np.frombuffer(run_docs, dtype=np.uint32),
+            tfs=np.frombuffer(run_tfs, dtype=np.uint16),
+        )
+        runs.append(path)
+        del run_terms[:], run_docs[:], run_tfs[:]
+
+    with open(os.path.join(directory, "docs.bin"), "wb") as docs_file:
+        for doc_id, document in enumerate(documents):
+            key, text = document if isinstance(document, tuple) else ("", document)
+            terms = normalize(f"{key} {text}")
+            counts: dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                if term_id == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[term_id] += 1
+                run_terms.append(term_id)
+                run_docs.append(doc_id)
+                run_tfs.append(min(tf, 65535))
+            encoded = text.encode("utf-8")
+            docs_file.write(encoded)
+            doc_offsets.append(doc_offsets[-1] + len(encoded))
+            doc_lengths.append(len(terms))
+            if len(run_terms) >= run_size:
+                flush_run()
+    if run_terms:
+        flush_run()
+
+    # Scatter every run into the final, term-grouped postings arrays.
+    df = np.frombuffer(document_frequency, dtype=np.int64)
+    term_offsets = np.zeros(len(df) + 1, dtype=np.int64)
+    np.cumsum(df, out=term_offsets[1:])
+    total = int(term_offsets[-1])
+    postings_docs = np.lib.format.open_memmap(
+        os.path.join(directory, "postings_docs.npy"), "w+", np.uint32, (total,)
+    )
+    postings_tf = np.lib.format.open_memmap(
+        os.path.join(directory, "postings_tf.npy"), "w+", np.uint16, (total,)
+    )
+    cursor = term_offsets[:-1].copy()
+    for path in runs:
+        with np.load(path) as run:
+            order = np.argsort(run["terms"], kind="stable")
+            terms = run["terms"][order].astype(np.int64)
+            counts = np.bincount(terms, minlength=len(df))
+            group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            positions = cursor[terms] + np.arange(len(terms)) - group_start[terms]
+            postings_docs[positions] = run["docs"][order]
+            postings_tf[positions] = run["tfs"][order]
+            cursor += counts
+    postings_docs.flush()
+    postings_tf.flush()
+    del postings_docs, postings_tf
+    shutil.rmtree(runs_dir)
+
+    np.save(os.path.join(directory, "term_offsets.npy"), term_offsets)
+    np.save(os.path.join(directory, "doc_lengths.npy"), np.frombuffer(doc_lengths, dtype=np.uint32))
+    np.save(os.path.join(directory, "doc_offsets.npy"), np.frombuffer(doc_offsets, dtype=np.int64))
+    with open(os.path.join(directory, "vocab.txt"), "w") as f:
+        f.writelines(f"{term}\n" for term in vocabulary)
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(
+            {
+                "documents": len(doc_lengths),
+                "average_length": sum(doc_lengths) / max(len(doc_lengths), 1),
+            },
+            f,
+        )
+
+
+class BM25Index:
+    """
+    BM25 search over an index written by `build_index`.
+
+    Query terms are normalized like the corpus. Terms missing from the
+    vocabulary are matched to the closest known term when `fuzzy` is set.
+    A document is only a hit if it matches at least `min_coverage` of the
+    distinct query terms, so one shared word such as "weather" does not make
+    an answer about London a hit for "weather in Tokyo".
+
+    Args:
+        directory: The index directory.
+        in_memory: Load every array into RAM instead of memory-mapping it.
+        fuzzy: Match unknown query terms to similar vocabulary terms.
+        min_coverage: Share of the query terms a hit must contain, from 0 to 1.
+        k1: BM25 term frequency saturation.
+        b: BM25 length normalization.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        in_memory: bool = False,
+        fuzzy: bool = True,
+        min_coverage: float = 0.6,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.directory = directory
+        self.fuzzy = fuzzy
+        self.min_coverage = min_coverage
+        self.k1 = k1
+        self.b = b
+        mmap_mode = None if in_memory else "r"
+
+        def load(name):
+            return np.load(os.path.join(directory, name), mmap_mode=mmap_mode)
+
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        self.documents = meta["documents"]
+        self.average_length = meta["average_length"] or 1.0
+        with open(os.path.join(directory, "vocab.txt")) as f:
+            self.vocabulary = {line.rstrip("\n"): i for i, line in enumerate(f)}
+        self.term_offsets = load("term_offsets.npy")
+        self.postings_docs = load("postings_docs.npy")
+        self.postings_tf = load("postings_tf.npy")
+        self.doc_lengths = load("doc_lengths.npy")
+        self.doc_offsets = load("doc_offsets.npy")
+        docs_path = os.path.join(directory, "docs.bin")
+        self._docs_file: Optional[BinaryIO] = None
+        if in_memory:
+            # Read once; no file handle or mapping is kept open.
+            with open(docs_path, "rb") as f:
+                self._docs = f.read()
+        elif os.path.getsize(docs_path):
+            self._docs_file = open(docs_path, "rb")
+            self._docs = mmap.mmap(self._docs_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._docs = b""
+        self._trigrams: Optional[dict[str, set[str]]] = None
+        self._fuzzy_cache: dict[str, Optional[str]] = {}
+        self._temporary: Optional[tempfile.TemporaryDirectory] = None
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Union[str, tuple[str, str]]], **kwargs):
+        """
+        Builds a small index in a temporary directory and loads it into memory.
+
+        The index owns the directory: it is removed by `close`, or when the
+        index is garbage collected.
+        """
+        temporary = tempfile.TemporaryDirectory(prefix="kb_")
+        try:
+            build_index(documents, temporary.name)
+            kwargs.setdefault("in_memory", True)
+            index = cls(temporary.name, **kwargs)
+        except BaseException:
+            temporary.cleanup()
+            raise
+        index._temporary = temporary
+        return index
+
+    def close(self) -> None:
+        if isinstance(self._docs, mmap.mmap):
+            self._docs.close()
+        if self._docs_file is not None:
+            self._docs_file.close()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+
+    def document(self, doc_id: int) -> str:
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        return bytes(self._docs[start:end]).decode("utf-8")
+
+    def _closest_term(self, term: str) -> Optional[str]:
+        if term in self._fuzzy_cache:
+            return self._fuzzy_cache[term]
+        if self._trigrams is None:
+            # Built on first use: trigram -> vocabulary terms containing it.
+            self._trigrams = {}
+            for known in self.vocabulary:
+                for gram in {known[i : i + 3] for i in range(max(len(known) - 2, 1))}:
+                    self._trigrams.setdefault(gram, set()).add(known)
+        candidates = set()
+        for gram in {term[i : i + 3] for i in range(max(len(term) - 2, 1))}:
+            candidates |= self._trigrams.get(gram, set())
+        matches = difflib.get_close_matches(term, candidates, n=1, cutoff=0.8)
+        self._fuzzy_cache[term] = matches[0] if matches else None
+        return self._fuzzy_cache[term]
+
+    def search(self, query: str, k: int = 1) -> list[SearchHit]:
+        doc_ids, scores = [], []
+        terms = set(normalize(query))
+        for term in terms:
+            term_id = self.vocabulary.get(term)
+            if term_id is None and self.fuzzy:
+                closest = self._closest_term(term)
+                term_id = self.vocabulary.get(closest) if closest else None
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = np.asarray(self.postings_docs[start:end])
+            tf = np.asarray(self.postings_tf[start:end], dtype=np.float64)
+            lengths = np.asarray(self.doc_lengths[docs], dtype=np.float64)
+            df = len(docs)
+            idf = np.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths / self.average_length)
+            doc_ids.append(docs)
+            scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+        if not doc_ids:
+            return []
+
+        unique, inverse = np.unique(np.concatenate(doc_ids), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores))
+        # Each term lists a document once, so this counts the query terms it contains.
+        matched = np.bincount(inverse)
+        covered = np.flatnonzero(matched >= self.min_coverage * len(terms))
+        if not len(covered):
+            return []
+        unique, totals = unique[covered], totals[covered]
+        top = np.argpartition(-totals, min(k, len(totals)) - 1)[:k]
+        top = top[np.argsort(-totals[top])]
+        return [
+            SearchHit(doc_id=int(unique[i]), score=float(totals[i]), text=self.document(int(unique[i])))
+            for i in top
+        ]
@@ -0,0 +1,255 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, Field
+
+from examples.langchain.callbacks import child_config
+
+
+class NoHealthyProviderError(RuntimeError):
+    """Raised when every provider failed or is cooling down."""
+
+
+@dataclass
+class ProviderHealth:
+    """
+    Health of one provider as seen by a LoadBalancedChatModel.
+
+    Attributes:
+        latency: EWMA of successful call latency, in seconds, or None before
+            the first success.
+        error_rate: EWMA of failures, between 0 and 1.
+        consecutive_failures: Failures since the last success.
+        ejected: Whether the provider has been ejected and not yet restored.
+        ejected_until: Monotonic time until which the provider is cooling down.
+        calls: Calls routed to the provider.
+        failures: Calls that failed.
+    """
+
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    ejected: bool = False
+    ejected_until: float = 0.0
+    calls: int = 0
+    failures: int = 0
+
+    def score(self) -> float:
+        """Expected latency per successful call; lower is better."""
+        if self.latency is None:
+            # Untried providers are tried first; ones that never succeeded last.
+            return 0.0 if self.calls == 0 else float("inf")
+        return self.latency / max(1.0 - self.error_rate, 0.01)
+
+
+@dataclass
+class RoutingLog:
+    """
+    Every routing decision of a LoadBalancedChatModel.
+
+    Attributes:
+        calls: (time, provider, latency, ok) per call, with time in seconds
+            since the log was created.
+        events: (time, provider, "ejected" or "restored") health changes.
+    """
+
+    started: float = field(default_factory=time.monotonic)
+    calls: list[tuple[float, str, float, bool]] = field(default_factory=list)
+    events: list[tuple[float, str, str]] = field(default_factory=list)
+
+    def now(self) -> float:
+        return time.monotonic() - self.started
+
+    def traffic_split(self, bucket: float = 1.0) -> list[tuple[float, Counter]]:
+        """Returns the calls per provider in consecutive `bucket`-second windows."""
+        buckets: dict[int, Counter] = {}
+        for at, provider, _, _ in self.calls:
+            buckets.setdefault(int(at // bucket), Counter())[provider] += 1
+        return [(index * bucket, buckets[index]) for index in sorted(buckets)]
+
+    def report(self, providers: list[str], bucket: float = 1.0) -> None:
+        print("\n--- Traffic Split ---")
+        print(f"{'time':>8}" + "".join(f"{name:>12}" for name in providers))
+        for start, counts in self.traffic_split(bucket):
+            total = sum(counts.values())
+            print(
+                f"{start:>7.1f}s"
+                + "".join(f"{counts[name] / total:>12.0%}" for name in providers)
+            )
+        for at, provider, change in self.events:
+            print(f"{at:>7.1f}s  {provider} {change}")
+
+
+class LoadBalancedChatModel(BaseChatModel):
+    """
+    Routes each call to the healthy provider with the lowest expected latency.
+
+    Every provider keeps an EWMA of its latency and error rate. A provider that
+    fails `eject_after` times in a row is ejected for `cooldown` seconds; after
+    that the next call is sent to it first as a probe. A failed probe ejects it
+    again, a successful one restores it with fresh latency and error estimates. A failed
+    call is retried on the next best provider, so callers only see an error if
+    every provider fails. A fraction `explore` of calls goes to a random healthy
+    provider, so the estimates of the others stay current and traffic moves
+    back once a provider recovers.
+
+    Args:
+        models: Chat models by provider name, in order of preference.
+        alpha: Weight of the newest sample in the EWMAs.
+        eject_after: Consecutive failures that eject a provider.
+        cooldown: Seconds an ejected provider receives no calls.
+        explore: Fraction of calls routed to a random healthy provider.
+        seed: Seed of the exploration.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    models: dict[str, BaseChatModel]
+    alpha: float = 0.2
+    eject_after: int = 3
+    cooldown: float = 30.0
+    explore: float = 0.05
+    seed: Optional[int] = None
+    health: dict[str, ProviderHealth] = Field(default_factory=dict)
+    log: RoutingLog = Field(default_factory=RoutingLog)
+    lock: Any = Field(default_factory=threading.Lock)
+    rng: Optional[random.Random] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        if not self.models:
+            raise ValueError("LoadBalancedChatModel needs at least one model.")
+        for name in self.models:
+            self.health.setdefault(name, ProviderHealth())
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "load-balanced-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {name: model._identifying_params for name, model in self.models.items()}
+
+    def bind_tools(self, tools, **kwargs):
+        # The copy shares the health, log and lock with this model.
+        return self.model_copy(
+            update={
+                "models": {
+                    name: model.bind_tools(tools, **kwargs) for name, model in self.models.items()
+                }
+            }
+        )
+
+    def ranking(self) -> list[str]:
+        """Returns the providers to try for the next call, best first."""
+        now = time.monotonic()
+        with self.lock:
+            available = [name for name, h in self.health.items() if h.ejected_until <= now]
+            cooled = [name for name in available if self.health[name].ejected]
+            healthy = [name for name in available if not self.health[name].ejected]
+            ranked = sorted(healthy, key=lambda name: self.health[name].score())
+            if len(ranked) > 1 and self.rng.random() < self.explore:
+                ranked.insert(0, ranked.pop(self.rng.randrange(1, len(ranked))))
+            if cooled:
+                # Cooled down: this call probes one provider, first, so the probe is
+                # actually sent; concurrent calls skip it until the probe is recorded.
+                probe = cooled[0]
+                self.health[probe].ejected_until = now + self.cooldown
+                ranked.insert(0, probe)
+        return ranked
+
+    def _record(self, name: str, latency: float, ok: bool) -> None:
+        with self.lock:
+            health = self.health[name]
+            health.calls += 1
+            health.error_rate += self.alpha * ((0.0 if ok else 1.0) - health.error_rate)
+            self.log.calls.append((self.log.now(), name, latency, ok))
+            if ok:
+                if health.ejected:
+                    # A successful probe: start the estimates afresh, or the outage
+                    # would keep the provider ranked last long after it recovered.
+                    health.latency = latency
+                    health.error_rate = 0.0
+                    self.log.events.append((self.log.now(), name, "restored"))
+                elif health.latency is None:
+                    health.latency = latency
+                else:
+                    health.latency += self.alpha * (latency - health.latency)
+                health.ejected = False
+                health.consecutive_failures = 0
+                health.ejected_until = 0.0
+                return
+            health.failures += 1
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.eject_after:
+                health.ejected_until = time.monotonic() + self.cooldown
+                if not health.ejected:
+                    health.ejected = True
+                    self.log.events.append((self.log.now(), name, "ejected"))
+
+    def _no_provider(self, error: Optional[BaseException]) -> NoHealthyProviderError:
+        message = "All providers failed." if error else "All providers are cooling down."
+        return NoHealthyProviderError(message)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        error = None
+        for name in self.ranking():
+            start = time.perf_counter()
+            try:
+                message = await self.models[name].ainvoke(
+                    messages,
+                    config=child_config(run_manager, f"provider:{name}"),
+                    stop=stop,
+                    **kwargs,
+                )
+            except Exception as e:
+                self._record(name, time.perf_counter() - start, ok=False)
+                error = e
+                continue
+            self._record(name, time.perf_counter() - start, ok=True)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        raise self._no_provider(error) from error
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        error = None
+        for name in self.ranking():
+            start = time.perf_counter()
+            try:
+                message = self.models[name].invoke(
+                    messages,
+                    config=child_config(run_manager, f"provider:{name}"),
+                    stop=stop,
+                    **kwargs,
+                )
+            except Exception as e:
+                self._record(name, time.perf_counter() - start, ok=False)
+                error = e
+                continue
+            self._record(name, time.perf_counter() - start, ok=True)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        raise self._no_provider(error) from error
@@ -5,11 +5,19 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import Runnable, RunnableParallel, RunnablePassthrough
 
 
+BRANCH_NAMES = ("summarize_chain", "questions_chain", "terms_chain")
+SYNTHESIS_TAG = "synthesis"
+
+
 def setup(llm):
 
     # Define Independent Chains
@@ -23,7 +31,7 @@ def setup(llm):
         )
         | llm
         | StrOutputParser()
-    )
+    ).with_config(run_name="summarize_chain")
 
     questions_chain: Runnable = (
         ChatPromptTemplate.from_messages(
@@ -37,7 +45,7 @@ def setup(llm):
         )
         | llm
         | StrOutputParser()
-    )
+    ).with_config(run_name="questions_chain")
 
     terms_chain: Runnable = (
         ChatPromptTemplate.from_messages(
@@ -51,7 +59,7 @@ def setup(llm):
         )
         | llm
         | StrOutputParser()
-    )
+    ).with_config(run_name="terms_chain")
 
     # Build the Parallel + Synthesis Chain
 
@@ -81,7 +89,11 @@ def setup(llm):
     )
 
     # 3. Construct the full chain by piping the parallel results directly into the synthesis prompt, followed by the LLM and output parser.
-    return map_chain | synthesis_prompt | llm | StrOutputParser()
+    # The synthesis step is tagged so its tokens can be told apart from the branches' when streaming.
+    synthesis_chain = (synthesis_prompt | llm | StrOutputParser()).with_config(
+        run_name="synthesis_chain", tags=[SYNTHESIS_TAG]
+    )
+    return map_chain | synthesis_chain
 
 
 # Run the chain
@@ -105,3 +117,60 @@ async def execute(llm, topic: str) -> None:
         print(response)
     except Exception as e:
         print(f"\nAn error occurred during chain execution: {e}")
+
+
+@dataclass
+class StreamingMetrics:
+    """Timings of a streamed run, in seconds since the run started."""
+
+    branch_completion: dict[str, float] = field(default_factory=dict)
+    time_to_first_token: Optional[float] = None
+    total: float = 0.0
+
+
+async def execute_streaming(llm, topic: str) -> Optional[StreamingMetrics]:
+    """
+    Runs the parallel chain and prints the synthesis tokens as soon as they arrive.
+
+    Args:
+        topic: The input topic to be processed by the LangChain chains
+
+    Returns:
+        When each branch completed and the time to the first synthesis token.
+    """
+    if not llm:
+        print("LLM not initialized. Cannot run example.")
+        return None
+    full_parallel_chain = setup(llm)
+    metrics = StreamingMetrics()
+
+    print(f"\n---Streaming Parallel LangChain Example for Topic: '{topic}' ---")
+    start = time.perf_counter()
+    try:
+        async for event in full_parallel_chain.astream_events(topic, version="v2"):
+            elapsed = time.perf_counter() - start
+            if event["event"] == "on_chain_end" and event["name"] in BRANCH_NAMES:
+                metrics.branch_completion.setdefault(event["name"], elapsed)
+            elif event["event"] == "on_chat_model_stream" and SYNTHESIS_TAG in event.get(
+                "tags", []
+            ):
+                token = event["data"]["chunk"].text
+                if not token:
+                    continue
+                if metrics.time_to_first_token is None:
+                    metrics.time_to_first_token = elapsed
+                    print("\n--- Final Response ---")
+                print(token, end="", flush=True)
+    except Exception as e:
+        print(f"\nAn error occurred during chain execution: {e}")
+    metrics.total = time.perf_counter() - start
+
+    print("\n\n--- Timings ---")
+    for name, completed in sorted(
+        metrics.branch_completion.items(), key=lambda item: item[1]
+    ):
+        print(f"{name} completed after {completed:.2f}s")
+    if metrics.time_to_first_token is not None:
+        print(f"Time to first token: {metrics.time_to_first_token:.2f}s")
+    print(f"Total time: {metrics.total:.2f}s")
+    return metrics
@@ -5,11 +5,19 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator, Optional, Union
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
 
 
-def execute(llm):
+def setup(llm) -> Runnable:
 
     # Prompt 1: Extract Information
     prompt_extract = ChatPromptTemplate.from_template(
@@ -27,13 +35,17 @@ def execute(llm):
     extraction_chain = prompt_extract | llm | StrOutputParser()
 
     # The full chain passes the output of the extraction chain into the 'specifications' variable for the transformation prompt.
-    full_chain = (
+    return (
         {"specifications": extraction_chain}
         | prompt_transform
         | llm
         | StrOutputParser()
     )
 
+
+def execute(llm):
+    full_chain = setup(llm)
+
     # Run the chain
     input_text = "The new laptop model features a 3.5 GHz octa-core processor, 16GB of RAM, and a 1TB NVMe SSD."
 
@@ -42,3 +54,136 @@ def execute(llm):
 
     print("\n--- Final JSON Output ---")
     print(final_result)
+
+
+# --- Batch Mode ---
+
+
+def read_jsonl(path: str, field: str = "text_input") -> Iterator[dict]:
+    """
+    Lazily reads product descriptions from a JSONL file, one line at a time.
+
+    Each line is either a JSON object containing `field` or a bare JSON string.
+    """
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record if isinstance(record, dict) else {field: record}
+
+
+@dataclass
+class BatchStats:
+    items: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+
+async def _invoke(
+    chain: Runnable, index: int, item: dict
+) -> tuple[int, Union[str, Exception]]:
+    try:
+        return index, await chain.ainvoke(item)
+    except Exception as e:
+        # One bad input should not abort the whole batch.
+        return index, e
+
+
+async def run_batch(
+    llm,
+    inputs: Iterable[Union[str, dict]],
+    concurrency: int = 8,
+    ordered: bool = True,
+    stats: Optional[BatchStats] = None,
+) -> AsyncIterator[tuple[int, Union[str, Exception]]]:
+    """
+    Runs the extract -> transform chain over a stream of inputs.
+
+    At most `concurrency` inputs are in flight and inputs are only pulled from the
+    iterable as slots free up, so memory stays flat however large the input is.
+
+    Args:
+        llm: The language model used by both chain steps.
+        inputs: Product descriptions, as strings or {"text_input": ...} dicts.
+            Pass `read_jsonl(path)` to stream a file.
+        concurrency: Maximum number of inputs processed at the same time.
+        ordered: Yield results in input order. Otherwise yield them as they complete.
+        stats: Optional BatchStats updated as results are yielded.
+
+    Yields:
+        (index, result) tuples. A failed input yields its exception as the result.
+    """
+    chain = setup(llm)
+    stats = stats if stats is not None else BatchStats()
+    start = time.perf_counter()
+    window: deque[asyncio.Task] = deque()
+
+    def record(result: tuple[int, Union[str, Exception]]):
+        stats.items += 1
+        stats.errors += isinstance(result[1], Exception)
+        stats.elapsed = time.perf_counter() - start
+        return result
+
+    async def next_result() -> tuple[int, Union[str, Exception]]:
+        if ordered:
+            return await window.popleft()
+        done, _ = await asyncio.wait(window, return_when=asyncio.FIRST_COMPLETED)
+        task = done.pop()
+        window.remove(task)
+        return task.result()
+
+    try:
+        for index, item in enumerate(inputs):
+            if isinstance(item, str):
+                item = {"text_input": item}
+            window.append(asyncio.create_task(_invoke(chain, index, item)))
+            if len(window) >= concurrency:
+                yield record(await next_result())
+        while window:
+            yield record(await next_result())
+    finally:
+        # Cancel outstanding work if the consumer stops early.
+        for task in window:
+            task.cancel()
+
+
+async def execute_batch(
+    llm,
+    input_path: str,
+    output_path: Optional[str] = None,
+    concurrency: int = 8,
+    ordered: bool = True,
+) -> BatchStats:
+    """
+    Runs the chain over a JSONL file and writes one JSON result per line.
+
+    Results are printed when no output path is given.
+    """
+    stats = BatchStats()
+    output = open(output_path, "w") if output_path else None
+    try:
+        async for index, result in run_batch(
+            llm, read_jsonl(input_path), concurrency, ordered, stats
+        ):
+            record = {"index": index}
+            if isinstance(result, Exception):
+                record["error"] = str(result)
+            else:
+                record["output"] = result
+            if output:
+                output.write(json.dumps(record) + "\n")
+            else:
+                print(json.dumps(record))
+    finally:
+        if output:
+            output.close()
+
+    print(
+        f"\n--- Processed {stats.items} items ({stats.errors} errors) in "
+        f"{stats.elapsed:.2f}s: {stats.items_per_second:.1f} items/s ---"
+    )
+    return stats
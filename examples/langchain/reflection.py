@@ -5,16 +5,16 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from examples.langchain.context import ReflectionContext
 
-def run_reflection_loop(llm):
-    """
-    Demonstrates a multi-step AI reflection loop to progressively improve a Python function.
-    """
-
-    # --- The Core Task ---
-    task_prompt = """
+# --- The Core Task ---
+TASK_PROMPT = """
     Your task is to create a Python function named `calculate factorial`.
     This function should do the following:
     1. Accept a single integer `n` as input.
@@ -24,11 +24,44 @@ def run_reflection_loop(llm):
     5. Handle invalid input: Raise a ValueError if the input is a negative number.
     """
 
+# This asks the mdoel to act as a senior code reviewer.
+REFLECTOR_PROMPT = """
+                          You are a senior software engineer and an expert in Python. 
+                          Your role is to perform a meticulous code review.
+                          Critically evaluatie the provided Python code based on the original task requirements.
+                          Look for bugs, style issues, missing edge cases, and areas for improvement.
+                          If the code is perfect and meets all requirements,
+                          response with the single phrase 'CODE_IS_PERFECT'.
+                          Otherwise, provide a bulleted list of your critiques.
+                          """
+
+
+def reflector_messages(task_prompt: str, code: str) -> list:
+    """Builds the prompt for the reflector agent."""
+    return [
+        SystemMessage(content=REFLECTOR_PROMPT),
+        HumanMessage(content=f"Original Task:\n{task_prompt}\n\nCode to Review:\n{code}"),
+    ]
+
+
+def run_reflection_loop(
+    llm, max_iterations: int = 3, context: Optional[ReflectionContext] = None
+):
+    """
+    Demonstrates a multi-step AI reflection loop to progressively improve a Python function.
+
+    Args:
+        max_iterations: The maximum number of generate/critique rounds.
+        context: Bounds the prompt sent on each refinement. Only the task, the latest code
+            and the latest critique are resent, so prompt size stays flat across iterations.
+            Its `prompt_tokens` list records the prompt size of every iteration.
+    """
+    task_prompt = TASK_PROMPT
+
     # --- The Reflection Loop ---
-    max_iterations = 3
     current_code = ""
-    # We will build a conversation history to provide context in each step.
-    message_history = [HumanMessage(content=task_prompt)]
+    # Instead of the full conversation history, we keep a bounded context for each step.
+    context = context or ReflectionContext(task_prompt)
 
     for i in range(max_iterations):
         print("\n" + "=" * 25 + f" REFLECTION LOOP: ITERATION {i + 1} " + "=" * 25)
@@ -38,46 +71,26 @@ def run_reflection_loop(llm):
         if i == 0:
             print("\n>>> STAGE 1: GENERATING intial code...")
             # The first message is just the task prompt.
-            response = llm.invoke(message_history)
+            response = llm.invoke(context.messages())
             current_code = response.content
         else:
             print("\n>>> STAGE 1: REFINING code based on previous critique...")
-            # The message history now contains the task,
-            # the last code, and the last critiques.
-            message_history.append(
-                HumanMessage(
-                    content="Please refine the code using the critiques provided."
+            # The context contains the task, the last code, and the last critique.
+            response = llm.invoke(
+                context.messages(
+                    "Please refine the code using the critiques provided."
                 )
             )
-            response = llm.invoke(message_history)
             current_code = response.content
 
+        print(f"(prompt tokens: {context.prompt_tokens[-1]})")
         print("\n--- Generated Code (v" + str(i + 1) + ") ---\n" + current_code)
-        message_history.append(response)  # Add the generated code to history
 
         # --- 2. REFLECT STAGE ---
         print("\n>>> STAGE 2: REFLECTING on the generated code...")
 
         # Create a specific prompt for the reflector agent.
-        # This asks the mdoel to act as a senior code reviewer.
-        reflector_prompt = [
-            SystemMessage(
-                content="""
-                          You are a senior software engineer and an expert in Python. 
-                          Your role is to perform a meticulous code review.
-                          Critically evaluatie the provided Python code based on the original task requirements.
-                          Look for bugs, style issues, missing edge cases, and areas for improvement.
-                          If the code is perfect and meets all requirements,
-                          response with the single phrase 'CODE_IS_PERFECT'.
-                          Otherwise, provide a bulleted list of your critiques.
-                          """
-            ),
-            HumanMessage(
-                content=f"Original Task:\n{task_prompt}\n\nCode to Review:\n{current_code}"
-            ),
-        ]
-
-        critique_response = llm.invoke(reflector_prompt)
+        critique_response = llm.invoke(reflector_messages(task_prompt, current_code))
         critique = critique_response.content
 
         # --- 3. STOPPING CONDITION ---
@@ -88,15 +101,124 @@ def run_reflection_loop(llm):
             break
 
         print("\n --- Critique ---\n" + critique)
-        # Add the critique to the history for the next refinement loop.
-        message_history.append(
-            HumanMessage(content=f"Critique of the previous code:\n{critique}")
-        )
+        # Keep the latest code and critique for the next refinement loop.
+        context.update(current_code, critique)
 
         print("\n" + "=" * 30 + " FINAL RESULT " + "=" * 30)
         print("\nFinal refined code after the reflection process:\n")
         print(current_code)
 
+    print(f"\nPrompt tokens per iteration: {context.prompt_tokens}")
+
+
+# --- Speculative N-Best Reflection ---
+
+# Each concurrent candidate gets a different nudge so the candidates are not identical.
+CANDIDATE_HINTS = [
+    "",
+    "Prefer a simple iterative implementation.",
+    "Pay particular attention to input validation and error messages.",
+    "Prefer the most readable implementation, with type hints.",
+]
+
+
+@dataclass
+class Candidate:
+    code: str
+    critique: str
+
+    @property
+    def is_perfect(self) -> bool:
+        return "CODE_IS_PERFECT" in self.critique
+
+    @property
+    def issues(self) -> int:
+        """Number of critique points raised, used to rank candidates."""
+        if self.is_perfect:
+            return 0
+        lines = [line.strip() for line in self.critique.splitlines()]
+        bullets = [line for line in lines if line[:1] in "-*•" or line[:1].isdigit()]
+        return max(len(bullets), 1)
+
+
+async def _generate_and_critique(llm, messages: list, task_prompt: str) -> Candidate:
+    response = await llm.ainvoke(messages)
+    critique_response = await llm.ainvoke(reflector_messages(task_prompt, response.content))
+    return Candidate(code=response.content, critique=critique_response.content)
+
+
+async def arun_speculative_reflection(
+    llm,
+    n_candidates: int = 3,
+    max_rounds: int = 3,
+    context: Optional[ReflectionContext] = None,
+) -> Optional[Candidate]:
+    """
+    Asynchronous reflection that explores several candidates per round.
+
+    Each round generates `n_candidates` implementations concurrently and critiques
+    each one as soon as it is generated. As soon as any critic answers
+    'CODE_IS_PERFECT', the remaining in-flight calls are cancelled. Otherwise the
+    candidate with the fewest critique points is refined in the next round. This
+    spends more tokens than run_reflection_loop to reach acceptable code sooner.
+
+    Args:
+        n_candidates: Number of concurrent candidates per round.
+        max_rounds: The maximum number of generate/critique rounds.
+        context: Bounds the prompt of each refinement, see ReflectionContext.
+
+    Returns:
+        The best candidate found, or None if every call failed.
+    """
+    task_prompt = TASK_PROMPT
+    context = context or ReflectionContext(task_prompt)
+    best: Optional[Candidate] = None
+
+    for round_number in range(max_rounds):
+        print("\n" + "=" * 20 + f" SPECULATIVE REFLECTION: ROUND {round_number + 1} " + "=" * 20)
+        instruction = (
+            "Please refine the code using the critiques provided." if best else None
+        )
+        # The candidates share one prompt, built and counted once per round;
+        # each only appends its own hint.
+        shared = context.messages(instruction)
+        hints = [CANDIDATE_HINTS[i % len(CANDIDATE_HINTS)] for i in range(n_candidates)]
+        tasks = [
+            asyncio.create_task(
+                _generate_and_critique(
+                    llm, shared + ([HumanMessage(content=hint)] if hint else []), task_prompt
+                )
+            )
+            for hint in hints
+        ]
+        round_best: Optional[Candidate] = None
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    candidate = await finished
+                except Exception as e:
+                    print(f"\nA candidate failed: {e}")
+                    continue
+                print(f"\n--- Candidate critiqued: {candidate.issues} issue(s) ---")
+                if candidate.is_perfect:
+                    print("\nA critic found no further issues. Cancelling the other candidates.")
+                    return candidate
+                if round_best is None or candidate.issues < round_best.issues:
+                    round_best = candidate
+        finally:
+            # Cancel any candidates still in flight, e.g. after an early exit.
+            for task in tasks:
+                task.cancel()
+
+        if round_best is None:
+            print("\nEvery candidate failed in this round.")
+            break
+        best = round_best
+        print("\n --- Best Critique ---\n" + best.critique)
+        context.update(best.code, best.critique)
+
+    return best
+
 
 # Example usage in main.py:
 # def main():
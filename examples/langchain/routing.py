@@ -7,9 +7,20 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
+import logging
+from typing import Optional
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableBranch
+from langchain_core.runnables import (
+    Runnable,
+    RunnableBranch,
+    RunnableConfig,
+    RunnableLambda,
+    RunnablePassthrough,
+)
+
+from examples.langchain.fast_router import FastRouter
 
 # Define Simulated Sub-Agent Handlers
 
@@ -32,7 +43,7 @@ def unclear_handler(request: str) -> str:
     return f"Coordinator could not delegate request: '{request}'. Please clarify."
 
 
-def execute(llm):
+def setup(llm, fast_router: Optional[FastRouter] = None) -> Runnable:
 
     # Define Coordinator Router Chain
     # This chain decides which handler to delegate to.
@@ -50,11 +61,21 @@ def execute(llm):
         ]
     )
 
-    if not llm:
-        return
-
     coordinator_router_chain = coordinator_router_prompt | llm | StrOutputParser()
 
+    # With a fast router, only requests it is not confident about reach the LLM.
+    decision_chain = coordinator_router_chain
+    if fast_router:
+
+        def route(x: dict, config: RunnableConfig) -> str:
+            # Pass the config on, so the LLM call keeps the caller's callbacks and tags.
+            return fast_router.route(
+                x["request"],
+                lambda request: coordinator_router_chain.invoke({"request": request}, config=config),
+            )
+
+        decision_chain = RunnableLambda(route)
+
     # Define the Delegation Logic
     # Use RunnableBranch to route based on the router chain's output.
 
@@ -80,13 +101,31 @@ def execute(llm):
 
     # Combine the router chain and the delegation branch into a single runnable
     # The router chain's output ('decision') is passed along with the original input ('request') to the delegation branch.
-    coordinator_agent = (
-        {"decision": coordinator_router_chain, "request": RunnablePassthrough()}
+    return (
+        {"decision": decision_chain, "request": RunnablePassthrough()}
         | delegation_branch
         | (lambda x: x["output"])
     )  # Extract the final output
 
+
+def execute(llm, fast_router: Optional[FastRouter] = None):
+    if not llm:
+        return
+
+    # Show the router's decisions. Configured here rather than at import, so
+    # importing this module leaves the application's logging alone; a no-op
+    # if logging is already set up.
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    # Pass a FastRouter with a different threshold or shadow rate to tune the fast path.
+    fast_router = fast_router or FastRouter()
+    coordinator_agent = setup(llm, fast_router)
+
     print("--- Running with a booking request ---")
     request_a = "Book me a flight to London."
     result_a = coordinator_agent.invoke({"request": request_a})
     print(f"Final Result A: {result_a}")
+
+    fast_router.log_stats()
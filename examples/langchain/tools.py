@@ -5,10 +5,41 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
+from typing import Optional
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import tool as langchain_tool
 from langchain_classic.agents import create_tool_calling_agent, AgentExecutor
 
+from examples.langchain.driver import AgentDriver
+from examples.langchain.knowledge_base import BM25Index, KnowledgeBase
+
+# --- Knowledge Base ---
+# The default corpus; replace it with set_knowledge_base(), e.g. with a
+# BM25Index opened from an on-disk index built by knowledge_base.build_index.
+SIMULATED_RESULTS = [
+    ("weather in london", "The weather in London is currently cloudy with a temperature of 15°C."),
+    ("capital of france", "The capital of France is Paris."),
+    ("population of earth", "The estimated population of Earth is around 8 billion people."),
+    ("tallest mountain", "Mount Everest is the tallest mountain above sea level."),
+]
+
+_knowledge_base: Optional[KnowledgeBase] = None
+
+
+def set_knowledge_base(knowledge_base: Optional[KnowledgeBase]) -> None:
+    """Sets the backend of search_information. None restores the default corpus."""
+    global _knowledge_base
+    _knowledge_base = knowledge_base
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Returns the current backend, indexing the default corpus on first use."""
+    global _knowledge_base
+    if _knowledge_base is None:
+        _knowledge_base = BM25Index.from_documents(SIMULATED_RESULTS)
+    return _knowledge_base
+
 
 # --- Define a Tool ---
 @langchain_tool
@@ -19,15 +50,11 @@ def search_information(query: str) -> str:
     """
     print(f"\n--- Tool Called: search_information with query: '{query}' ---")
 
-    # Simulate a search tool with a dictionary of predefined results.
-    simulated_results = {
-        "weather in london": "The weather in London is currently cloudy with a temperature of 15°C.",
-        "capital of france": "The capital of France is Paris.",
-        "population of earth": "The estimated population of Earth is around 8 billion people.",
-        "tallest mountain": "Mount Everest is the tallest mountain above sea level.",
-        "default": f"Simulated search result for '{query}': No specific information found, but the topic seems interesting.",
-    }
-    result = simulated_results.get(query.lower(), simulated_results["default"])
+    hits = get_knowledge_base().search(query, k=1)
+    if hits:
+        result = hits[0].text
+    else:
+        result = f"Simulated search result for '{query}': No specific information found, but the topic seems interesting."
     print(f"--- TOOL RESULT: {result} ---")
     return result
 
@@ -65,19 +92,40 @@ async def run_agent_with_tool(agent_executor: AgentExecutor, query: str):
         print(f"\n An error occurred during agent execution: {e}")
 
 
+async def run_agent_queries(agent_executor: AgentExecutor, queries: list[str], **limits):
+    """
+    Runs queries through an AgentDriver and prints each response and the driver stats.
+
+    Args:
+        agent_executor: The agent to run.
+        queries: The user queries.
+        limits: AgentDriver settings, e.g. concurrency or requests_per_minute.
+    """
+    results, stats = await AgentDriver(agent_executor, **limits).run(queries)
+    for result in results:
+        print(f"\n--- Final Agent Response for '{result.query}' ---")
+        if result.error:
+            print(f"An error occurred during agent execution: {result.error}")
+        else:
+            print(result.output)
+    stats.report()
+
+
 # Example usage in main.py:
 # async def main():
-#     """Sets up the agent and runs all agent queries concurrently."""
+#     """Sets up the agent and runs the queries within the provider's rate limits."""
 #     llm = retrieve_langchain_llm()
 #     if llm:
 #         agent_executor = tools.setup(llm)
-#         tasks = [
-#             tools.run_agent_with_tool(agent_executor, "What is the capital of France?"),
-#             tools.run_agent_with_tool(
-#                 agent_executor, "What is the weather like in London?"
-#             ),
-#             tools.run_agent_with_tool(
-#                 agent_executor, "Tell me something about dogs."
-#             ),  # Should trigger the default tool response
+#         queries = [
+#             "What is the capital of France?",
+#             "What is the weather like in London?",
+#             "Tell me something about dogs.",  # Should trigger the default tool response
 #         ]
-#         await asyncio.gather(*tasks)
+#         await tools.run_agent_queries(
+#             agent_executor,
+#             queries,
+#             concurrency=4,
+#             requests_per_minute=50,
+#             tokens_per_minute=40_000,
+#         )
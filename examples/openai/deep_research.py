@@ -5,25 +5,41 @@
 # This code is licensed under the MIT License.
 # See the LICENSE file in the repository for the full license text.
 
-from openai import OpenAI
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Iterable, Optional
 
+from openai import APIConnectionError, OpenAI
 
-def execute(api_key):
-    print("Starting...")
-    # Initialize the client with your API key
-    client = OpenAI(api_key=api_key)
+DEFAULT_MODEL = "o3-deep-research-2025-06-26"
+CHECKPOINT_PATH = "deep_research.checkpoint.json"
+CITATIONS_PATH = "deep_research.citations.jsonl"
 
-    # Define the agent's role and user's research question
-    system_message = """You are a professional research prparing a structured data-driven report.
+# Define the agent's role and user's research question
+SYSTEM_MESSAGE = """You are a professional research prparing a structured data-driven report.
     Focus on data-rich insights, use reliable sources, and include inline citations."""
-    user_query = (
-        "Research the economic impact of semaglutide on global healthcare systems."
-    )
+USER_QUERY = "Research the economic impact of semaglutide on global healthcare systems."
+
+# Statuses after which a background response no longer changes.
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled", "incomplete"})
+FINAL_EVENTS = frozenset({"response.completed", "response.incomplete", "response.failed"})
+
+
+class ResearchTimeoutError(TimeoutError):
+    """Raised when a background run exceeds its timeout; the run is cancelled."""
 
-    # Create the Deep Research API call
-    response = client.responses.create(
-        model="o3-deep-research-2025-06-26",
-        input=[
+
+class ResearchFailedError(RuntimeError):
+    """Raised when a background run ends as failed or cancelled."""
+
+
+def build_request(user_query: str, system_message: str = SYSTEM_MESSAGE) -> dict[str, Any]:
+    """Returns the keyword arguments of `client.responses.create` for a research question."""
+    return {
+        "model": DEFAULT_MODEL,
+        "input": [
             {
                 "role": "developer",
                 "content": [{"type": "input_text", "text": system_message}],
@@ -33,24 +49,380 @@ def execute(api_key):
                 "content": [{"type": "input_text", "text": user_query}],
             },
         ],
-        reasoning={"summary": "auto"},
-        tools=[{"type": "web_search_preview"}],
+        "reasoning": {"summary": "auto"},
+        "tools": [{"type": "web_search_preview"}],
+    }
+
+
+# --- Checkpoint ---
+
+
+def load_checkpoint(path: str) -> Optional[dict]:
+    """Returns the saved response ID and stream position, or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, response_id: str, sequence_number: Optional[int] = None) -> None:
+    # Write and rename, so a crash never leaves a truncated checkpoint behind.
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"response_id": response_id, "sequence_number": sequence_number}, f)
+    os.replace(temp_path, path)
+
+
+def clear_checkpoint(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# --- Output Indexing ---
+
+
+def citation_row(response_id: str, report: str, annotation: Any) -> dict:
+    """A URL citation as a JSON-ready dict, with the text span it supports."""
+    return {
+        "response_id": response_id,
+        "title": annotation.title,
+        "url": annotation.url,
+        "start_index": annotation.start_index,
+        "end_index": annotation.end_index,
+        "cited_text": report[annotation.start_index : annotation.end_index],
+    }
+
+
+def _citation_key(row: dict) -> tuple:
+    return row["url"], row["start_index"], row["end_index"]
+
+
+class CitationWriter:
+    """
+    Writes the citations of one run to a JSONL file as they are parsed, one object per line.
+
+    The file is opened by `start` once the run's response ID is known. A new
+    run replaces the file; a resumed run appends to it and skips the citations
+    it already holds for that response, so a restart writes each one once.
+
+    Args:
+        path: The JSONL file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.response_id: Optional[str] = None
+        self._written: set[tuple] = set()
+        self._file = None
+
+    def start(self, response_id: str, resume: bool = False) -> None:
+        """Opens the file for a run; a no-op if it is already open for that run."""
+        if self.response_id == response_id:
+            return
+        self.close()
+        self.response_id = response_id
+        self._written = set()
+        if resume:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            row = json.loads(line)
+                        except json.JSONDecodeError:
+                            break  # A truncated last line.
+                        if row.get("response_id") == response_id:
+                            self._written.add(_citation_key(row))
+            except FileNotFoundError:
+                pass
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def write(self, report: str, annotation: Any) -> Optional[dict]:
+        if self._file is None:
+            raise RuntimeError("CitationWriter.start must be called before writing")
+        row = citation_row(self.response_id, report, annotation)
+        key = _citation_key(row)
+        if key in self._written:
+            return None
+        self._written.add(key)
+        self._file.write(json.dumps(row) + "\n")
+        # Flush per line: whatever was parsed before a crash is on disk.
+        self._file.flush()
+        self.count += 1
+        return row
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "CitationWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class OutputIndex:
+    """
+    The output items of a response, grouped by type in a single pass.
+
+    Items are added as they arrive, from a stream or a finished response.
+    Citations of each message are written out when the message is added.
+
+    Args:
+        citations: Where to write citations, if anywhere.
+    """
+
+    def __init__(self, citations: Optional[CitationWriter] = None):
+        self.citations = citations
+        self.by_type: dict[str, list] = defaultdict(list)
+        self._ids: set[str] = set()
+
+    def add(self, item: Any) -> None:
+        self.extend((item,))
+
+    def extend(self, items: Iterable[Any]) -> "OutputIndex":
+        # Hot loop for responses with thousands of items: no per-item method calls.
+        by_type, ids = self.by_type, self._ids
+        for item in items:
+            # A resumed stream can replay an item; index each one once.
+            item_id = item.id
+            if item_id in ids:
+                continue
+            ids.add(item_id)
+            item_type = item.type
+            by_type[item_type].append(item)
+            if item_type == "message" and self.citations is not None:
+                self._write_citations(item)
+        return self
+
+    def _write_citations(self, message: Any) -> None:
+        for part in message.content:
+            for annotation in getattr(part, "annotations", None) or []:
+                if annotation.type == "url_citation":
+                    self.citations.write(part.text, annotation)
+
+    def start(self, response_id: str, resume: bool = False) -> None:
+        """Tells the citation writer, if any, which run the items belong to."""
+        if self.citations is not None:
+            self.citations.start(response_id, resume)
+
+    def first(self, item_type: str) -> Optional[Any]:
+        items = self.by_type.get(item_type)
+        return items[0] if items else None
+
+    @property
+    def final_text(self) -> Optional[Any]:
+        """The first text part of the last message: the report."""
+        messages = self.by_type.get("message")
+        return messages[-1].content[0] if messages else None
+
+
+# --- Background Runs ---
+
+
+def _finish(response: Any, checkpoint_path: str) -> Any:
+    clear_checkpoint(checkpoint_path)
+    if response.status in ("failed", "cancelled"):
+        error = getattr(response, "error", None)
+        message = error.message if error else response.status
+        raise ResearchFailedError(f"Response {response.id} {response.status}: {message}")
+    return response
+
+
+def _cancel(client: OpenAI, response_id: str, checkpoint_path: str, timeout: float):
+    client.responses.cancel(response_id)
+    clear_checkpoint(checkpoint_path)
+    return ResearchTimeoutError(f"Response {response_id} did not finish within {timeout:g}s")
+
+
+def _poll(
+    client: OpenAI,
+    response_id: str,
+    checkpoint_path: str,
+    deadline: float,
+    timeout: float,
+    poll_interval: float,
+    max_poll_interval: float,
+) -> Any:
+    interval = poll_interval
+    while True:
+        try:
+            response = client.responses.retrieve(response_id)
+        except APIConnectionError as e:
+            # The run goes on server-side; a dropped poll is retried after the backoff.
+            print(f"Poll failed ({e}), retrying")
+        else:
+            print(f"Status: {response.status}")
+            if response.status in TERMINAL_STATUSES:
+                return _finish(response, checkpoint_path)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _cancel(client, response_id, checkpoint_path, timeout)
+        time.sleep(min(interval, remaining))
+        # Deep research takes minutes: back off rather than poll at a fixed rate.
+        interval = min(interval * 1.5, max_poll_interval)
+
+
+def _resume_stream(client: OpenAI, response_id: str, sequence_number: Optional[int]):
+    if sequence_number is None:
+        return client.responses.retrieve(response_id, stream=True)
+    return client.responses.retrieve(response_id, stream=True, starting_after=sequence_number)
+
+
+def _stream(
+    client: OpenAI,
+    events: Iterable[Any],
+    response_id: Optional[str],
+    sequence_number: Optional[int],
+    index: OutputIndex,
+    checkpoint_path: str,
+    deadline: float,
+    timeout: float,
+    poll_interval: float,
+    max_poll_interval: float,
+) -> Any:
+    interval = poll_interval
+    while True:
+        try:
+            for event in events:
+                # The connection is making progress: reconnect promptly if it drops.
+                interval = poll_interval
+                if event.type in FINAL_EVENTS:
+                    # Normally a no-op: every item has streamed by already.
+                    index.extend(event.response.output)
+                    return _finish(event.response, checkpoint_path)
+                if event.type == "response.created":
+                    response_id = event.response.id
+                    index.start(response_id)
+                    save_checkpoint(checkpoint_path, response_id, event.sequence_number)
+                elif event.type == "response.output_item.done":
+                    index.add(event.item)
+                    print(f"Step done: {event.item.type}")
+                    # Only items matter on resume, so only checkpoint after one.
+                    save_checkpoint(checkpoint_path, response_id, event.sequence_number)
+                sequence_number = event.sequence_number
+                if time.monotonic() > deadline:
+                    raise _cancel(client, response_id, checkpoint_path, timeout)
+            if response_id is None:
+                raise ResearchFailedError("The stream ended before the response was created")
+            # The stream ended without a final event, e.g. because the run was
+            # cancelled elsewhere: ask for the status before reconnecting.
+            response = client.responses.retrieve(response_id)
+            if response.status in TERMINAL_STATUSES:
+                index.extend(response.output)
+                return _finish(response, checkpoint_path)
+            print(f"Stream ended early, resuming after event {sequence_number}")
+        except APIConnectionError as e:
+            # Includes read timeouts of an idle stream.
+            if response_id is None:
+                raise
+            print(f"Stream interrupted ({e}), resuming after event {sequence_number}")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _cancel(client, response_id, checkpoint_path, timeout)
+        # Back off like `_poll`, so a stream that keeps failing is not retried in a tight loop.
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max_poll_interval)
+        events = _resume_stream(client, response_id, sequence_number)
+
+
+def run_background(
+    client: OpenAI,
+    request: dict[str, Any],
+    index: OutputIndex,
+    checkpoint_path: str = CHECKPOINT_PATH,
+    stream: bool = False,
+    timeout: float = 3600.0,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 30.0,
+) -> Any:
+    """
+    Runs a Responses API request in background mode and returns the final response.
+
+    The response ID is saved to `checkpoint_path` as soon as it is known, so a
+    worker that crashes can be restarted and picks up the same run instead of
+    paying for a new one. With `stream`, progress events are consumed as they
+    arrive and the stream position is saved too, so a dropped connection or a
+    restart resumes after the last event seen. Otherwise the run is polled with
+    exponential backoff, which also spaces out stream reconnects.
+
+    Args:
+        client: The OpenAI client, or anything with the same `responses` API.
+        request: Keyword arguments of `client.responses.create`.
+        index: Receives the output items, as they stream or once the run is done,
+            and starts its citation writer once the response ID is known.
+        checkpoint_path: JSON file holding the response ID of the run in flight.
+        stream: Stream progress events instead of polling.
+        timeout: Seconds after which the run is cancelled.
+        poll_interval: First delay between polls, in seconds.
+        max_poll_interval: Largest delay between polls, in seconds.
+
+    Raises:
+        ResearchTimeoutError: If the run did not finish within `timeout`.
+        ResearchFailedError: If the run failed or was cancelled.
+    """
+    deadline = time.monotonic() + timeout
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint:
+        response_id = checkpoint["response_id"]
+        print(f"Resuming response {response_id}")
+        index.start(response_id, resume=True)
+        if stream:
+            events = _resume_stream(client, response_id, checkpoint.get("sequence_number"))
+            return _stream(
+                client, events, response_id, checkpoint.get("sequence_number"),
+                index, checkpoint_path, deadline, timeout, poll_interval, max_poll_interval,
+            )
+        response = _poll(
+            client, response_id, checkpoint_path, deadline, timeout,
+            poll_interval, max_poll_interval,
+        )
+        index.extend(response.output)
+        return response
+
+    if stream:
+        events = client.responses.create(**request, background=True, store=True, stream=True)
+        return _stream(
+            client, events, None, None, index, checkpoint_path, deadline, timeout,
+            poll_interval, max_poll_interval,
+        )
+
+    submitted = client.responses.create(**request, background=True, store=True)
+    save_checkpoint(checkpoint_path, submitted.id)
+    index.start(submitted.id)
+    print(f"Submitted response {submitted.id}")
+    response = _poll(
+        client, submitted.id, checkpoint_path, deadline, timeout,
+        poll_interval, max_poll_interval,
     )
+    index.extend(response.output)
+    return response
+
+
+# --- Report ---
+
 
-    # Access the print and final report from the response
-    final_report = response.output[-1].content[0].text
-    print(final_report)
+def print_report(index: OutputIndex) -> None:
+    text = index.final_text
+    if text is None:
+        print("No report found in the response.")
+        return
+    print(text.text)
 
     # --- ACESS INLINE CITATIONS AND METADATA ---
     print("--- CITATIONS ---")
-    annotations = response.output[-1].content[0].annotations
-
+    annotations = text.annotations
     if not annotations:
         print("No annotations found in the report.")
     else:
         for i, citation in enumerate(annotations):
             # The text span the citation refers to
-            cited_text = final_report[citation.start_index : citation.end_index]
+            cited_text = text.text[citation.start_index : citation.end_index]
 
             print(f"Citation {i+1}:")
             print(f" Cited Text: {cited_text}")
@@ -63,39 +435,68 @@ def execute(api_key):
     print("--- INTERNMEDIATE STEPS ---")
 
     # 1. Reasoning Steps: Internal plans and summaries generated by the model.
-    try:
-        reasoning_step = next(
-            item for item in response.output if item.type == "reasoning"
-        )
+    reasoning_step = index.first("reasoning")
+    if reasoning_step is None:
+        print("\nNo reasoning steps found.")
+    else:
         print("\n[Found a Reasoning Step]")
         for summary_part in reasoning_step.summary:
             print(f" - {summary_part.text}")
-    except StopIteration:
-        print("\nNo reasoning steps found.")
 
     # 2. Web Search Calls: The exact search queries the agent executed.
-    try:
-        search_step = next(
-            item for item in response.output if item.type == "web_search_call"
-        )
+    search_step = index.first("web_search_call")
+    if search_step is None:
+        print("\nNo web search steps found.")
+    else:
         print("\n[Found a Web Search Call]")
-        print(f" Query Executed: '{search_step.action.query}'")
+        print(f" Query Executed: '{getattr(search_step.action, 'query', None)}'")
         print(f" Status: {search_step.status}")
-    except StopIteration:
-        print("\nNo web search steps found.")
 
     # 3. Code Execution: Any code run by the agent using the code interpreter.
-    try:
-        code_step = next(
-            item for item in response.output if item.type == "code_interpreter_call"
-        )
+    code_step = index.first("code_interpreter_call")
+    if code_step is None:
+        print("\nNo code execution steps found.")
+    else:
         print("\n[Found a Code Execution Step]")
         print(" Code Input:")
-        print(f" ```python\n{code_step.input}\n ```")
+        print(f" ```python\n{code_step.code}\n ```")
         print(" Code Output:")
-        print(f" {code_step.output}")
-    except StopIteration:
-        print("\nNo code execution steps found.")
+        for output in code_step.outputs or []:
+            print(f" {getattr(output, 'logs', None) or getattr(output, 'url', '')}")
+
+
+def execute(
+    api_key: Optional[str] = None,
+    client: Optional[OpenAI] = None,
+    stream: bool = False,
+    timeout: float = 3600.0,
+    checkpoint_path: str = CHECKPOINT_PATH,
+    citations_path: str = CITATIONS_PATH,
+    poll_interval: float = 5.0,
+):
+    print("Starting...")
+    # Initialize the client with your API key
+    client = client or OpenAI(api_key=api_key)
+
+    # The Deep Research request. It runs for minutes, so it is submitted in
+    # background mode rather than holding a connection open until it is done;
+    # rerunning after a crash resumes the run saved in the checkpoint.
+    request = build_request(USER_QUERY)
+
+    with CitationWriter(citations_path) as citations:
+        index = OutputIndex(citations)
+        run_background(
+            client,
+            request,
+            index,
+            checkpoint_path=checkpoint_path,
+            stream=stream,
+            timeout=timeout,
+            poll_interval=poll_interval,
+        )
+    print_report(index)
+    print(f"{citations.count} citations written to {citations_path}")
+    return index
 
 
 # Example usage in main.py
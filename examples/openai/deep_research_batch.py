@@ -0,0 +1,375 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import asyncio
+import gzip
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from typing import IO, Any, Iterable, Iterator, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAIError
+
+from examples.openai.deep_research import (
+    TERMINAL_STATUSES,
+    OutputIndex,
+    ResearchTimeoutError,
+    build_request,
+    citation_row,
+)
+
+
+def make_client(
+    api_key: Optional[str] = None, max_connections: int = 16, timeout: float = 60.0
+) -> AsyncOpenAI:
+    """
+    Returns an async client to share across a whole batch.
+
+    Its connection pool is sized for the batch, so polling many background
+    runs reuses a few keep-alive connections instead of opening one per call.
+    Use it as `async with make_client() as client:`, or `await client.close()`
+    when done, so the pooled connections are closed.
+
+    Args:
+        api_key: OpenAI API key; $OPENAI_API_KEY if not given.
+        max_connections: Connections the pool may open at once.
+        timeout: Timeout of a single HTTP request, in seconds.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=DefaultAsyncHttpxClient(limits=limits, timeout=timeout),
+    )
+
+
+# --- Input and Output ---
+
+
+def read_questions(path: str, field: str = "query") -> Iterator[dict]:
+    """
+    Lazily reads research questions from a JSONL file, one line at a time.
+
+    Each line is either a JSON object containing `field` (and optionally an
+    "id") or a bare JSON string. Questions without an ID are numbered by line,
+    so the file must not be reordered between a run and its resume.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    record = {field: record}
+                record.setdefault("id", str(number))
+                yield {"id": str(record["id"]), "query": record[field]}
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    # A ".gz" suffix selects gzip; appending to it adds a gzip member per session.
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def recover_output(path: str) -> set[str]:
+    """
+    Returns the IDs of the questions already in an output file.
+
+    A run that was killed can leave a truncated last record (or, with gzip, a
+    member without its trailer), which would also hide everything appended
+    after it. In that case the file is rewritten with the complete records.
+    """
+    if not os.path.exists(path):
+        return set()
+    done, records, truncated = set(), [], False
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    truncated = True
+                    break
+                done.add(record["id"])
+                records.append(line if line.endswith("\n") else line + "\n")
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            truncated = True
+    if truncated:
+        # Keep the suffix, which selects the compression.
+        directory, name = os.path.split(path)
+        temp_path = os.path.join(directory, ".recover-" + name)
+        with _open(temp_path, "w") as f:
+            f.writelines(records)
+        os.replace(temp_path, path)
+    return done
+
+
+class PendingLog:
+    """
+    The response IDs of submitted runs, appended to a sidecar JSONL file.
+
+    A resumed batch polls these runs instead of submitting their questions again.
+
+    Args:
+        path: The JSONL file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict[str, str]:
+        pending = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # A truncated last line.
+                    pending[entry["id"]] = entry["response_id"]
+        except FileNotFoundError:
+            pass
+        return pending
+
+    def add(self, question_id: str, response_id: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": question_id, "response_id": response_id}) + "\n")
+
+    def clear(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _step(item: Any) -> dict:
+    match item.type:
+        case "reasoning":
+            return {"type": item.type, "summary": [part.text for part in item.summary]}
+        case "web_search_call":
+            return {"type": item.type, "query": getattr(item.action, "query", None), "status": item.status}
+        case "code_interpreter_call":
+            outputs = [getattr(o, "logs", None) or getattr(o, "url", None) for o in item.outputs or []]
+            return {"type": item.type, "code": item.code, "outputs": outputs}
+        case _:
+            return {"type": item.type}
+
+
+def to_record(question: dict, response: Any) -> dict:
+    """The output line of a finished run: report, citations and intermediate steps."""
+    index = OutputIndex().extend(response.output)
+    text = index.final_text
+    report = text.text if text is not None else None
+    citations = [
+        citation_row(response.id, report, annotation)
+        for annotation in (text.annotations if text is not None else [])
+        if annotation.type == "url_citation"
+    ]
+    steps = [
+        _step(item)
+        for item_type, items in index.by_type.items()
+        if item_type != "message"
+        for item in items
+    ]
+    return {
+        **question,
+        "response_id": response.id,
+        "status": response.status,
+        "report": report,
+        "citations": citations,
+        "steps": steps,
+    }
+
+
+# --- Batch ---
+
+
+@dataclass
+class BatchStats:
+    questions: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    errors: int = 0
+    skipped: int = 0
+    resumed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def questions_per_minute(self) -> float:
+        return 60 * self.questions / self.elapsed if self.elapsed else 0.0
+
+
+async def _poll(
+    client: AsyncOpenAI,
+    response_id: str,
+    deadline: float,
+    poll_interval: float,
+    max_poll_interval: float,
+) -> Any:
+    interval = poll_interval
+    while True:
+        response = await client.responses.retrieve(response_id)
+        if response.status in TERMINAL_STATUSES:
+            return response
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            await client.responses.cancel(response_id)
+            raise ResearchTimeoutError(f"Response {response_id} did not finish in time")
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max_poll_interval)
+
+
+async def _research(
+    client: AsyncOpenAI,
+    question: dict,
+    response_id: Optional[str],
+    pending: PendingLog,
+    timeout: float,
+    poll_interval: float,
+    max_poll_interval: float,
+) -> dict:
+    deadline = time.monotonic() + timeout
+    if response_id is None:
+        submitted = await client.responses.create(
+            **build_request(question["query"]), background=True, store=True
+        )
+        response_id = submitted.id
+        pending.add(question["id"], response_id)
+    try:
+        response = await _poll(client, response_id, deadline, poll_interval, max_poll_interval)
+    except ResearchTimeoutError as e:
+        return {**question, "response_id": response_id, "status": "timed_out", "error": str(e)}
+    record = to_record(question, response)
+    if response.status == "failed" and response.error:
+        record["error"] = response.error.message
+    return record
+
+
+async def run_batch(
+    client: AsyncOpenAI,
+    questions: Iterable[dict],
+    output_path: str,
+    concurrency: int = 8,
+    timeout: float = 3600.0,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 30.0,
+    stats: Optional[BatchStats] = None,
+) -> BatchStats:
+    """
+    Researches a stream of questions concurrently and appends one JSON line per question.
+
+    At most `concurrency` runs are in flight, all on the one shared client, and
+    questions are pulled from the iterable as slots free up. Each record is
+    written and flushed as soon as its run finishes, to JSONL or, for a path
+    ending in ".gz", gzip-compressed JSONL.
+
+    Running the same batch again resumes it: questions already in the output
+    are skipped, and runs that were submitted but not written out (their
+    response IDs are kept in "<output_path>.pending.jsonl") are polled rather
+    than submitted again.
+
+    Args:
+        client: Shared async client, e.g. from `make_client`.
+        questions: {"id": ..., "query": ...} dicts; see `read_questions`.
+        output_path: The JSONL (or .jsonl.gz) output file.
+        concurrency: Maximum number of runs in flight.
+        timeout: Seconds after which a run is cancelled and recorded as timed out.
+        poll_interval: First delay between polls of a run, in seconds.
+        max_poll_interval: Largest delay between polls, in seconds.
+        stats: Optional BatchStats updated as runs finish.
+    """
+    stats = stats if stats is not None else BatchStats()
+    done = recover_output(output_path)
+    pending = PendingLog(output_path + ".pending.jsonl")
+    submitted = pending.load()
+    start = time.perf_counter()
+    window: set[asyncio.Task] = set()
+    output = _open(output_path, "a")
+
+    def record(task: asyncio.Task) -> None:
+        stats.questions += 1
+        stats.elapsed = time.perf_counter() - start
+        try:
+            result = task.result()
+        except OpenAIError as e:
+            # Not written out, so a resume tries the question again.
+            stats.errors += 1
+            print(f"Error: {e}")
+            return
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        match result["status"]:
+            case "completed" | "incomplete":
+                stats.completed += 1
+            case "timed_out":
+                stats.timed_out += 1
+            case _:
+                stats.failed += 1
+
+    async def drain(until: int) -> None:
+        nonlocal window
+        while len(window) > until:
+            finished, window = await asyncio.wait(window, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                record(task)
+
+    try:
+        for question in questions:
+            if question["id"] in done:
+                stats.skipped += 1
+                continue
+            response_id = submitted.get(question["id"])
+            stats.resumed += response_id is not None
+            window.add(
+                asyncio.create_task(
+                    _research(
+                        client, question, response_id, pending,
+                        timeout, poll_interval, max_poll_interval,
+                    )
+                )
+            )
+            await drain(concurrency - 1)
+        await drain(0)
+    finally:
+        # Cancel outstanding work if the batch stops early; their runs stay pending.
+        for task in window:
+            task.cancel()
+        output.close()
+    if stats.errors == 0:
+        pending.clear()
+    return stats
+
+
+async def execute_batch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    client: Optional[AsyncOpenAI] = None,
+    concurrency: int = 8,
+    poll_interval: float = 5.0,
+) -> BatchStats:
+    """
+    Researches every question of a JSONL file; see `run_batch`.
+
+    The output defaults to "<input>.results.jsonl.gz" next to the input file.
+    A client created here is closed when the batch ends; a given one is left open.
+    """
+    output_path = output_path or os.path.splitext(input_path)[0] + ".results.jsonl.gz"
+    if client is None:
+        async with make_client(max_connections=concurrency) as client:
+            return await execute_batch(input_path, output_path, client, concurrency, poll_interval)
+    stats = await run_batch(
+        client, read_questions(input_path), output_path, concurrency, poll_interval=poll_interval
+    )
+    print(
+        f"\n--- Researched {stats.questions} questions ({stats.completed} completed, "
+        f"{stats.failed} failed, {stats.timed_out} timed out, {stats.errors} errors, "
+        f"{stats.skipped} already done, {stats.resumed} resumed) in {stats.elapsed:.2f}s: "
+        f"{stats.questions_per_minute:.1f} questions/min ---"
+    )
+    print(f"Results written to {output_path}")
+    return stats
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+from dataclasses import dataclass
+from typing import Iterable
+
+
+def percentile(samples: Iterable[float], pct: float) -> float:
+    """
+    Returns the `pct` percentile of `samples` using linear interpolation.
+
+    Args:
+        samples: The observed values.
+        pct: The percentile to compute, between 0 and 100.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class LatencySummary:
+    """Percentile summary of a set of latency samples, in seconds."""
+
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[float]) -> "LatencySummary":
+        values = list(samples)
+        if not values:
+            return cls(count=0, mean=0.0, p50=0.0, p95=0.0, p99=0.0, max=0.0)
+        return cls(
+            count=len(values),
+            mean=sum(values) / len(values),
+            p50=percentile(values, 50),
+            p95=percentile(values, 95),
+            p99=percentile(values, 99),
+            max=max(values),
+        )
+
+    def format(self) -> str:
+        return (
+            f"n={self.count} mean={self.mean * 1000:.1f}ms "
+            f"p50={self.p50 * 1000:.1f}ms p95={self.p95 * 1000:.1f}ms "
+            f"p99={self.p99 * 1000:.1f}ms max={self.max * 1000:.1f}ms"
+        )
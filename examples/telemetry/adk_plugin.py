@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from opentelemetry import trace
+
+from examples.langchain.context import count_tokens
+from examples.telemetry.tracing import AGENT, FRAMEWORK, OPERATION, TOOL, record_usage
+
+
+def _text(contents) -> str:
+    return "\n".join(
+        part.text for content in contents or [] for part in content.parts or [] if part.text
+    )
+
+
+class TelemetryPlugin(BasePlugin):
+    """
+    Adds token counts, cost and names to the spans ADK already creates.
+
+    ADK traces every agent run, model call and tool call through the global
+    tracer provider. Its callbacks run inside those spans, so this plugin
+    annotates them instead of opening a second set: the result has the same
+    attributes as the spans of the LangChain handler.
+
+    Register it with `RunnerRegistry.add_plugin`, or pass it to a Runner.
+    """
+
+    def __init__(self, name: str = "telemetry"):
+        super().__init__(name=name)
+        # Model name and prompt estimate per running agent, from before_model to after_model.
+        self._requests: dict[tuple[str, str], tuple[Optional[str], int]] = {}
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        span = trace.get_current_span()
+        span.set_attribute(FRAMEWORK, "adk")
+        span.set_attribute(OPERATION, "invoke_agent")
+        span.set_attribute(AGENT, agent.name)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._requests[key] = (llm_request.model, count_tokens(_text(llm_request.contents)))
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            return
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        model, prompt_tokens = self._requests.pop(key, (None, 0))
+        span = trace.get_current_span()
+        span.set_attribute(FRAMEWORK, "adk")
+        span.set_attribute(OPERATION, "chat")
+        span.set_attribute(AGENT, callback_context.agent_name)
+        usage = llm_response.usage_metadata
+        if usage is not None and usage.prompt_token_count is not None:
+            record_usage(
+                span, model, usage.prompt_token_count, usage.candidates_token_count or 0
+            )
+        else:
+            output = _text([llm_response.content] if llm_response.content else [])
+            record_usage(span, model, prompt_tokens, count_tokens(output), estimated=True)
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> None:
+        self._requests.pop((callback_context.invocation_id, callback_context.agent_name), None)
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        span = trace.get_current_span()
+        span.set_attribute(FRAMEWORK, "adk")
+        span.set_attribute(OPERATION, "execute_tool")
+        span.set_attribute(TOOL, tool.name)
+        span.set_attribute(AGENT, tool_context.agent_name)
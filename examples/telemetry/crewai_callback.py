@@ -0,0 +1,61 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from examples.langchain.context import count_tokens
+from examples.telemetry.tracing import FRAMEWORK, OPERATION, TOOL, get_tracer, record_usage
+
+# Importing crewai installs its own tracer provider, so only import it for typing.
+if TYPE_CHECKING:
+    from crewai import Crew
+
+
+class CrewStepTracer:
+    """
+    A CrewAI step callback that records one span per agent step.
+
+    CrewAI calls the step callback after every step of an agent: one model call,
+    plus the tool run if the model chose an action. Each span covers the time
+    since the previous step (or the kickoff) of the same thread. The callback
+    only sees the model output, so output tokens are estimated from it and
+    input tokens are not counted.
+
+    Args:
+        model: Model name used for the cost estimate, e.g. "claude-sonnet-4-5".
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model
+        self.tracer = get_tracer()
+        self._last = threading.local()
+
+    def instrument(self, crew: "Crew") -> "Crew":
+        """Installs the tracer as the crew's step callback and marks each kickoff."""
+        if crew.step_callback is not self:
+            crew.step_callback = self
+            crew.before_kickoff_callbacks.append(self._kickoff)
+        return crew
+
+    def mark(self) -> None:
+        """Starts the next step span of this thread now, e.g. before a kickoff."""
+        self._last.time = time.time_ns()
+
+    def _kickoff(self, inputs: Optional[dict]) -> Optional[dict]:
+        self.mark()
+        return inputs
+
+    def __call__(self, step: Any) -> None:
+        now = time.time_ns()
+        start = getattr(self._last, "time", None) or now
+        self._last.time = now
+        attributes = {FRAMEWORK: "crewai", OPERATION: "agent_step"}
+        if tool := getattr(step, "tool", None):  # An AgentAction rather than an AgentFinish.
+            attributes[TOOL] = tool
+        span = self.tracer.start_span("agent_step", start_time=start, attributes=attributes)
+        record_usage(span, self.model, 0, count_tokens(getattr(step, "text", "") or ""), True)
+        span.end(end_time=now)
@@ -0,0 +1,35 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+from typing import Optional
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from examples.google.runners import registry
+from examples.telemetry.adk_plugin import TelemetryPlugin
+from examples.telemetry.crewai_callback import CrewStepTracer
+from examples.telemetry.langchain_handler import instrument_langchain
+from examples.telemetry.tracing import configure_tracing
+
+# Pass as a crew's step callback, or install with `crew_tracer.instrument(crew)`.
+crew_tracer = CrewStepTracer()
+
+
+def instrument(path: Optional[str] = None, console: bool = False) -> TracerProvider:
+    """
+    Traces every framework in the examples to a local JSONL file or the console.
+
+    LangChain runs are traced through a configure hook and ADK runners of the
+    shared registry through a plugin. CrewAI offers no global hook, so crews
+    opt in through `crew_tracer`.
+
+    Args:
+        path: JSONL file the spans are appended to; see `tracing.print_breakdown`.
+        console: Also print every span to stdout.
+    """
+    provider = configure_tracing(path, console)
+    instrument_langchain()
+    registry.add_plugin(TelemetryPlugin())
+    return provider
@@ -0,0 +1,177 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import threading
+from contextvars import ContextVar
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+from examples.langchain.context import count_tokens
+from examples.telemetry.tracing import (
+    FRAMEWORK,
+    OPERATION,
+    TOOL,
+    get_tracer,
+    record_usage,
+)
+
+
+def _model_name(kwargs: dict[str, Any]) -> Optional[str]:
+    params = kwargs.get("invocation_params") or {}
+    metadata = kwargs.get("metadata") or {}
+    return params.get("model") or params.get("model_name") or metadata.get("ls_model_name")
+
+
+class OTelCallbackHandler(BaseCallbackHandler):
+    """
+    Turns LangChain runs into OpenTelemetry spans.
+
+    Chains, chat model calls and tool calls each get a span, nested like the
+    runs themselves. Model spans carry token counts and an estimated cost;
+    agent steps are recorded as events on the agent's span. Runs without a
+    parent attach to the current span, e.g. a `pattern_span`.
+    """
+
+    # Span bookkeeping is cheap, so run it on the calling thread even for async runs.
+    run_inline = True
+
+    def __init__(self, tracer: Optional[trace.Tracer] = None):
+        self.tracer = tracer or get_tracer()
+        self._spans: dict[UUID, trace.Span] = {}
+        self._prompt_tokens: dict[UUID, int] = {}
+        self._models: dict[UUID, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _start(
+        self, run_id: UUID, parent_run_id: Optional[UUID], name: str, attributes: dict
+    ) -> None:
+        with self._lock:
+            parent = self._spans.get(parent_run_id) if parent_run_id else None
+        context = trace.set_span_in_context(parent) if parent else None
+        span = self.tracer.start_span(
+            name, context=context, attributes={FRAMEWORK: "langchain", **attributes}
+        )
+        with self._lock:
+            self._spans[run_id] = span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[trace.Span]:
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+            self._prompt_tokens.pop(run_id, None)
+            self._models.pop(run_id, None)
+        if span is not None:
+            if error is not None:
+                span.record_exception(error)
+                span.set_status(Status(StatusCode.ERROR, str(error)))
+            span.end()
+        return span
+
+    # --- Chains ---
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        self._start(run_id, parent_run_id, f"chain {name}", {OPERATION: "chain"})
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, error)
+
+    def on_agent_action(self, action: AgentAction, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            span = self._spans.get(run_id)
+        if span is not None:
+            span.add_event("agent_step", {TOOL: action.tool, "tool_input": str(action.tool_input)[:200]})
+
+    # --- Models ---
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs
+    ) -> None:
+        model = _model_name(kwargs)
+        self._start(run_id, parent_run_id, f"chat {model or 'model'}", {OPERATION: "chat"})
+        with self._lock:
+            self._models[run_id] = model
+            self._prompt_tokens[run_id] = sum(
+                count_tokens(str(message.content)) for batch in messages for message in batch
+            )
+
+    def on_llm_start(
+        self, serialized, prompts, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs
+    ) -> None:
+        model = _model_name(kwargs)
+        self._start(run_id, parent_run_id, f"chat {model or 'model'}", {OPERATION: "chat"})
+        with self._lock:
+            self._models[run_id] = model
+            self._prompt_tokens[run_id] = sum(count_tokens(prompt) for prompt in prompts)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            span = self._spans.get(run_id)
+            model = self._models.get(run_id)
+            prompt_tokens = self._prompt_tokens.get(run_id, 0)
+        if span is not None:
+            input_tokens = output_tokens = 0
+            estimated = False
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                    if usage:
+                        input_tokens += usage["input_tokens"]
+                        output_tokens += usage["output_tokens"]
+                    else:
+                        # The provider reported nothing (e.g. a stub); estimate instead.
+                        estimated = True
+                        input_tokens += prompt_tokens
+                        output_tokens += count_tokens(generation.text)
+            record_usage(span, model, input_tokens, output_tokens, estimated)
+        self._end(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, error)
+
+    # --- Tools ---
+
+    def on_tool_start(
+        self, serialized, input_str, *, run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(
+            run_id, parent_run_id, f"execute_tool {name}", {OPERATION: "execute_tool", TOOL: name}
+        )
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._end(run_id, error)
+
+
+_handler: ContextVar[Optional[OTelCallbackHandler]] = ContextVar(
+    "otel_callback_handler", default=None
+)
+register_configure_hook(_handler, inheritable=True)
+
+
+def instrument_langchain(handler: Optional[OTelCallbackHandler] = None) -> OTelCallbackHandler:
+    """
+    Adds `handler` to every LangChain run started from the current context.
+
+    Like LangSmith's tracing, this needs no changes to the chains themselves.
+    Call it before `asyncio.run` or starting threads so they inherit it.
+    """
+    handler = handler or OTelCallbackHandler()
+    _handler.set(handler)
+    return handler
@@ -0,0 +1,254 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+TRACER_NAME = "examples.telemetry"
+
+# --- Span Attributes ---
+# The gen_ai.* names follow the OpenTelemetry GenAI semantic conventions, which
+# ADK's own spans use too, so spans from every framework can be aggregated alike.
+
+OPERATION = "gen_ai.operation.name"
+MODEL = "gen_ai.request.model"
+INPUT_TOKENS = "gen_ai.usage.input_tokens"
+OUTPUT_TOKENS = "gen_ai.usage.output_tokens"
+COST = "gen_ai.usage.cost_usd"
+ESTIMATED = "gen_ai.usage.estimated"
+TOOL = "gen_ai.tool.name"
+AGENT = "gen_ai.agent.name"
+FRAMEWORK = "framework"
+PATTERN = "pattern.name"
+WARMUP = "pattern.warmup"
+
+# --- Cost ---
+
+# USD per million (input, output) tokens, matched by the longest model name prefix.
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "claude-sonnet-4-5": (3.00, 15.00),
+    "claude-haiku-4-5": (1.00, 5.00),
+    "claude-opus-4-1": (15.00, 75.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+
+def estimate_cost(model: Optional[str], input_tokens: int, output_tokens: int) -> Optional[float]:
+    """
+    Returns the list-price cost of a model call in USD, or None for unknown models.
+
+    Args:
+        model: The model name; a provider prefix such as "anthropic/" is ignored.
+        input_tokens: Prompt tokens.
+        output_tokens: Completion tokens.
+    """
+    if not model:
+        return None
+    name = model.rsplit("/", 1)[-1]
+    prefixes = [prefix for prefix in MODEL_PRICES if name.startswith(prefix)]
+    if not prefixes:
+        return None
+    input_price, output_price = MODEL_PRICES[max(prefixes, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def record_usage(
+    span: trace.Span,
+    model: Optional[str],
+    input_tokens: int,
+    output_tokens: int,
+    estimated: bool = False,
+) -> None:
+    """
+    Sets the token counts and estimated cost of a model call on its span.
+
+    Args:
+        span: The span of the model call.
+        model: The model name, used to look up its price.
+        input_tokens: Prompt tokens.
+        output_tokens: Completion tokens.
+        estimated: Whether the counts were estimated locally rather than
+            reported by the provider.
+    """
+    if model:
+        span.set_attribute(MODEL, model)
+    span.set_attribute(INPUT_TOKENS, input_tokens)
+    span.set_attribute(OUTPUT_TOKENS, output_tokens)
+    span.set_attribute(ESTIMATED, estimated)
+    cost = estimate_cost(model, input_tokens, output_tokens)
+    if cost is not None:
+        span.set_attribute(COST, cost)
+
+
+# --- Export ---
+
+
+def _span_record(span: ReadableSpan) -> dict:
+    parent = span.parent
+    return {
+        "name": span.name,
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(parent.span_id, "016x") if parent else None,
+        "start": span.start_time / 1e9,
+        "duration": (span.end_time - span.start_time) / 1e9,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends one JSON object per finished span to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(_span_record(span), default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def configure_tracing(
+    path: Optional[str] = None, console: bool = False, service_name: str = "agentic-patterns"
+) -> TracerProvider:
+    """
+    Installs a global tracer provider that exports spans locally, without a collector.
+
+    ADK traces through the global provider as well, so its spans land in the
+    same file. Call `shutdown()` on the returned provider to flush before exit.
+
+    Args:
+        path: JSONL file the spans are appended to.
+        console: Also print every span to stdout.
+        service_name: The service.name resource attribute.
+    """
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if path:
+        provider.add_span_processor(BatchSpanProcessor(JsonlSpanExporter(path)))
+    if console:
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def get_tracer() -> trace.Tracer:
+    return trace.get_tracer(TRACER_NAME)
+
+
+@contextmanager
+def pattern_span(name: str, warmup: bool = False) -> Iterator[trace.Span]:
+    """
+    Runs the block under a root span that attributes its model and tool spans to a pattern.
+
+    Args:
+        name: The pattern name.
+        warmup: Mark the run as a warmup, which the breakdown leaves out.
+    """
+    attributes = {PATTERN: name, WARMUP: warmup}
+    with get_tracer().start_as_current_span(f"pattern {name}", attributes=attributes) as span:
+        yield span
+
+
+# --- Breakdown ---
+
+
+@dataclass
+class PatternBreakdown:
+    """Totals of the traces of one pattern."""
+
+    pattern: str
+    runs: int = 0
+    wall: float = 0.0
+    model_calls: int = 0
+    model_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    tool_calls: int = 0
+    tool_time: float = 0.0
+
+
+def breakdown(path: str) -> list[PatternBreakdown]:
+    """
+    Aggregates the spans of a JSONL trace file per pattern.
+
+    Each trace is attributed to the pattern of its root span; traces without
+    one are grouped under "(none)", and warmup runs are left out.
+    """
+    with open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    patterns = {}
+    for span in spans:
+        if span["parent_id"] is None:
+            attributes = span["attributes"]
+            patterns[span["trace_id"]] = (
+                None if attributes.get(WARMUP) else attributes.get(PATTERN, "(none)")
+            )
+
+    totals: dict[str, PatternBreakdown] = {}
+    for span in spans:
+        name = patterns.get(span["trace_id"], "(none)")
+        if name is None:
+            continue
+        total = totals.setdefault(name, PatternBreakdown(pattern=name))
+        attributes = span["attributes"]
+        if span["parent_id"] is None:
+            total.runs += 1
+            total.wall += span["duration"]
+        match attributes.get(OPERATION):
+            # A CrewAI agent step is one model call, plus the tool it chose.
+            case "chat" | "agent_step":
+                total.model_calls += 1
+                total.model_time += span["duration"]
+                total.input_tokens += attributes.get(INPUT_TOKENS, 0)
+                total.output_tokens += attributes.get(OUTPUT_TOKENS, 0)
+                total.cost += attributes.get(COST, 0.0)
+            # ADK wraps parallel tool calls in an extra span; count each call once.
+            case "execute_tool" if attributes.get(TOOL) != "(merged tools)":
+                total.tool_calls += 1
+                total.tool_time += span["duration"]
+    return sorted(totals.values(), key=lambda total: total.pattern)
+
+
+def print_breakdown(path: str) -> None:
+    print(
+        f"\n{'pattern':<26} {'runs':>5} {'wall':>9} {'calls':>6} {'model':>9} "
+        f"{'tokens in':>10} {'out':>8} {'cost':>10} {'tools':>6} {'tool time':>10}"
+    )
+    print("-" * 108)
+    for total in breakdown(path):
+        runs = total.runs or 1
+        print(
+            f"{total.pattern:<26} {total.runs:>5} {total.wall / runs * 1000:>7.1f}ms "
+            f"{total.model_calls / runs:>6.1f} {total.model_time / runs * 1000:>7.1f}ms "
+            f"{total.input_tokens / runs:>10.0f} {total.output_tokens / runs:>8.0f} "
+            f"${total.cost / runs:>9.5f} {total.tool_calls / runs:>6.1f} "
+            f"{total.tool_time / runs * 1000:>8.1f}ms"
+        )
+    print("Per run averages. Tokens and cost are estimates where the provider reported none.")
@@ -1,10 +1,18 @@
+import argparse
 import asyncio
+import importlib
+import inspect
 import os
+from dataclasses import dataclass
 from enum import Enum
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Optional
 from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from examples.crewai.multi_agent import execute
+
+# Framework imports are deferred to the functions that need them, so that
+# running one pattern does not pay the import cost of every framework.
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
 
 load_dotenv()
 
@@ -12,22 +20,37 @@ load_dotenv()
 class Provider(Enum):
     ANTHROPIC = "anthropic"
     OPENAI = "openai"
+    STUB = "stub"
 
 
-def retrieve_langchain_llm(provider: Provider = Provider.ANTHROPIC):
-    # Initialize the LLM
+def retrieve_langchain_llm(
+    provider: Provider = Provider.ANTHROPIC, cache: Optional["BaseCache"] = None
+):
+    # Initialize the LLM.
+    # Pass a cache (e.g. examples.langchain.cache.TieredLLMCache) to reuse responses for identical prompts.
     llm = None
     try:
         match provider:
             case Provider.ANTHROPIC:
+                from langchain_anthropic import ChatAnthropic
+
                 llm = ChatAnthropic(
                     model="claude-sonnet-4-5-20250929",
                     api_key=os.getenv("ANTHROPIC_API_KEY"),
                     temperature=0,
+                    cache=cache,
                 )
                 print(f"Language model intialized: {llm.model}")
             case Provider.OPENAI:
-                llm = ChatOpenAI(model="gpt-4-turbo")
+                from langchain_openai import ChatOpenAI
+
+                llm = ChatOpenAI(model="gpt-4-turbo", cache=cache)
+                print(f"Language model initialized: {llm.model_name}")
+            case Provider.STUB:
+                # Deterministic offline model with simulated latency, used for benchmarks.
+                from examples.benchmark.stubs import StubModel
+
+                llm = StubModel().langchain(cache=cache)
                 print(f"Language model initialized: {llm.model_name}")
             case _:
                 raise ValueError(f"Unknown provider: {provider}")
@@ -36,8 +59,623 @@ def retrieve_langchain_llm(provider: Provider = Provider.ANTHROPIC):
     return llm
 
 
+def retrieve_hedged_langchain_llm(
+    primary: Provider = Provider.ANTHROPIC,
+    backup: Provider = Provider.OPENAI,
+    hedge_percentile: float = 95.0,
+):
+    # Send each call to the primary provider and, if it is slower than its usual
+    # `hedge_percentile` latency, to the backup as well; the first answer wins.
+    primary_llm = retrieve_langchain_llm(primary)
+    backup_llm = retrieve_langchain_llm(backup)
+    if primary_llm is None or backup_llm is None:
+        # Hedging needs both providers; fall back to whichever one is available.
+        return primary_llm or backup_llm
+
+    from examples.langchain.hedging import HedgedChatModel
+
+    return HedgedChatModel(
+        primary=primary_llm, backup=backup_llm, hedge_percentile=hedge_percentile
+    )
+
+
+def retrieve_load_balanced_langchain_llm(
+    providers: tuple[Provider, ...] = (Provider.ANTHROPIC, Provider.OPENAI),
+):
+    # Route each call to the fastest healthy provider, failing over to the
+    # others. Providers that fail to initialize are left out.
+    models = {}
+    for provider in providers:
+        llm = retrieve_langchain_llm(provider)
+        if llm is not None:
+            models[provider.value] = llm
+    if len(models) < 2:
+        return next(iter(models.values()), None)
+
+    from examples.langchain.load_balancer import LoadBalancedChatModel
+
+    return LoadBalancedChatModel(models=models)
+
+
+def retrieve_crewai_llm(provider: Provider = Provider.ANTHROPIC):
+    # CrewAI agents take their own LLM type rather than a LangChain chat model.
+    match provider:
+        case Provider.ANTHROPIC:
+            from crewai import LLM
+
+            return LLM(model="anthropic/claude-sonnet-4-5-20250929", temperature=0)
+        case Provider.OPENAI:
+            from crewai import LLM
+
+            return LLM(model="gpt-4-turbo")
+        case Provider.STUB:
+            from examples.benchmark.stubs import StubModel
+
+            return StubModel().crewai()
+        case _:
+            raise ValueError(f"Unknown provider: {provider}")
+
+
+# --- Pattern Registry ---
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """
+    A runnable example.
+
+    Args:
+        module: Dotted path of the module, imported only when the pattern is run.
+        run: Called with the imported module and the CLI arguments. May return a coroutine.
+        description: One line shown by `python main.py list`.
+        query: Default user query for patterns that take one.
+    """
+
+    module: str
+    run: Callable[[ModuleType, argparse.Namespace], Any]
+    description: str
+    query: str = ""
+
+
+def _run_prompt_chaining(module, args):
+    module.execute(retrieve_langchain_llm(args.provider))
+
+
+async def _run_prompt_chaining_batch(module, args):
+    if not args.input:
+        print("ERROR: The prompt_chaining_batch pattern requires --input <file.jsonl>.")
+        return
+    await module.execute_batch(
+        retrieve_langchain_llm(args.provider), args.input, args.output
+    )
+
+
+def _run_routing(module, args):
+    module.execute(retrieve_langchain_llm(args.provider))
+
+
+async def _run_parallelization(module, args):
+    await module.execute(retrieve_langchain_llm(args.provider), args.query)
+
+
+async def _run_parallelization_streaming(module, args):
+    await module.execute_streaming(retrieve_langchain_llm(args.provider), args.query)
+
+
+def _run_reflection(module, args):
+    module.run_reflection_loop(retrieve_langchain_llm(args.provider))
+
+
+async def _run_reflection_speculative(module, args):
+    candidate = await module.arun_speculative_reflection(
+        retrieve_langchain_llm(args.provider)
+    )
+    if candidate:
+        print("\nFinal code:\n" + candidate.code)
+
+
+async def _run_tools(module, args):
+    llm = retrieve_langchain_llm(args.provider)
+    if llm:
+        agent_executor = module.setup(llm)
+        queries = [
+            "What is the capital of France?",
+            "What is the weather like in London?",
+            "Tell me something about dogs.",  # Should trigger the default tool response
+        ]
+        # Stay within typical provider quotas instead of firing every query at once.
+        await module.run_agent_queries(
+            agent_executor,
+            queries,
+            concurrency=4,
+            requests_per_minute=50,
+            tokens_per_minute=40_000,
+        )
+
+
+def _crew_tracer(args):
+    # CrewAI has no global hook, so traced runs hand the step tracer to each crew.
+    if not getattr(args, "trace", None):
+        return None
+    from examples.telemetry.instrument import crew_tracer
+
+    crew_tracer.mark()
+    return crew_tracer
+
+
+def _run_planning(module, args):
+    module.execute(retrieve_crewai_llm(args.provider), step_callback=_crew_tracer(args))
+
+
+def _blog_crew_factory(module, args, verbose: bool = True):
+    # The crew uses Gemini unless the stub provider is selected.
+    llm = retrieve_crewai_llm(args.provider) if args.provider == Provider.STUB else None
+    tracer = _crew_tracer(args)
+    return module.BlogCrewFactory(
+        llm, verbose=verbose, instrument=tracer.instrument if tracer else None
+    )
+
+
+def _run_multi_agent(module, args):
+    module.execute(_blog_crew_factory(module, args), args.query or module.DEFAULT_TOPIC)
+
+
+async def _run_multi_agent_batch(module, args):
+    if not args.input:
+        print("ERROR: The multi_agent_batch pattern requires --input <topics.jsonl>.")
+        return
+    await module.execute_batch(
+        module.read_topics(args.input),
+        _blog_crew_factory(module, args, verbose=False),
+        args.output,
+    )
+
+
+def _run_deep_research(module, args):
+    stream = getattr(args, "stream", False)
+    if args.provider == Provider.STUB:
+        # A local stand-in for the Responses API that finishes in seconds.
+        from examples.benchmark.stub_openai import StubOpenAI
+
+        module.execute(client=StubOpenAI(), stream=stream, poll_interval=0.5)
+        return
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("ERROR: The OPENAI_API_KEY environment variable is not set.")
+        return
+    module.execute(api_key, stream=stream)
+
+
+async def _run_deep_research_batch(module, args):
+    if not args.input:
+        print("ERROR: The deep_research_batch pattern requires --input <questions.jsonl>.")
+        return
+    client = None
+    if args.provider == Provider.STUB:
+        from examples.benchmark.stub_openai import AsyncStubOpenAI
+
+        client = AsyncStubOpenAI()
+    elif not os.getenv("OPENAI_API_KEY"):
+        print("ERROR: The OPENAI_API_KEY environment variable is not set.")
+        return
+    await module.execute_batch(
+        args.input, args.output, client, poll_interval=0.5 if client else 5.0
+    )
+
+
+async def _run_adk_routing(module, args):
+    await module.execute()
+
+
+async def _run_adk_tool(module, args):
+    await module.call_agent(args.query)
+
+
+async def _run_adk_agent(module, args):
+    from examples.google.runners import run_agent
+
+    print(await run_agent(module.root_agent, args.query))
+
+
+PATTERNS: dict[str, Pattern] = {
+    "prompt_chaining": Pattern(
+        "examples.langchain.prompt_chaining",
+        _run_prompt_chaining,
+        "LangChain: extract specifications, then transform them to JSON.",
+    ),
+    "prompt_chaining_batch": Pattern(
+        "examples.langchain.prompt_chaining",
+        _run_prompt_chaining_batch,
+        "LangChain: run the prompt chain over a JSONL file of descriptions.",
+    ),
+    "routing": Pattern(
+        "examples.langchain.routing",
+        _run_routing,
+        "LangChain: route requests to booking or info handlers.",
+    ),
+    "parallelization": Pattern(
+        "examples.langchain.parallelization",
+        _run_parallelization,
+        "LangChain: run independent chains in parallel and synthesize.",
+        query="The history of space exploration",
+    ),
+    "parallelization_streaming": Pattern(
+        "examples.langchain.parallelization",
+        _run_parallelization_streaming,
+        "LangChain: stream the synthesis and time each parallel branch.",
+        query="The history of space exploration",
+    ),
+    "reflection": Pattern(
+        "examples.langchain.reflection",
+        _run_reflection,
+        "LangChain: generate and critique code in a reflection loop.",
+    ),
+    "reflection_speculative": Pattern(
+        "examples.langchain.reflection",
+        _run_reflection_speculative,
+        "LangChain: concurrent candidates with parallel critics, first perfect wins.",
+    ),
+    "tools": Pattern(
+        "examples.langchain.tools",
+        _run_tools,
+        "LangChain: tool-calling agent with a simulated search tool.",
+    ),
+    "planning": Pattern(
+        "examples.crewai.planning",
+        _run_planning,
+        "CrewAI: plan and then write a summary.",
+    ),
+    "multi_agent": Pattern(
+        "examples.crewai.multi_agent",
+        _run_multi_agent,
+        "CrewAI: research and blog-writing crew.",
+    ),
+    "multi_agent_batch": Pattern(
+        "examples.crewai.multi_agent",
+        _run_multi_agent_batch,
+        "CrewAI: blog posts for a JSONL file of topics, several crews at once.",
+    ),
+    "deep_research": Pattern(
+        "examples.openai.deep_research",
+        _run_deep_research,
+        "OpenAI: deep research report with citations.",
+    ),
+    "deep_research_batch": Pattern(
+        "examples.openai.deep_research_batch",
+        _run_deep_research_batch,
+        "OpenAI: concurrent, resumable deep research over a JSONL file of questions.",
+    ),
+    "adk_routing": Pattern(
+        "examples.google.routing",
+        _run_adk_routing,
+        "ADK: coordinator delegating to specialist agents.",
+    ),
+    "adk_google_search": Pattern(
+        "examples.google.tools.google_search",
+        _run_adk_tool,
+        "ADK: agent with the Google Search tool.",
+        query="what's the latest ai news?",
+    ),
+    "adk_code_execution": Pattern(
+        "examples.google.tools.code_execution",
+        _run_adk_tool,
+        "ADK: calculator agent with built-in code execution.",
+        query="Calculate the value of (5 + 7) * 3",
+    ),
+    "adk_enterprise_search": Pattern(
+        "examples.google.tools.enterprise_search",
+        _run_adk_tool,
+        "ADK: Vertex AI Search over internal documents.",
+        query="gcp revenue q1 2022",
+    ),
+    "adk_sequential": Pattern(
+        "examples.google.agents.multi_agent.sequential",
+        _run_adk_agent,
+        "ADK: sequential two-step pipeline.",
+        query="Fetch the latest data on renewable energy.",
+    ),
+    "adk_parallel": Pattern(
+        "examples.google.agents.multi_agent.parallel",
+        _run_adk_agent,
+        "ADK: fetch weather and news in parallel.",
+        query="London",
+    ),
+    "adk_loop": Pattern(
+        "examples.google.agents.multi_agent.loop",
+        _run_adk_agent,
+        "ADK: loop agent polling for a completed status.",
+        query="Start the process.",
+    ),
+    "adk_hierarchical": Pattern(
+        "examples.google.agents.multi_agent.hierarchical",
+        _run_adk_agent,
+        "ADK: coordinator with greeter and task executor.",
+        query="Please greet me.",
+    ),
+    "adk_agent_as_a_tool": Pattern(
+        "examples.google.agents.multi_agent.agent_as_a_tool",
+        _run_adk_agent,
+        "ADK: artist agent using an image generator agent as a tool.",
+        query="Create an image.",
+    ),
+    "adk_parallelization": Pattern(
+        "examples.google.agents.parallelization",
+        _run_adk_agent,
+        "ADK: parallel web research followed by synthesis.",
+        query="Please research the topics.",
+    ),
+    "adk_reflection": Pattern(
+        "examples.google.agents.reflection",
+        _run_adk_agent,
+        "ADK: draft writer followed by a fact checker.",
+        query="The Eiffel Tower",
+    ),
+}
+
+
+def load_pattern(name: str) -> ModuleType:
+    """Imports the module of a registered pattern."""
+    if name not in PATTERNS:
+        raise ValueError(f"Unknown pattern: {name}")
+    return importlib.import_module(PATTERNS[name].module)
+
+
+async def _monitored(awaitable) -> None:
+    from examples.benchmark.loop_monitor import LoopStallMonitor
+
+    async with LoopStallMonitor():
+        await awaitable
+
+
+def run_pattern(name: str, args: argparse.Namespace) -> None:
+    pattern = PATTERNS[name]
+    if not args.query:
+        args.query = pattern.query
+    trace_path = getattr(args, "trace", None)
+    if not trace_path:
+        _run_pattern(name, pattern, args)
+        return
+
+    from examples.telemetry.instrument import instrument
+    from examples.telemetry.tracing import pattern_span, print_breakdown
+
+    provider = instrument(trace_path)
+    try:
+        with pattern_span(name):
+            _run_pattern(name, pattern, args)
+    finally:
+        # Export the buffered spans even if the pattern raised.
+        provider.shutdown()
+    print_breakdown(trace_path)
+
+
+def _run_pattern(name: str, pattern: Pattern, args: argparse.Namespace) -> None:
+    result = pattern.run(load_pattern(name), args)
+    if inspect.isawaitable(result):
+        if getattr(args, "monitor_loop", False):
+            result = _monitored(result)
+        asyncio.run(result)
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    # Imported here so the benchmark harness is only loaded when requested.
+    from examples.benchmark import harness
+    from examples.benchmark.stubs import StubProfile
+
+    profile = StubProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        failure_rate=args.failure_rate,
+    )
+    if args.cache:
+        from langchain_core.globals import set_llm_cache
+        from examples.langchain.cache import TieredLLMCache
+
+        # Repeats after the first are then served from the cache.
+        set_llm_cache(TieredLLMCache(args.cache))
+    if args.trace:
+        from examples.telemetry.instrument import instrument
+
+        provider = instrument(args.trace)
+    try:
+        results = await harness.run_benchmarks(
+            args.patterns, profile, args.repeats, tracing=bool(args.trace)
+        )
+    finally:
+        if args.trace:
+            provider.shutdown()
+    harness.print_report(results)
+    if args.trace:
+        from examples.telemetry.tracing import print_breakdown
+
+        print_breakdown(args.trace)
+    if args.json:
+        harness.save_results(results, args.json)
+    if args.baseline:
+        regressions = harness.compare_to_baseline(results, args.baseline)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            raise SystemExit(1)
+
+
 def main():
-    execute()
+    parser = argparse.ArgumentParser(description="Agentic design pattern examples.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("list", help="List the available patterns.")
+
+    run_parser = subparsers.add_parser("run", help="Run a single pattern.")
+    run_parser.add_argument("pattern", choices=list(PATTERNS))
+    run_parser.add_argument(
+        "--provider",
+        choices=[provider.value for provider in Provider],
+        default=Provider.ANTHROPIC.value,
+        help="Model provider for LangChain and CrewAI patterns.",
+    )
+    run_parser.add_argument("--query", help="Override the pattern's default query.")
+    run_parser.add_argument("--input", help="Input file for batch patterns.")
+    run_parser.add_argument("--output", help="Output file for batch patterns.")
+    run_parser.add_argument(
+        "--monitor-loop",
+        action="store_true",
+        help="Report event-loop stalls caused by blocking calls (async patterns only).",
+    )
+    run_parser.add_argument(
+        "--trace", help="Append OpenTelemetry spans to this JSONL file and print a cost breakdown."
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the progress of background runs instead of polling (deep_research).",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "benchmark", help="Benchmark the patterns offline against a stub model."
+    )
+    bench_parser.add_argument("patterns", nargs="*", help="Patterns to benchmark.")
+    bench_parser.add_argument("--repeats", type=int, default=5)
+    bench_parser.add_argument("--latency", type=float, default=0.05)
+    bench_parser.add_argument("--jitter", type=float, default=0.0)
+    bench_parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    bench_parser.add_argument("--failure-rate", type=float, default=0.0)
+    bench_parser.add_argument(
+        "--cache", help="Cache LangChain responses in this directory."
+    )
+    bench_parser.add_argument("--json", help="Write the results to a JSON file.")
+    bench_parser.add_argument(
+        "--baseline", help="Fail if results regress against this JSON file."
+    )
+    bench_parser.add_argument(
+        "--trace", help="Append OpenTelemetry spans to this JSONL file and print a cost breakdown."
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-time", help="Measure the cold-start import cost of each pattern."
+    )
+    import_parser.add_argument("patterns", nargs="*", help="Patterns to measure.")
+    import_parser.add_argument("--repeats", type=int, default=3)
+
+    kb_parser = subparsers.add_parser(
+        "kb-benchmark", help="Benchmark the search_information knowledge base by corpus size."
+    )
+    kb_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    kb_parser.add_argument("--queries", type=int, default=200)
+    kb_parser.add_argument(
+        "--in-memory", action="store_true", help="Load the index instead of mmap-ing it."
+    )
+
+    runner_parser = subparsers.add_parser(
+        "runner-setup", help="Compare per-query ADK runner setup with the shared registry."
+    )
+    runner_parser.add_argument("--queries", type=int, default=200)
+    runner_parser.add_argument("--concurrency", type=int, default=1)
+    runner_parser.add_argument("--latency", type=float, default=0.0)
+
+    session_parser = subparsers.add_parser(
+        "session-benchmark", help="Compare the in-memory and SQLite ADK session services."
+    )
+    session_parser.add_argument("--sessions", type=int, default=100_000)
+    session_parser.add_argument("--events", type=int, default=2)
+    session_parser.add_argument("--reads", type=int, default=1000)
+
+    hedge_parser = subparsers.add_parser(
+        "hedge-benchmark", help="Measure hedged requests between two stub providers."
+    )
+    hedge_parser.add_argument("--requests", type=int, default=400)
+    hedge_parser.add_argument("--concurrency", type=int, default=8)
+    hedge_parser.add_argument("--percentile", type=float, default=95.0)
+
+    lb_parser = subparsers.add_parser(
+        "lb-benchmark", help="Show the load balancer's traffic split through a provider incident."
+    )
+    lb_parser.add_argument("--duration", type=float, default=9.0)
+    lb_parser.add_argument("--concurrency", type=int, default=8)
+    lb_parser.add_argument("--cooldown", type=float, default=2.0)
+
+    artifact_parser = subparsers.add_parser(
+        "artifact-benchmark", help="Compare inline tool bytes with artifact handles."
+    )
+    artifact_parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    artifact_parser.add_argument("--repeats", type=int, default=20)
+
+    crew_parser = subparsers.add_parser(
+        "crew-benchmark", help="Blog posts per hour for a batch of topics, by crew concurrency."
+    )
+    crew_parser.add_argument("--topics", type=int, default=48)
+    crew_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    crew_parser.add_argument("--latency", type=float, default=0.05)
+
+    research_parser = subparsers.add_parser(
+        "research-benchmark",
+        help="Run background deep research through disconnects, crashes and timeouts.",
+    )
+    research_parser.add_argument("--duration", type=float, default=2.0)
+    research_parser.add_argument("--poll-interval", type=float, default=0.2)
+    research_parser.add_argument("--questions", type=int, default=32)
+    research_parser.add_argument("--concurrency", type=int, default=8)
+
+    args = parser.parse_args()
+    match args.command:
+        case "list":
+            for name, pattern in PATTERNS.items():
+                print(f"{name:<24} {pattern.description}")
+        case "run":
+            args.provider = Provider(args.provider)
+            run_pattern(args.pattern, args)
+        case "benchmark":
+            asyncio.run(benchmark(args))
+        case "import-time":
+            from examples.benchmark import import_time
+
+            unknown = [name for name in args.patterns if name not in PATTERNS]
+            if unknown:
+                parser.error(f"unknown pattern(s): {', '.join(unknown)}")
+            import_time.run(args.patterns or list(PATTERNS), args.repeats)
+        case "artifact-benchmark":
+            from examples.benchmark import artifacts
+
+            asyncio.run(artifacts.run(args.sizes, args.repeats))
+        case "crew-benchmark":
+            from examples.benchmark import crew_batch
+
+            crew_batch.run(args.topics, args.concurrency, args.latency)
+        case "research-benchmark":
+            from examples.benchmark import deep_research
+
+            deep_research.run(args.duration, args.poll_interval)
+            deep_research.run_batches(
+                args.questions, args.concurrency, args.duration / 2, args.poll_interval
+            )
+        case "kb-benchmark":
+            from examples.benchmark import knowledge_base
+
+            knowledge_base.run(args.sizes, args.queries, args.in_memory)
+        case "runner-setup":
+            from examples.benchmark import runner_setup
+
+            asyncio.run(runner_setup.run(args.queries, args.concurrency, args.latency))
+        case "session-benchmark":
+            from examples.benchmark import session_service
+
+            session_service.run(args.sessions, args.events, args.reads)
+        case "hedge-benchmark":
+            from examples.benchmark import hedging
+
+            asyncio.run(hedging.run(args.requests, args.concurrency, args.percentile))
+        case "lb-benchmark":
+            from examples.benchmark import load_balancer
+
+            asyncio.run(load_balancer.run(args.duration, args.concurrency, args.cooldown))
+        case _:
+            # Without a command, run the default example.
+            args = argparse.Namespace(
+                provider=Provider.ANTHROPIC, query=None, input=None, output=None
+            )
+            run_pattern("multi_agent", args)
 
 
 if __name__ == "__main__":
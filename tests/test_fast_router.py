@@ -0,0 +1,43 @@
+# Copyright (c) 2025 Hannah Falk
+#
+# This code is licensed under the MIT License.
+# See the LICENSE file in the repository for the full license text.
+
+import pytest
+
+from examples.langchain.fast_router import FastRouter
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    [
+        "a to the",
+        "Can you do it for me?",
+        "Sing me a song",
+        "Summarize this article",
+    ],
+)
+def test_stopword_only_and_off_topic_requests_fall_through_to_the_llm(request_text):
+    router = FastRouter(shadow_rate=0.0)
+    assert router.classify(request_text) == (None, 0.0)
+
+    llm_calls = []
+
+    def llm_route(request):
+        llm_calls.append(request)
+        return "unclear"
+
+    assert router.route(request_text, llm_route) == "unclear"
+    assert llm_calls == [request_text]
+    assert router.stats.llm_fallback == 1
+
+
+def test_clear_requests_take_the_fast_path():
+    router = FastRouter(shadow_rate=0.0)
+
+    def llm_route(request):
+        raise AssertionError(f"LLM called for {request!r}")
+
+    assert router.route("Book me a flight to London.", llm_route) == "booker"
+    assert router.route("What is the capital of Spain?", llm_route) == "info"
+    assert router.stats.fast_path == 2